@@ -0,0 +1,37 @@
+# ==================== 基准测试配置 ====================
+# 默认把基准测试结果以 JSON 保存到 .benchmarks/，便于跨提交对比
+
+"""Benchmarks conftest
+
+未指定 --benchmark-json / --benchmark-save / --benchmark-autosave 时自动开启 autosave:
+结果写入 .benchmarks/<机器>/<编号>_<提交>_<时间>.json (文件名包含当前 git 提交)。
+未指定 --benchmark-storage 时固定存到仓库根目录的 .benchmarks/ (不随当前工作目录变化)。
+
+安装依赖:
+    pip install -e ".[bench]"
+
+对比两次结果:
+    python -m pytest benchmarks/ --benchmark-compare=0001 --benchmark-compare-fail=mean:20%
+    pytest-benchmark compare 0001 0002
+"""
+
+import pytest
+
+# pytest-benchmark 的默认存储 (相对当前工作目录)
+_DEFAULT_STORAGE = "file://./.benchmarks"
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_configure(config):
+    option = config.option
+    if not hasattr(option, "benchmark_autosave"):
+        return
+    if option.benchmark_disable or option.benchmark_skip:
+        return
+    if option.benchmark_storage == _DEFAULT_STORAGE:
+        option.benchmark_storage = f"file://{config.rootpath / '.benchmarks'}"
+    if not (option.benchmark_json or option.benchmark_save or option.benchmark_autosave):
+        from pytest_benchmark.utils import get_tag
+
+        # 与 --benchmark-autosave 相同的文件名标签: <提交>_<时间>[_uncommitted-changes]
+        option.benchmark_autosave = get_tag()
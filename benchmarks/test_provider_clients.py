@@ -0,0 +1,108 @@
+# ==================== 服务商客户端基准测试 ====================
+# 基于本地模拟服务器测量入库状态查询与批量核对在不同账号规模下的耗时
+
+"""Benchmark Provider Clients
+
+需要 pytest-benchmark，运行:
+    python -m pytest benchmarks/test_provider_clients.py --benchmark-json=bench.json
+
+账号规模默认为 1k / 10k / 100k，可用环境变量 BENCH_PROVIDER_SIZES=1000,10000 缩小范围。
+
+测试用例:
+    - test_crs_query_account: CRS 单账号查询 (拉取整页清单后匹配)
+    - test_s2a_query_account: S2A 单账号查询 (按 100 条分页遍历)
+    - test_check_account_stored_uncached: 清单缓存关闭时的入库状态查询
+    - test_check_account_stored_cached: 清单缓存命中时的入库状态查询
+    - test_reconcile_storage: 批量核对整个 tracker (一半账号已入库)
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from src.auth.crs.client import crs_query_account  # noqa: E402
+from src.auth.s2a.client import s2a_query_account  # noqa: E402
+from src.core.storage_manager import (  # noqa: E402
+    check_account_stored,
+    get_provider_inventory,
+    invalidate_provider_inventory,
+    reconcile_storage,
+)
+from tests.fake_providers import FakeProviderServer, fake_email, use_fake_providers  # noqa: E402
+
+SIZES = [
+    int(size)
+    for size in os.environ.get("BENCH_PROVIDER_SIZES", "1000,10000,100000").split(",")
+    if size.strip()
+]
+
+
+@pytest.fixture(scope="module", params=SIZES, ids=lambda size: f"{size // 1000}k")
+def provider_server(request):
+    with FakeProviderServer(accounts=request.param) as server:
+        yield server
+
+
+@pytest.fixture
+def fake_providers(provider_server):
+    with use_fake_providers(provider_server, inventory_ttl=0) as server:
+        yield server
+
+
+def _rounds(size: int) -> int:
+    return 3 if size >= 100_000 else 10
+
+
+def test_crs_query_account(benchmark, fake_providers):
+    size = len(fake_providers.crs.accounts)
+    target = fake_email(size - 1)
+    result = benchmark.pedantic(crs_query_account, args=(target,), rounds=_rounds(size))
+    assert result["exists"]
+
+
+def test_s2a_query_account(benchmark, fake_providers):
+    size = len(fake_providers.s2a.accounts)
+    target = fake_email(size - 1)
+    result = benchmark.pedantic(s2a_query_account, args=(target,), rounds=_rounds(size))
+    assert result["exists"]
+
+
+def test_check_account_stored_uncached(benchmark, fake_providers):
+    size = len(fake_providers.crs.accounts)
+    target = fake_email(size // 2)
+    result = benchmark.pedantic(
+        check_account_stored, args=(target, "crs"), rounds=_rounds(size)
+    )
+    assert result["exists"]
+
+
+def test_check_account_stored_cached(benchmark, provider_server):
+    size = len(provider_server.crs.accounts)
+    with use_fake_providers(provider_server, inventory_ttl=3600):
+        assert get_provider_inventory("crs") is not None
+        result = benchmark(check_account_stored, fake_email(size // 2), "crs")
+    assert result["exists"]
+
+
+def _tracker(size: int) -> dict:
+    """size 个账号，偶数号已入库、奇数号为服务商中不存在的邮箱"""
+    teams = {}
+    for index in range(size):
+        email = fake_email(index) if index % 2 == 0 else f"missing{index}@example.com"
+        teams.setdefault(f"team-{index // 100}", []).append(
+            {"email": email, "storage_status": {"crs": {"status": "not_stored"}}}
+        )
+    return {"teams": teams}
+
+
+def test_reconcile_storage(benchmark, fake_providers):
+    size = len(fake_providers.crs.accounts)
+
+    def setup():
+        invalidate_provider_inventory()
+        return (_tracker(size), ["crs"]), {}
+
+    report = benchmark.pedantic(reconcile_storage, setup=setup, rounds=_rounds(size))
+    assert len(report["crs"]["stored"]) == (size + 1) // 2
@@ -0,0 +1,194 @@
+# ==================== 追踪记录操作基准测试 ====================
+# 基于合成追踪记录测量 src.core.utils 追踪记录操作、status 与迁移脚本在不同规模下的耗时
+
+"""Benchmark Tracker Operations
+
+需要 pytest-benchmark，运行:
+    python -m pytest benchmarks/test_tracker_ops.py
+
+结果默认以 JSON 保存到 .benchmarks/ (见 benchmarks/conftest.py)。
+规模默认为 10x100 / 100x100 / 100x1000 (Team 数 x 每个 Team 账号数)，
+可用环境变量 BENCH_TRACKER_SHAPES=10x100,100x100 缩小范围。
+追踪记录由 tests/fake_tracker.py 生成 (固定 seed)，各提交之间的数据相同。
+
+测试用例:
+    - test_load_team_tracker: 加载当前格式的追踪记录 (含索引构建)
+    - test_load_team_tracker_migrate: 加载混合旧格式的追踪记录 (迁移并写回)
+    - test_save_team_tracker: 整体保存追踪记录与状态统计缓存
+    - test_update_account_status: 更新单个账号的邀请状态
+    - test_update_storage_status: 更新单个账号的入库状态
+    - test_get_all_incomplete_accounts: 获取所有 Team 的未完成账号
+    - test_show_status_cached: status 命令 (读取统计缓存)
+    - test_show_status_rebuild: status 命令 (统计缓存失效，加载追踪记录重新统计)
+    - test_migrate_tracker_script: scripts/migrate_tracker.py 整文件 / 流式迁移
+"""
+
+import importlib.util
+import itertools
+import json
+import os
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import src.core.tracker_store as tracker_store  # noqa: E402
+from src.core.status import show_status  # noqa: E402
+from src.core.storage_manager import update_storage_status  # noqa: E402
+from src.core.tracker_migration import SCHEMA_VERSION  # noqa: E402
+from src.core.tracker_store import JsonTrackerStore  # noqa: E402
+from src.core.utils import (  # noqa: E402
+    get_all_incomplete_accounts,
+    load_team_tracker,
+    save_team_tracker,
+    update_account_status,
+)
+from tests.fake_tracker import generate_tracker, tracker_email  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+
+SHAPES = [
+    tuple(int(part) for part in shape.strip().split("x"))
+    for shape in os.environ.get("BENCH_TRACKER_SHAPES", "10x100,100x100,100x1000").split(",")
+    if shape.strip()
+]
+
+
+@pytest.fixture(scope="module", params=SHAPES, ids=lambda shape: f"{shape[0]}x{shape[1]}")
+def shape(request):
+    return request.param
+
+
+@pytest.fixture(scope="module")
+def payloads(shape):
+    """(当前格式, 混合旧格式) 两份序列化后的追踪记录"""
+    teams, accounts = shape
+    current = json.dumps(generate_tracker(teams, accounts, legacy_ratio=0), ensure_ascii=False)
+    legacy = json.dumps(generate_tracker(teams, accounts, legacy_ratio=0.2), ensure_ascii=False)
+    return current, legacy
+
+
+@pytest.fixture
+def json_store(tmp_path, payloads):
+    path = tmp_path / "team_tracker.json"
+    path.write_text(payloads[0], encoding="utf-8")
+    store = JsonTrackerStore(path)
+    tracker_store.reset_tracker_store(store)
+    yield store
+    tracker_store.reset_tracker_store()
+
+
+@pytest.fixture
+def tracker(json_store):
+    return load_team_tracker()
+
+
+def _rounds(shape) -> int:
+    return 3 if shape[0] * shape[1] >= 100_000 else 10
+
+
+def _emails(shape):
+    """依次轮换所有 Team 的账号 (每次操作命中不同账号)"""
+    teams, accounts = shape
+    return itertools.cycle(
+        (f"team-{team:04d}", tracker_email(team, index))
+        for index in range(0, accounts, max(1, accounts // 10))
+        for team in range(teams)
+    )
+
+
+def test_load_team_tracker(benchmark, json_store, shape):
+    result = benchmark.pedantic(load_team_tracker, rounds=_rounds(shape))
+    assert len(result["teams"]) == shape[0]
+
+
+def test_load_team_tracker_migrate(benchmark, json_store, payloads, shape):
+    path = Path(json_store.path)
+
+    def setup():
+        path.write_text(payloads[1], encoding="utf-8")
+
+    result = benchmark.pedantic(load_team_tracker, setup=setup, rounds=_rounds(shape))
+    assert result["schema_version"] == SCHEMA_VERSION
+
+
+def test_save_team_tracker(benchmark, tracker, shape):
+    benchmark.pedantic(save_team_tracker, args=(tracker,), rounds=_rounds(shape))
+
+
+def test_update_account_status(benchmark, tracker, shape):
+    targets = _emails(shape)
+    statuses = itertools.cycle(("registered", "authorized"))
+
+    def update():
+        team_name, email = next(targets)
+        update_account_status(tracker, team_name, email, next(statuses))
+
+    benchmark(update)
+
+
+def test_update_storage_status(benchmark, tracker, shape):
+    targets = _emails(shape)
+    states = itertools.cycle((True, False))
+
+    def update():
+        team_name, email = next(targets)
+        update_storage_status(
+            tracker,
+            team_name,
+            email,
+            "crs",
+            {"exists": next(states), "account_id": "crs-1", "last_check": "2024-06-01 00:00:00"},
+        )
+
+    benchmark(update)
+
+
+def test_get_all_incomplete_accounts(benchmark, tracker, shape):
+    result = benchmark(get_all_incomplete_accounts, tracker)
+    assert sum(len(accounts) for accounts in result.values()) > 0
+
+
+def test_show_status_cached(benchmark, tracker, shape):
+    save_team_tracker(tracker)
+    benchmark(show_status)
+
+
+def test_show_status_rebuild(benchmark, json_store, shape):
+    def setup():
+        if os.path.exists(json_store.stats_path):
+            os.remove(json_store.stats_path)
+
+    benchmark.pedantic(show_status, setup=setup, rounds=_rounds(shape))
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location(
+        "migrate_tracker_script", ROOT / "scripts" / "migrate_tracker.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize("mode", ["in-memory", "stream"])
+def test_migrate_tracker_script(benchmark, tmp_path, payloads, shape, mode, capsys):
+    script = _load_script()
+    path = tmp_path / "team_tracker.json"
+    argv = ["migrate_tracker.py", "--file", str(path), "--backup-dir", str(tmp_path / "backup")]
+    if mode == "stream":
+        argv.append("--stream")
+
+    def setup():
+        path.write_text(payloads[1], encoding="utf-8")
+
+    def run():
+        with patch.object(sys, "argv", argv):
+            return script.main()
+
+    result = benchmark.pedantic(run, setup=setup, rounds=_rounds(shape))
+    capsys.readouterr()
+    assert result == 0
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+# ==================== 日志性能测试脚本 ====================
+# 对比同步日志与异步 (QueueHandler) 日志的单次调用耗时
+
+"""Bench Logger - 日志调用耗时对比
+
+分别以同步模式和异步模式创建 Logger (控制台输出重定向到 os.devnull，
+文件日志写入临时目录)，逐次计时 log.info 调用，输出 mean / p50 / p99 / max。
+异步模式额外输出 flush (等待队列写完) 的耗时与丢弃条数。
+
+用法:
+    python scripts/bench_logger.py [--count N] [--queue-size N] [--policy block|drop]
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import src.core.logger as logger_module
+from src.core.logger import Logger
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(len(ordered) * pct / 100))
+    return ordered[index]
+
+
+def _run(name: str, count: int, **kwargs) -> dict:
+    with open(os.devnull, "w", encoding="utf-8") as devnull:
+        stdout = sys.stdout
+        sys.stdout = devnull
+        try:
+            bench_log = Logger(name=name, use_color=False, **kwargs)
+            samples = []
+            for i in range(count):
+                start = time.perf_counter()
+                bench_log.info(f"benchmark message {i}", icon="account", indent=1)
+                samples.append(time.perf_counter() - start)
+            start = time.perf_counter()
+            bench_log.flush()
+            flush_time = time.perf_counter() - start
+            bench_log._stop_listener()
+        finally:
+            sys.stdout = stdout
+
+    return {
+        "mean": sum(samples) / len(samples),
+        "p50": _percentile(samples, 50),
+        "p99": _percentile(samples, 99),
+        "max": max(samples),
+        "flush": flush_time,
+        "dropped": bench_log.dropped,
+    }
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="对比同步 / 异步日志单次调用耗时")
+    parser.add_argument("--count", type=int, default=20000, help="每种模式的调用次数")
+    parser.add_argument("--queue-size", type=int, default=10000, help="异步队列容量")
+    parser.add_argument(
+        "--policy",
+        choices=logger_module.LOG_QUEUE_POLICIES,
+        default="block",
+        help="队列满时的策略",
+    )
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        # 文件日志写入临时目录，不污染 logs/
+        logger_module.LOG_DIR = Path(tmp_dir)
+        logger_module.LOG_FILE = Path(tmp_dir) / "bench.log"
+
+        results = {
+            "sync": _run("bench-sync", args.count, async_mode=False),
+            "async": _run(
+                "bench-async",
+                args.count,
+                async_mode=True,
+                queue_size=args.queue_size,
+                queue_policy=args.policy,
+            ),
+        }
+
+    print(f"调用次数: {args.count} | 队列容量: {args.queue_size} | 策略: {args.policy}")
+    print(f"{'mode':<8}{'mean':>10}{'p50':>10}{'p99':>10}{'max':>10}{'flush':>10}")
+    for mode, stats in results.items():
+        print(
+            f"{mode:<8}"
+            + "".join(
+                f"{stats[key] * 1e6:>8.1f}us"
+                for key in ("mean", "p50", "p99", "max")
+            )
+            + f"{stats['flush'] * 1e3:>8.1f}ms"
+        )
+    if results["async"]["dropped"]:
+        print(f"异步模式丢弃: {results['async']['dropped']} 条")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
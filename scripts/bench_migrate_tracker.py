@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# ==================== 迁移性能测试脚本 ====================
+# 对比整文件迁移与流式迁移的耗时和峰值内存
+
+"""Bench Migrate Tracker - 大追踪文件迁移对比
+
+在临时目录生成旧格式追踪文件 (默认 100000 个账号)，分别以子进程运行
+scripts/migrate_tracker.py (整文件 / --stream)，输出耗时与子进程峰值 RSS。
+
+用法:
+    python scripts/bench_migrate_tracker.py [--accounts N] [--team-size N]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT = ROOT / "scripts" / "migrate_tracker.py"
+
+
+def _generate_tracker(path: Path, accounts: int, team_size: int):
+    """逐个 Team 写入旧格式追踪文件 (生成过程本身不占用大量内存)"""
+    with path.open("w", encoding="utf-8") as f:
+        f.write('{"last_updated": "2024-01-01 00:00:00", "teams": {')
+        for team_index, start in enumerate(range(0, accounts, team_size)):
+            team = [
+                {
+                    "email": f"user{i}@example.com",
+                    "password": "Passw0rd!",
+                    "status": "completed" if i % 3 else "registered",
+                    "role": "member",
+                    "created_at": "2024-01-01 00:00:00",
+                    "updated_at": "2024-01-01 00:00:00",
+                }
+                for i in range(start, min(start + team_size, accounts))
+            ]
+            prefix = "," if team_index else ""
+            f.write(f'{prefix}"team-{team_index}": {json.dumps(team, indent=2)}')
+        f.write("}}")
+
+
+def _run(tracker_path: Path, *args: str) -> tuple[float, float]:
+    """运行迁移脚本子进程
+
+    Returns:
+        tuple: (耗时 s, 峰值 RSS MB)
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    command = [sys.executable, str(SCRIPT), "--file", str(tracker_path), *args]
+    start = time.perf_counter()
+    proc = subprocess.Popen(command, env=env, stdout=subprocess.DEVNULL, cwd=ROOT)
+    _, status, usage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    proc.returncode = os.waitstatus_to_exitcode(status)
+    if proc.returncode != 0:
+        raise RuntimeError(f"迁移失败 ({' '.join(args)}): exit {proc.returncode}")
+    # Linux 下 ru_maxrss 单位为 KB
+    return elapsed, usage.ru_maxrss / 1024
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="对比整文件 / 流式迁移")
+    parser.add_argument("--accounts", type=int, default=100000, help="生成的账号数量")
+    parser.add_argument("--team-size", type=int, default=100, help="每个 Team 的账号数")
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp = Path(tmp_dir)
+        results = {}
+        for mode, extra in (("in-memory", []), ("stream", ["--stream"])):
+            tracker_path = tmp / f"{mode}.json"
+            _generate_tracker(tracker_path, args.accounts, args.team_size)
+            size_mb = tracker_path.stat().st_size / 1024 / 1024
+            results[mode] = _run(
+                tracker_path, "--backup-dir", str(tmp / "backup"), *extra
+            )
+
+    print(f"账号数量: {args.accounts} | 每个 Team: {args.team_size} | 文件: {size_mb:.1f}MB")
+    print(f"{'mode':<12}{'time':>10}{'peak RSS':>12}")
+    for mode, (elapsed, peak_mb) in results.items():
+        print(f"{mode:<12}{elapsed:>9.2f}s{peak_mb:>10.1f}MB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
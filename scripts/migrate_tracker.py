@@ -8,16 +8,29 @@
     - 备份原文件
     - status → invitation_status 字段转换
     - 初始化 storage_status 空结构
+    - 写入 schema_version
     - 保存新格式并验证
 
+迁移规则与 load_team_tracker 共用 src.core.tracker_migration。
+
+--stream 流式模式 (适用于非常大的追踪文件):
+    - 按块读取源文件，每次只解码一个 Team 的账号列表
+    - 迁移结果逐个 Team 追加写入 <tracker>.migrating
+    - 每处理 --checkpoint-every 个账号，记录源文件 / 输出文件偏移到 <tracker>.migrating.progress
+    - 中断后再次以 --stream 运行会从最近的检查点继续 (源文件有变化时重新开始)
+    - 全部完成后流式校验输出，备份原文件并替换
+
 用法:
-    python scripts/migrate_tracker.py [--dry-run] [--backup-dir DIR]
+    python scripts/migrate_tracker.py [--file PATH] [--dry-run] [--backup-dir DIR]
+    python scripts/migrate_tracker.py --stream [--restart] [--checkpoint-every N]
 """
 
 from __future__ import annotations
 
 import argparse
+import codecs
 import json
+import os
 import shutil
 import sys
 from copy import deepcopy
@@ -25,146 +38,17 @@ from datetime import datetime
 from pathlib import Path
 
 from src.core.config import TEAM_TRACKER_FILE
+from src.core.tracker_migration import (
+    MIGRATION_COUNTERS,
+    SCHEMA_VERSION,
+    migrate_tracker,
+    schema_version,
+    validate_tracker,
+)
+from src.core.fileio import atomic_write_json
 
-
-PROVIDERS = ("crs", "cpa", "s2a")
-
-
-def _init_storage_status() -> dict:
-    return {provider: {"status": "not_stored"} for provider in PROVIDERS}
-
-
-def _normalize_storage_status(value: object) -> tuple[dict, bool]:
-    if not isinstance(value, dict):
-        return _init_storage_status(), True
-
-    changed = False
-    normalized = deepcopy(value)
-    for provider in PROVIDERS:
-        entry = normalized.get(provider)
-        if not isinstance(entry, dict):
-            normalized[provider] = {"status": "not_stored"}
-            changed = True
-            continue
-        if not entry.get("status"):
-            entry["status"] = "not_stored"
-            changed = True
-    return normalized, changed
-
-
-def _migrate_account(account: dict) -> tuple[dict, bool, dict]:
-    updated = deepcopy(account)
-    report = {
-        "status_migrated": 0,
-        "status_initialized": 0,
-        "storage_added": 0,
-        "storage_fixed": 0,
-    }
-
-    if "status" in updated and "invitation_status" not in updated:
-        updated["invitation_status"] = updated.pop("status")
-        report["status_migrated"] += 1
-    elif "status" in updated and "invitation_status" in updated:
-        updated.pop("status")
-        report["status_migrated"] += 1
-
-    if "invitation_status" not in updated:
-        updated["invitation_status"] = ""
-        report["status_initialized"] += 1
-
-    if "storage_status" not in updated:
-        updated["storage_status"] = _init_storage_status()
-        report["storage_added"] += 1
-    else:
-        normalized, changed = _normalize_storage_status(updated["storage_status"])
-        if changed:
-            updated["storage_status"] = normalized
-            report["storage_fixed"] += 1
-
-    return updated, updated != account, report
-
-
-def _migrate_tracker(tracker: dict) -> tuple[dict, dict, dict]:
-    updated_tracker = deepcopy(tracker)
-    totals = {
-        "teams": 0,
-        "accounts": 0,
-        "status_migrated": 0,
-        "status_initialized": 0,
-        "storage_added": 0,
-        "storage_fixed": 0,
-    }
-    per_team_changes: dict[str, int] = {}
-
-    teams = updated_tracker.get("teams")
-    if not isinstance(teams, dict):
-        updated_tracker["teams"] = {}
-        return updated_tracker, totals, per_team_changes
-
-    totals["teams"] = len(teams)
-    for team_name, accounts in teams.items():
-        if not isinstance(accounts, list):
-            teams[team_name] = []
-            per_team_changes[team_name] = 0
-            continue
-        migrated_accounts = []
-        team_changed = 0
-        for account in accounts:
-            if not isinstance(account, dict):
-                continue
-            totals["accounts"] += 1
-            migrated, changed, report = _migrate_account(account)
-            migrated_accounts.append(migrated)
-            if changed:
-                team_changed += 1
-            for key in (
-                "status_migrated",
-                "status_initialized",
-                "storage_added",
-                "storage_fixed",
-            ):
-                totals[key] += report[key]
-        teams[team_name] = migrated_accounts
-        if team_changed:
-            per_team_changes[team_name] = team_changed
-
-    return updated_tracker, totals, per_team_changes
-
-
-def _validate_tracker(tracker: dict) -> list[str]:
-    errors: list[str] = []
-    teams = tracker.get("teams")
-    if not isinstance(teams, dict):
-        errors.append("teams 字段不是字典")
-        return errors
-
-    for team_name, accounts in teams.items():
-        if not isinstance(accounts, list):
-            errors.append(f"团队 {team_name} 的账号列表不是列表")
-            continue
-        for account in accounts:
-            if not isinstance(account, dict):
-                errors.append(f"团队 {team_name} 存在非字典账号记录")
-                continue
-            if "status" in account:
-                errors.append(f"团队 {team_name} 仍包含 status 字段")
-            if "invitation_status" not in account:
-                errors.append(f"团队 {team_name} 缺少 invitation_status 字段")
-            storage_status = account.get("storage_status")
-            if not isinstance(storage_status, dict):
-                errors.append(f"团队 {team_name} storage_status 非字典")
-                continue
-            for provider in PROVIDERS:
-                entry = storage_status.get(provider)
-                if not isinstance(entry, dict):
-                    errors.append(f"团队 {team_name} storage_status 缺少 {provider}")
-                    continue
-                if not entry.get("status"):
-                    errors.append(
-                        f"团队 {team_name} storage_status.{provider}.status 为空"
-                    )
-
-    return errors
+STREAM_CHUNK_SIZE = 1024 * 1024
+CHECKPOINT_EVERY = 5000
 
 
 def _create_backup(tracker_path: Path, backup_dir: Path | None) -> Path:
@@ -177,40 +61,7 @@ def _create_backup(tracker_path: Path, backup_dir: Path | None) -> Path:
     return backup_path
 
 
-def _parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="迁移 team_tracker.json 到新格式")
-    parser.add_argument(
-        "--dry-run",
-        action="store_true",
-        help="只显示变更，不实际修改文件",
-    )
-    parser.add_argument(
-        "--backup-dir",
-        metavar="DIR",
-        help="指定备份目录（默认与原文件同目录）",
-    )
-    return parser.parse_args()
-
-
-def main() -> int:
-    args = _parse_args()
-    tracker_path = Path(TEAM_TRACKER_FILE)
-    if not tracker_path.exists():
-        print(f"未找到追踪文件: {tracker_path}")
-        return 1
-
-    with tracker_path.open("r", encoding="utf-8") as f:
-        tracker = json.load(f)
-
-    migrated, totals, per_team_changes = _migrate_tracker(tracker)
-    errors = _validate_tracker(migrated)
-    if errors:
-        print("迁移结果验证失败:")
-        for error in errors:
-            print(f"- {error}")
-        return 1
-
-    has_changes = migrated != tracker
+def _print_report(tracker_path: Path, totals: dict, per_team_changes: dict):
     print(f"读取文件: {tracker_path}")
     print(f"团队数量: {totals['teams']} | 账号数量: {totals['accounts']}")
     print(
@@ -225,6 +76,28 @@ def main() -> int:
         for team_name, changed in sorted(per_team_changes.items()):
             print(f"- {team_name}: {changed} 条记录")
 
+
+def _print_errors(title: str, errors: list[str]):
+    print(title)
+    for error in errors:
+        print(f"- {error}")
+
+
+# ==================== 整文件迁移 ====================
+def _migrate_in_memory(tracker_path: Path, args: argparse.Namespace) -> int:
+    with tracker_path.open("r", encoding="utf-8") as f:
+        tracker = json.load(f)
+
+    migrated = deepcopy(tracker)
+    totals, per_team_changes = migrate_tracker(migrated)
+    errors = validate_tracker(migrated)
+    if errors:
+        _print_errors("迁移结果验证失败:", errors)
+        return 1
+
+    has_changes = migrated != tracker
+    _print_report(tracker_path, totals, per_team_changes)
+
     if args.dry_run:
         print("已启用 --dry-run，未执行写入。")
         return 0
@@ -243,16 +116,378 @@ def main() -> int:
     with tracker_path.open("r", encoding="utf-8") as f:
         saved = json.load(f)
 
-    saved_errors = _validate_tracker(saved)
+    saved_errors = validate_tracker(saved)
     if saved_errors:
-        print("保存后验证失败:")
-        for error in saved_errors:
-            print(f"- {error}")
+        _print_errors("保存后验证失败:", saved_errors)
         return 1
 
     print("迁移完成并验证通过。")
     return 0
 
 
+# ==================== 流式迁移 ====================
+class _JsonStreamReader:
+    """按块读取 JSON 文本并逐个解码值，内存中只保留尚未解码的部分
+
+    offset() 返回当前位置在源文件中的字节偏移，可用于 seek 后继续读取。
+    """
+
+    _WHITESPACE = " \t\r\n"
+
+    def __init__(self, f, chunk_size: int = STREAM_CHUNK_SIZE, offset: int = 0):
+        self._file = f
+        self._file.seek(offset)
+        self._chunk_size = chunk_size
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._base = offset
+        self._eof = False
+
+    def _compact(self):
+        if self._pos:
+            self._base += len(self._buffer[: self._pos].encode("utf-8"))
+            self._buffer = self._buffer[self._pos :]
+            self._pos = 0
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        self._compact()
+        # 按已缓冲长度成倍读取，单个大值的重复解码总开销保持线性
+        data = self._file.read(max(self._chunk_size, len(self._buffer)))
+        self._buffer += self._decoder.decode(data, final=not data)
+        if not data:
+            self._eof = True
+        return True
+
+    def peek(self) -> str:
+        while True:
+            while self._pos < len(self._buffer):
+                if self._buffer[self._pos] not in self._WHITESPACE:
+                    return self._buffer[self._pos]
+                self._pos += 1
+            if not self._fill():
+                return ""
+
+    def consume(self, *expected: str) -> str:
+        char = self.peek()
+        if char not in expected or not char:
+            raise ValueError(f"JSON 格式错误: 期望 {' / '.join(expected)}，实际 {char!r}")
+        self._pos += 1
+        return char
+
+    def decode(self):
+        self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+                # 数字等值可能被块边界截断，需确认其后还有字符
+                if end < len(self._buffer) or self._eof:
+                    self._pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self._eof:
+                    raise
+            self._fill()
+
+    def offset(self) -> int:
+        self._compact()
+        return self._base
+
+
+def _iter_team_members(reader: _JsonStreamReader, first: bool):
+    if first:
+        if reader.peek() == "}":
+            reader.consume("}")
+            return
+    elif reader.consume(",", "}") == "}":
+        return
+    while True:
+        team_name = reader.decode()
+        reader.consume(":")
+        yield team_name, reader.decode()
+        if reader.consume(",", "}") == "}":
+            return
+
+
+def _read_top_member(reader: _JsonStreamReader, meta: dict):
+    key = reader.decode()
+    reader.consume(":")
+    if key != "teams":
+        meta[key] = reader.decode()
+        return
+    if reader.peek() != "{":
+        # teams 不是对象时按空处理 (与 migrate_tracker 一致)
+        reader.decode()
+        return
+    reader.consume("{")
+    yield from _iter_team_members(reader, first=True)
+
+
+def _iter_tracker_stream(reader: _JsonStreamReader, meta: dict, resume: bool = False):
+    """逐个产出 (team_name, accounts)，其他顶层字段收集到 meta
+
+    resume=True 时 reader 位于 teams 对象中某个 Team 之后。
+    """
+    if resume:
+        yield from _iter_team_members(reader, first=False)
+    else:
+        reader.consume("{")
+        if reader.peek() == "}":
+            reader.consume("}")
+            return
+        yield from _read_top_member(reader, meta)
+    while reader.consume(",", "}") == ",":
+        yield from _read_top_member(reader, meta)
+
+
+def _migrate_team(team_name: str, accounts) -> tuple[list, dict, int, list[str]]:
+    """迁移单个 Team
+
+    Returns:
+        tuple: (迁移后的账号列表, 统计, 变更记录数, 校验错误)
+    """
+    partial = {"teams": {team_name: accounts}}
+    totals, per_team_changes = migrate_tracker(partial)
+    return (
+        partial["teams"][team_name],
+        totals,
+        per_team_changes.get(team_name, 0),
+        validate_tracker(partial),
+    )
+
+
+def _indent_json(value, indent: str) -> str:
+    # JSON 字符串中的换行都已转义，按行缩进不会改变内容
+    return json.dumps(value, ensure_ascii=False, indent=2).replace("\n", "\n" + indent)
+
+
+def _source_key(tracker_path: Path) -> dict:
+    stat = tracker_path.stat()
+    return {"source": str(tracker_path), "size": stat.st_size, "mtime": stat.st_mtime_ns}
+
+
+def _empty_totals() -> dict:
+    return {"teams": 0, "accounts": 0, **dict.fromkeys(MIGRATION_COUNTERS, 0)}
+
+
+def _load_progress(progress_path: Path, tracker_path: Path) -> dict | None:
+    if not progress_path.exists():
+        return None
+    try:
+        progress = json.loads(progress_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if progress.get("source_key") != _source_key(tracker_path):
+        print("源文件在上次迁移后发生变化，重新开始。")
+        return None
+    return progress
+
+
+def _verify_stream_output(output_path: Path, expected_accounts: int) -> list[str]:
+    """流式重新读取输出文件，逐个 Team 校验"""
+    errors: list[str] = []
+    accounts = 0
+    meta: dict = {}
+    with output_path.open("rb") as f:
+        for team_name, team_accounts in _iter_tracker_stream(_JsonStreamReader(f), meta):
+            accounts += len(team_accounts)
+            errors.extend(
+                validate_tracker(
+                    {"teams": {team_name: team_accounts}, "schema_version": SCHEMA_VERSION}
+                )
+            )
+    if schema_version(meta) != SCHEMA_VERSION:
+        errors.append(f"schema_version 不是 {SCHEMA_VERSION}")
+    if accounts != expected_accounts:
+        errors.append(f"账号数量不一致: 期望 {expected_accounts}，实际 {accounts}")
+    return errors
+
+
+def _migrate_streaming(tracker_path: Path, args: argparse.Namespace) -> int:
+    output_path = tracker_path.with_name(tracker_path.name + ".migrating")
+    progress_path = tracker_path.with_name(tracker_path.name + ".migrating.progress")
+    dry_run = args.dry_run
+
+    progress = None
+    if not dry_run and not args.restart:
+        progress = _load_progress(progress_path, tracker_path)
+
+    if progress:
+        totals = progress["totals"]
+        per_team_changes = progress["per_team_changes"]
+        meta = progress["meta"]
+        print(f"从检查点继续: 已完成 {totals['teams']} 个 Team / {totals['accounts']} 个账号")
+    else:
+        totals, per_team_changes, meta = _empty_totals(), {}, {}
+
+    errors: list[str] = []
+    output = None
+    if not dry_run:
+        if progress:
+            output = output_path.open("r+b")
+            output.truncate(progress["output_offset"])
+            output.seek(progress["output_offset"])
+        else:
+            output = output_path.open("wb")
+            output.write(b'{\n  "teams": {')
+
+    def write(text: str):
+        output.write(text.encode("utf-8"))
+
+    def save_progress(source_offset: int):
+        output.flush()
+        os.fsync(output.fileno())
+        atomic_write_json(
+            str(progress_path),
+            {
+                "source_key": _source_key(tracker_path),
+                "source_offset": source_offset,
+                "output_offset": output.tell(),
+                "totals": totals,
+                "per_team_changes": per_team_changes,
+                "meta": meta,
+            },
+        )
+
+    try:
+        with tracker_path.open("rb") as source:
+            reader = _JsonStreamReader(
+                source,
+                args.chunk_size,
+                offset=progress["source_offset"] if progress else 0,
+            )
+            since_checkpoint = 0
+            for team_name, accounts in _iter_tracker_stream(
+                reader, meta, resume=bool(progress)
+            ):
+                migrated, team_totals, changed, team_errors = _migrate_team(
+                    team_name, accounts
+                )
+                errors.extend(team_errors)
+                for key, value in team_totals.items():
+                    totals[key] += value
+                if changed:
+                    per_team_changes[team_name] = changed
+                if output is None:
+                    continue
+
+                separator = ",\n    " if totals["teams"] > 1 else "\n    "
+                write(
+                    separator
+                    + json.dumps(team_name, ensure_ascii=False)
+                    + ": "
+                    + _indent_json(migrated, "    ")
+                )
+                since_checkpoint += len(migrated)
+                if since_checkpoint >= args.checkpoint_every:
+                    save_progress(reader.offset())
+                    since_checkpoint = 0
+
+        if errors:
+            _print_errors("迁移结果验证失败:", errors)
+            return 1
+
+        original_version = schema_version(meta)
+        meta["schema_version"] = SCHEMA_VERSION
+        _print_report(tracker_path, totals, per_team_changes)
+
+        if dry_run:
+            print("已启用 --dry-run，未执行写入。")
+            return 0
+
+        write("\n  }" if totals["teams"] else "}")
+        for key, value in meta.items():
+            write(f",\n  {json.dumps(key, ensure_ascii=False)}: {_indent_json(value, '  ')}")
+        write("\n}\n")
+        output.flush()
+        os.fsync(output.fileno())
+        output.close()
+        output = None
+
+        has_changes = original_version != SCHEMA_VERSION or any(
+            totals[key] for key in MIGRATION_COUNTERS
+        )
+        if not has_changes:
+            output_path.unlink()
+            progress_path.unlink(missing_ok=True)
+            print("无需迁移，文件已是最新格式。")
+            return 0
+
+        saved_errors = _verify_stream_output(output_path, totals["accounts"])
+        if saved_errors:
+            _print_errors("保存后验证失败:", saved_errors)
+            return 1
+
+        backup_dir = Path(args.backup_dir) if args.backup_dir else None
+        backup_path = _create_backup(tracker_path, backup_dir)
+        print(f"已备份: {backup_path}")
+        os.replace(output_path, tracker_path)
+        progress_path.unlink(missing_ok=True)
+        print("迁移完成并验证通过。")
+        return 0
+    finally:
+        if output is not None:
+            output.close()
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="迁移 team_tracker.json 到新格式")
+    parser.add_argument(
+        "--file",
+        metavar="PATH",
+        help="追踪文件路径（默认 tracker_file 配置）",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="只显示变更，不实际修改文件",
+    )
+    parser.add_argument(
+        "--backup-dir",
+        metavar="DIR",
+        help="指定备份目录（默认与原文件同目录）",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="流式迁移：逐个 Team 处理并记录检查点，中断后可继续",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="（--stream）忽略已有检查点，从头开始",
+    )
+    parser.add_argument(
+        "--checkpoint-every",
+        type=int,
+        default=CHECKPOINT_EVERY,
+        metavar="N",
+        help=f"（--stream）每处理 N 个账号记录一次检查点（默认 {CHECKPOINT_EVERY}）",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=STREAM_CHUNK_SIZE,
+        metavar="BYTES",
+        help="（--stream）每次读取的字节数",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = _parse_args(argv)
+    tracker_path = Path(args.file or TEAM_TRACKER_FILE)
+    if not tracker_path.exists():
+        print(f"未找到追踪文件: {tracker_path}")
+        return 1
+
+    if args.stream:
+        return _migrate_streaming(tracker_path, args)
+    return _migrate_in_memory(tracker_path, args)
+
+
 if __name__ == "__main__":
     sys.exit(main())
@@ -9,9 +9,8 @@
 
 import time
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from urllib.parse import urlparse, parse_qs
+from typing import Iterator
 
 from src.core.config import (
     CPA_API_BASE,
@@ -21,35 +20,13 @@ from src.core.config import (
     CPA_IS_WEBUI,
     REQUEST_TIMEOUT,
     USER_AGENT,
-    PROXY_ENABLED,
-    get_proxy_dict,
 )
+from src.core.http import HttpClient
 from src.core.logger import log
 
 
-def create_session_with_retry():
-    """创建带重试机制的 HTTP Session"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "OPTIONS"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-
-    # 代理设置
-    if PROXY_ENABLED:
-        proxy_dict = get_proxy_dict()
-        if proxy_dict:
-            session.proxies = proxy_dict
-
-    return session
-
-
-http_session = create_session_with_retry()
+# 全局 HTTP Session (按 origin 共享连接池)
+http_session = HttpClient()
 
 
 def build_cpa_headers() -> dict:
@@ -275,57 +252,43 @@ def cpa_poll_auth_status(state: str) -> bool:
     return False
 
 
-def cpa_query_account(email: str) -> dict:
-    """查询 CPA 入库状态
+# CPA 账号列表接口 (按顺序尝试，404 视为不支持)
+CPA_ACCOUNT_LIST_ENDPOINTS = [
+    "/v0/management/accounts",
+    "/v0/management/account-list",
+]
 
-    Args:
-        email: 账号邮箱
 
-    Returns:
-        {
-            "exists": bool,
-            "account_id": str | None,
-            "account_data": dict | None
-        }
-    """
-    headers = build_cpa_headers()
-    target_email = (email or "").lower()
+def cpa_account_email(account: dict) -> str:
+    """读取 CPA 账号记录中的邮箱 (小写)"""
+    return (
+        account.get("email")
+        or account.get("name")
+        or account.get("account_email")
+        or ""
+    ).lower()
 
-    if not target_email:
-        return {"exists": False, "account_id": None, "account_data": None}
 
-    endpoints = [
-        "/v0/management/accounts",
-        "/v0/management/account-list",
-    ]
+def cpa_iter_accounts() -> Iterator[dict]:
+    """逐个产出 CPA 账号，标准化为 {"email", "id", "raw"}
 
-    max_retries = 3
+    依次尝试已知的账号列表接口，使用第一个可用接口的结果；
+    CPA 列表接口不分页，解析整页响应后逐条产出。
 
-    for endpoint in endpoints:
-        response = None
-        for attempt in range(max_retries + 1):
-            try:
-                response = http_session.get(
-                    f"{CPA_API_BASE}{endpoint}",
-                    headers=headers,
-                    timeout=REQUEST_TIMEOUT,
-                )
-                break
-            except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-                if attempt < max_retries:
-                    delay = 2**attempt
-                    log.warning(
-                        f"CPA 账号列表查询异常: {e}，{delay}s 后重试 "
-                        f"({attempt + 1}/{max_retries})"
-                    )
-                    time.sleep(delay)
-                    continue
-                log.error(f"CPA 账号列表查询失败，重试耗尽: {e}")
-            except Exception as e:
-                log.warning(f"CPA 账号列表查询异常: {e}")
-            break
-
-        if response is None:
+    Raises:
+        requests.RequestException: 所有接口均不可用
+    """
+    last_error = None
+    for endpoint in CPA_ACCOUNT_LIST_ENDPOINTS:
+        try:
+            response = http_session.get(
+                f"{CPA_API_BASE}{endpoint}",
+                headers=build_cpa_headers(),
+                timeout=REQUEST_TIMEOUT,
+            )
+        except Exception as e:
+            log.warning(f"CPA 账号列表查询异常: {e}")
+            last_error = e
             continue
 
         if response.status_code == 404:
@@ -335,12 +298,14 @@ def cpa_query_account(email: str) -> dict:
             log.warning(
                 f"CPA 账号列表查询失败: HTTP {response.status_code} ({endpoint})"
             )
+            last_error = f"HTTP {response.status_code} ({endpoint})"
             continue
 
         try:
             result = response.json()
         except Exception as e:
             log.warning(f"CPA 账号列表解析失败: {e}")
+            last_error = e
             continue
 
         accounts = []
@@ -353,22 +318,48 @@ def cpa_query_account(email: str) -> dict:
                 accounts = result.get("accounts", [])
 
         for account in accounts:
-            account_email = (
-                account.get("email")
-                or account.get("name")
-                or account.get("account_email")
-                or ""
-            ).lower()
-            if account_email == target_email:
+            yield {
+                "email": cpa_account_email(account),
+                "id": account.get("id") or account.get("account_id"),
+                "raw": account,
+            }
+        return
+
+    # TODO: CPA 未提供账号列表接口时，需要补充查询实现或调整接口路径。
+    raise requests.RequestException(
+        f"CPA 账号列表接口不可用: {last_error or '所有接口返回 404'}"
+    )
+
+
+def cpa_query_account(email: str) -> dict:
+    """查询 CPA 入库状态
+
+    Args:
+        email: 账号邮箱
+
+    Returns:
+        {
+            "exists": bool,
+            "account_id": str | None,
+            "account_data": dict | None
+        }
+    """
+    target_email = (email or "").lower()
+
+    if not target_email:
+        return {"exists": False, "account_id": None, "account_data": None}
+
+    try:
+        for record in cpa_iter_accounts():
+            if record["email"] == target_email:
                 return {
                     "exists": True,
-                    "account_id": account.get("id") or account.get("account_id"),
-                    "account_data": account,
+                    "account_id": record["id"],
+                    "account_data": record["raw"],
                 }
+    except requests.RequestException as e:
+        log.warning(str(e))
 
-        return {"exists": False, "account_id": None, "account_data": None}
-
-    # TODO: CPA 未提供账号列表接口时，需要补充查询实现或调整接口路径。
     return {"exists": False, "account_id": None, "account_data": None}
 
 
@@ -1,11 +1,9 @@
 # ==================== CRS 服务模块 ====================
 # 处理 CRS 系统相关功能 (Codex 授权、账号入库)
 
-import time
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from urllib.parse import urlparse, parse_qs
+from typing import Iterator
 
 from src.core.config import (
     CRS_API_BASE,
@@ -13,36 +11,14 @@ from src.core.config import (
     REQUEST_TIMEOUT,
     USER_AGENT,
     INCLUDE_TEAM_OWNERS,
-    PROXY_ENABLED,
     get_teams,
-    get_proxy_dict,
 )
+from src.core.http import HttpClient
 from src.core.logger import log
 
 
-def create_session_with_retry():
-    """创建带重试机制的 HTTP Session"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "OPTIONS"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-
-    # 代理设置
-    if PROXY_ENABLED:
-        proxy_dict = get_proxy_dict()
-        if proxy_dict:
-            session.proxies = proxy_dict
-
-    return session
-
-
-http_session = create_session_with_retry()
+# 全局 HTTP Session (按 origin 共享连接池)
+http_session = HttpClient()
 
 
 def build_crs_headers() -> dict:
@@ -249,26 +225,43 @@ def extract_code_from_url(url: str) -> str:
         return None
 
 
+def crs_iter_accounts() -> Iterator[dict]:
+    """逐个产出 CRS 账号，标准化为 {"email", "id", "raw"}
+
+    CRS 账号列表接口不分页，解析整页响应后逐条产出；
+    调用方可边遍历边匹配，无需另存完整列表。
+
+    Raises:
+        requests.RequestException: 查询失败 (重试耗尽 / HTTP 非 200 / success=false)
+    """
+    response = http_session.get(
+        f"{CRS_API_BASE}/admin/openai-accounts",
+        headers=build_crs_headers(),
+        timeout=REQUEST_TIMEOUT,
+    )
+    if response.status_code != 200:
+        raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+
+    result = response.json()
+    if not result.get("success"):
+        raise requests.RequestException(result.get("message", "Unknown error"))
+
+    for account in result.get("data") or []:
+        yield {
+            "email": (account.get("name") or "").lower(),
+            "id": account.get("id"),
+            "raw": account,
+        }
+
+
 def crs_get_accounts() -> list:
     """获取 CRS 中的所有账号
 
     Returns:
         list: 账号列表
     """
-    headers = build_crs_headers()
-
     try:
-        response = http_session.get(
-            f"{CRS_API_BASE}/admin/openai-accounts",
-            headers=headers,
-            timeout=REQUEST_TIMEOUT,
-        )
-
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("success"):
-                return result.get("data", [])
-
+        return [record["raw"] for record in crs_iter_accounts()]
     except Exception as e:
         log.warning(f"获取 CRS 账号列表异常: {e}")
 
@@ -284,13 +277,7 @@ def crs_check_account_exists(email: str) -> bool:
     Returns:
         bool: 是否存在
     """
-    accounts = crs_get_accounts()
-
-    for account in accounts:
-        if account.get("name", "").lower() == email.lower():
-            return True
-
-    return False
+    return crs_query_account(email)["exists"]
 
 
 def crs_query_account(email: str) -> dict:
@@ -306,55 +293,20 @@ def crs_query_account(email: str) -> dict:
             "account_data": dict | None
         }
     """
-    headers = build_crs_headers()
-    accounts = []
-    max_retries = 3
-
-    for attempt in range(max_retries + 1):
-        try:
-            response = http_session.get(
-                f"{CRS_API_BASE}/admin/openai-accounts",
-                headers=headers,
-                timeout=REQUEST_TIMEOUT,
-            )
-
-            if response.status_code == 200:
-                result = response.json()
-                if result.get("success"):
-                    accounts = result.get("data", [])
-                else:
-                    log.warning(
-                        f"CRS 账号列表查询失败: {result.get('message', 'Unknown error')}"
-                    )
-                break
-
-            log.warning(f"CRS 账号列表查询失败: HTTP {response.status_code}")
-            break
-
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt < max_retries:
-                delay = 2**attempt
-                log.warning(
-                    f"CRS 账号列表查询异常: {e}，{delay}s 后重试 "
-                    f"({attempt + 1}/{max_retries})"
-                )
-                time.sleep(delay)
-                continue
-            log.error(f"CRS 账号列表查询失败，重试耗尽: {e}")
-            break
-
-        except Exception as e:
-            log.warning(f"获取 CRS 账号列表异常: {e}")
-            break
     target_email = email.lower()
 
-    for account in accounts:
-        if account.get("name", "").lower() == target_email:
-            return {
-                "exists": True,
-                "account_id": account.get("id"),
-                "account_data": account,
-            }
+    try:
+        for record in crs_iter_accounts():
+            if record["email"] == target_email:
+                return {
+                    "exists": True,
+                    "account_id": record["id"],
+                    "account_data": record["raw"],
+                }
+    except requests.RequestException as e:
+        log.warning(f"CRS 账号列表查询失败: {e}")
+    except Exception as e:
+        log.warning(f"获取 CRS 账号列表异常: {e}")
 
     return {"exists": False, "account_id": None, "account_data": None}
 
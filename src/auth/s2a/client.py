@@ -7,12 +7,9 @@
 # - 授权流程: S2A 生成授权 URL -> 用户授权 -> 提交 code 换取 token -> 创建账号
 # - 账号入库: S2A 可一步完成 (create-from-oauth) 或分步完成 (exchange + add_account)
 
-import time
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from urllib.parse import urlparse, parse_qs
-from typing import Optional, Tuple, Dict, List, Any
+from typing import Optional, Tuple, Dict, List, Any, Iterator
 
 from src.core.config import (
     S2A_API_BASE,
@@ -24,9 +21,8 @@ from src.core.config import (
     S2A_GROUP_NAMES,
     REQUEST_TIMEOUT,
     USER_AGENT,
-    PROXY_ENABLED,
-    get_proxy_dict,
 )
+from src.core.http import HttpClient, set_retry_methods
 from src.core.logger import log
 
 
@@ -34,29 +30,10 @@ from src.core.logger import log
 _resolved_group_ids = None  # 缓存解析后的 group_ids
 
 
-def create_session_with_retry() -> requests.Session:
-    """创建带重试机制的 HTTP Session"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-
-    # 代理设置
-    if PROXY_ENABLED:
-        proxy_dict = get_proxy_dict()
-        if proxy_dict:
-            session.proxies = proxy_dict
-
-    return session
-
-
-http_session = create_session_with_retry()
+# 全局 HTTP Session (按 origin 共享连接池)
+http_session = HttpClient()
+# S2A 管理接口的 PUT / DELETE 为幂等操作，沿用原有的重试范围
+set_retry_methods(S2A_API_BASE, ["HEAD", "GET", "POST", "PUT", "DELETE", "OPTIONS"])
 
 
 def build_s2a_headers() -> Dict[str, str]:
@@ -422,29 +399,95 @@ def s2a_add_account(
 
 
 # ==================== 账号管理 ====================
-def s2a_get_accounts(platform: str = "openai") -> List[Dict[str, Any]]:
-    """获取账号列表"""
-    headers = build_s2a_headers()
+# 账号列表分页大小
+S2A_ACCOUNTS_PAGE_SIZE = 100
+
+
+def s2a_account_emails(account: Dict[str, Any]) -> List[str]:
+    """读取 S2A 账号记录关联的邮箱 (名称与凭证邮箱，小写)"""
+    account_name = (account.get("name") or "").lower()
+    credentials = account.get("credentials") or {}
+    account_email = (credentials.get("email") or "").lower()
+    return [value for value in (account_name, account_email) if value]
+
+
+def s2a_iter_accounts(
+    platform: str = "openai", page_size: int = S2A_ACCOUNTS_PAGE_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """分页遍历账号列表，逐个产出标准化记录 {"email", "id", "raw"}
+
+    按 page/page_size 逐页请求，内存中只保留当前页；
+    根据响应中的 pages / total 字段 (或本页条数不足 page_size) 判断是否为最后一页。
+    服务端忽略 page 参数时 (本页首个 id 与上一页相同) 停止翻页，不重复产出。
+
+    Raises:
+        requests.RequestException: 查询失败 (重试耗尽 / HTTP 非 200 / code 非 0)
+    """
+    page = 1
+    seen = 0
+    previous_first = None
+    while True:
+        params: Dict[str, Any] = {"page": page, "page_size": page_size}
+        if platform:
+            params["platform"] = platform
 
-    try:
-        params = {"platform": platform} if platform else {}
         response = http_session.get(
             f"{S2A_API_BASE}/admin/accounts",
-            headers=headers,
+            headers=build_s2a_headers(),
             params=params,
             timeout=REQUEST_TIMEOUT,
         )
+        if response.status_code != 200:
+            raise requests.HTTPError(f"HTTP {response.status_code}", response=response)
+
+        result = response.json()
+        if result.get("code") != 0:
+            raise requests.RequestException(result.get("message", "Unknown error"))
+
+        data = result.get("data", {})
+        total = None
+        if isinstance(data, dict):
+            items = data.get("items") or []
+            pages = data.get("pages")
+            total = data.get("total")
+        elif isinstance(data, list):
+            # 旧版本接口直接返回完整列表
+            items, pages = data, page
+        else:
+            items, pages = [], page
 
-        if response.status_code == 200:
-            result = response.json()
-            if result.get("code") == 0:
-                data = result.get("data", {})
-                if isinstance(data, dict) and "items" in data:
-                    return data.get("items", [])
-                elif isinstance(data, list):
-                    return data
-                return []
+        if not items:
+            break
+        first = items[0].get("id") or items[0].get("account_id") or items[0].get("name")
+        if page > 1 and first is not None and first == previous_first:
+            log.warning(f"S2A 账号列表第 {page} 页与上一页相同 (服务端未分页)，停止翻页")
+            break
+        previous_first = first
+
+        for account in items:
+            credentials = account.get("credentials") or {}
+            yield {
+                "email": (credentials.get("email") or account.get("name") or "").lower(),
+                "id": account.get("id") or account.get("account_id"),
+                "raw": account,
+            }
+        seen += len(items)
+
+        if pages:
+            if page >= pages:
+                break
+        elif isinstance(total, int) and total >= 0:
+            if seen >= total:
+                break
+        elif len(items) < page_size:
+            break
+        page += 1
 
+
+def s2a_get_accounts(platform: str = "openai") -> List[Dict[str, Any]]:
+    """获取账号列表 (自动翻页)"""
+    try:
+        return [record["raw"] for record in s2a_iter_accounts(platform)]
     except Exception as e:
         log.warning(f"S2A 获取账号列表异常: {e}")
 
@@ -453,15 +496,13 @@ def s2a_get_accounts(platform: str = "openai") -> List[Dict[str, Any]]:
 
 def s2a_check_account_exists(email: str, platform: str = "openai") -> bool:
     """检查账号是否已存在"""
-    accounts = s2a_get_accounts(platform)
-
-    for account in accounts:
-        account_name = account.get("name", "").lower()
-        credentials = account.get("credentials", {})
-        account_email = credentials.get("email", "").lower()
-
-        if account_name == email.lower() or account_email == email.lower():
-            return True
+    target_email = (email or "").lower()
+    try:
+        for record in s2a_iter_accounts(platform):
+            if target_email in s2a_account_emails(record["raw"]):
+                return True
+    except Exception as e:
+        log.warning(f"S2A 获取账号列表异常: {e}")
 
     return False
 
@@ -483,64 +524,18 @@ def s2a_query_account(email: str) -> dict:
     if not target_email:
         return {"exists": False, "account_id": None, "account_data": None}
 
-    accounts = []
-    headers = build_s2a_headers()
-    max_retries = 3
-
-    for attempt in range(max_retries + 1):
-        try:
-            response = http_session.get(
-                f"{S2A_API_BASE}/admin/accounts",
-                headers=headers,
-                params={"platform": "openai"},
-                timeout=REQUEST_TIMEOUT,
-            )
-        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
-            if attempt < max_retries:
-                delay = 2**attempt
-                log.warning(
-                    f"S2A 账号列表查询异常: {e}，{delay}s 后重试 "
-                    f"({attempt + 1}/{max_retries})"
-                )
-                time.sleep(delay)
-                continue
-            log.error(f"S2A 账号列表查询失败，重试耗尽: {e}")
-            break
-        except Exception as e:
-            log.warning(f"S2A 账号列表查询异常: {e}")
-            break
-
-        if response.status_code != 200:
-            log.warning(f"S2A 账号列表查询失败: HTTP {response.status_code}")
-            break
-
-        try:
-            result = response.json()
-        except Exception as e:
-            log.warning(f"S2A 账号列表解析失败: {e}")
-            break
-
-        if result.get("code") == 0:
-            data = result.get("data", {})
-            if isinstance(data, dict) and "items" in data:
-                accounts = data.get("items", [])
-            elif isinstance(data, list):
-                accounts = data
-            break
-
-        log.warning(f"S2A 账号列表查询失败: {result.get('message', 'Unknown error')}")
-        break
-    for account in accounts:
-        account_name = (account.get("name") or "").lower()
-        credentials = account.get("credentials") or {}
-        account_email = (credentials.get("email") or "").lower()
-
-        if account_name == target_email or account_email == target_email:
-            return {
-                "exists": True,
-                "account_id": account.get("id") or account.get("account_id"),
-                "account_data": account,
-            }
+    try:
+        for record in s2a_iter_accounts("openai"):
+            if target_email in s2a_account_emails(record["raw"]):
+                return {
+                    "exists": True,
+                    "account_id": record["id"],
+                    "account_data": record["raw"],
+                }
+    except requests.RequestException as e:
+        log.warning(f"S2A 账号列表查询失败: {e}")
+    except Exception as e:
+        log.warning(f"S2A 账号列表查询异常: {e}")
 
     return {"exists": False, "account_id": None, "account_data": None}
 
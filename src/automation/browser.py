@@ -6,7 +6,6 @@ import time
 import random
 import subprocess
 import re
-import shutil
 from pathlib import Path
 from datetime import datetime
 from contextlib import contextmanager
@@ -37,8 +36,9 @@ from src.auth.cpa.client import (
     is_cpa_callback_url,
 )
 from src.auth.s2a.client import s2a_generate_auth_url
-from src.core.logger import LOG_DIR, LOG_FILE, log
-from src.core.storage_manager import check_account_stored
+from src.core.failure_artifacts import create_failure_dir, record_failure
+from src.core.logger import log
+from src.core.storage_manager import check_account_stored, record_provider_account
 
 
 # ==================== 浏览器配置常量 ====================
@@ -47,7 +47,7 @@ BROWSER_RETRY_DELAY = 2  # 重试间隔 (秒)
 PAGE_LOAD_TIMEOUT = 15  # 页面加载超时 (秒)
 
 # ==================== 失败输出配置 ====================
-FAILED_DIR = LOG_DIR / "falid"
+FAILED_DIR = Path(config.FAILURE_DIR)
 _ACTIVE_PAGE = None
 
 # ==================== 输入速度配置 (模拟真人) ====================
@@ -87,10 +87,8 @@ def capture_page_screenshot(page, reason: str | None = None) -> str | None:
     if not page:
         return None
 
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    failure_dir = FAILED_DIR / timestamp
     try:
-        failure_dir.mkdir(parents=True, exist_ok=True)
+        failure_dir = create_failure_dir(FAILED_DIR)
     except Exception as exc:
         log.warning(f"创建失败目录失败: {exc}")
         return None
@@ -121,7 +119,15 @@ def capture_page_screenshot(page, reason: str | None = None) -> str | None:
     except Exception as exc:
         log.warning(f"截图失败: {exc}")
 
-    _copy_execution_logs(failure_dir)
+    try:
+        record_failure(
+            failure_dir,
+            reason=reason or "",
+            files=[path] if screenshot_ok else None,
+            root=FAILED_DIR,
+        )
+    except Exception as exc:
+        log.warning(f"保存失败日志失败: {exc}")
     log.warning(f"失败信息已保存到: {failure_dir}")
     return str(path) if screenshot_ok else None
 
@@ -130,28 +136,6 @@ def capture_current_page_screenshot(reason: str | None = None) -> str | None:
     return capture_page_screenshot(_ACTIVE_PAGE, reason=reason)
 
 
-def _copy_execution_logs(target_dir: Path) -> None:
-    try:
-        target_dir.mkdir(parents=True, exist_ok=True)
-    except Exception as exc:
-        log.warning(f"创建失败日志目录失败: {exc}")
-        return
-
-    if LOG_FILE.exists():
-        try:
-            shutil.copy2(LOG_FILE, target_dir / LOG_FILE.name)
-        except Exception as exc:
-            log.warning(f"复制日志文件失败: {exc}")
-
-    for log_path in LOG_DIR.glob(f"{LOG_FILE.name}.*"):
-        if not log_path.is_file():
-            continue
-        try:
-            shutil.copy2(log_path, target_dir / log_path.name)
-        except Exception as exc:
-            log.warning(f"复制日志文件失败: {exc}")
-
-
 def log_current_url(page, context: str = None, force: bool = False):
     """记录当前页面URL (完整地址)
 
@@ -3404,7 +3388,9 @@ def login_and_authorize_team_owner(
 
                 if AUTH_PROVIDER == "cpa":
                     success = perform_cpa_authorization(page, email, password)
-                    if not success:
+                    if success:
+                        record_provider_account("cpa", email)
+                    else:
                         ctx.capture_failure("cpa_authorize_failed")
                     return {
                         "success": success,
@@ -3429,6 +3415,8 @@ def login_and_authorize_team_owner(
                             name=email,
                             expires_at=expires_at,
                         )
+                        if s2a_result:
+                            record_provider_account("s2a", email, s2a_result.get("id"))
                         return {
                             "success": bool(s2a_result),
                             "token": token,
@@ -3464,6 +3452,8 @@ def login_and_authorize_team_owner(
                         from src.auth.crs.client import crs_add_account
 
                         crs_result = crs_add_account(email, codex_data)
+                        if crs_result:
+                            record_provider_account("crs", email, crs_result.get("id"))
                         return {
                             "success": bool(crs_result),
                             "token": token,
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import argparse
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser(
+        "metrics",
+        help="以 Prometheus 文本格式导出账号状态指标 (读取状态统计缓存)",
+        description=(
+            "以 Prometheus 文本格式导出各 Team 账号 / 入库状态指标。"
+            "阶段耗时、入库查询耗时与 HTTP 统计只存在于运行 start 的进程中，"
+            "本命令不导出；需要这些指标时在 config.toml 的 [metrics] 中配置 textfile 或 port，"
+            "由 start 进程导出。"
+        ),
+    )
+    parser.add_argument("--textfile", metavar="PATH", help="原子写入 textfile (默认输出到终端)")
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=0,
+        metavar="SECONDS",
+        help="配合 --textfile 每隔 SECONDS 秒重写一次 (0 表示只写一次)",
+    )
+    parser.add_argument(
+        "--serve",
+        type=int,
+        nargs="?",
+        const=9108,
+        metavar="PORT",
+        help="在本地端口提供 GET /metrics (默认 9108)，Ctrl+C 退出",
+    )
+    parser.set_defaults(func=metrics_command)
+
+
+def metrics_command(args: argparse.Namespace) -> int:
+    import sys
+    import time
+
+    from src.core.logger import log
+    from src.core.metrics import render_metrics, serve_metrics, write_textfile
+
+    if args.serve is None and not args.textfile:
+        sys.stdout.write(render_metrics())
+        return 0
+
+    server = None
+    try:
+        if args.serve is not None:
+            server = serve_metrics(args.serve)
+            host, port = server.server_address[:2]
+            log.info(f"指标端口: http://{host}:{port}/metrics")
+        if args.textfile:
+            log.info(f"写入指标文件: {write_textfile(args.textfile)}")
+        if server is None and args.interval <= 0:
+            return 0
+        while True:
+            time.sleep(args.interval if args.interval > 0 else 3600)
+            if args.textfile and args.interval > 0:
+                write_textfile(args.textfile)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        if server is not None:
+            server.shutdown()
+            server.server_close()
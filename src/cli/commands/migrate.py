@@ -11,11 +11,15 @@ def add_parser(subparsers: argparse._SubParsersAction) -> None:
     group.add_argument("--list", action="store_true", help="列出迁移记录")
     group.add_argument("--create", action="store_true", help="创建迁移记录")
     group.add_argument("--verify", action="store_true", help="验收迁移记录")
+    group.add_argument("--compact", action="store_true", help="将追加日志合并到快照")
 
     parser.add_argument("--id", dest="record_id", help="迁移记录 ID")
     parser.add_argument("--legacy", dest="legacy_path", help="旧路径")
     parser.add_argument("--new", dest="new_path", help="新路径")
-    parser.add_argument("--capability-id", help="能力 ID")
+    parser.add_argument("--capability-id", help="能力 ID (--list 时作为筛选条件)")
+    parser.add_argument("--status", help="--list 时按状态筛选")
+    parser.add_argument("--limit", type=int, default=0, help="--list 最多显示的条数 (默认 0 表示不限)")
+    parser.add_argument("--offset", type=int, default=0, help="--list 跳过的条数")
     parser.add_argument("--verified-by", help="验收人")
     parser.add_argument("--notes", help="备注")
     parser.set_defaults(func=migrate_command)
@@ -27,14 +31,30 @@ def migrate_command(args: argparse.Namespace) -> int:
     store = MigrationStore()
 
     if args.list:
-        records = store.list_records()
+        total = store.count_records(status=args.status, capability_id=args.capability_id)
+        records = store.list_records(
+            status=args.status,
+            capability_id=args.capability_id,
+            offset=max(0, args.offset),
+            limit=args.limit if args.limit and args.limit > 0 else None,
+        )
         if not records:
-            log.info("暂无迁移记录")
+            if total:
+                log.info(f"--offset {args.offset} 超出记录总数 ({total} 条)")
+            else:
+                log.info("暂无迁移记录")
             return 0
         for record in records:
             log.info(
                 f"{record.id}: {record.legacy_path} -> {record.new_path} ({record.status})"
             )
+        start = max(0, args.offset)
+        log.info(f"显示 {start + 1}-{start + len(records)} / 共 {total} 条")
+        return 0
+
+    if args.compact:
+        store.compact()
+        log.success(f"迁移记录已压缩: {store.path}")
         return 0
 
     if args.create:
@@ -63,5 +83,5 @@ def migrate_command(args: argparse.Namespace) -> int:
         log.success(f"已验收迁移记录: {args.record_id}")
         return 0
 
-    log.error("请指定 --list/--create/--verify")
+    log.error("请指定 --list/--create/--verify/--compact")
     return 1
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import argparse
+
+from src.core.logger import log
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("reconcile", help="批量核对账号入库状态")
+    parser.add_argument(
+        "--provider",
+        action="append",
+        choices=["crs", "cpa", "s2a"],
+        help="只核对指定服务商 (可重复，默认: 全部已启用的服务商)",
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="只输出差异报告，不写入追踪记录"
+    )
+    parser.add_argument(
+        "--verbose", action="store_true", help="列出每个缺失/孤立账号"
+    )
+    parser.set_defaults(func=reconcile_command)
+
+
+def reconcile_command(args: argparse.Namespace) -> int:
+    from src.core.storage_manager import get_enabled_providers, reconcile_storage
+    from src.core.utils import load_team_tracker, save_team_tracker
+
+    providers = args.provider or get_enabled_providers()
+    if not providers:
+        log.error("没有已启用的服务商 (请检查 crs/cpa/s2a 配置)")
+        return 1
+
+    tracker = load_team_tracker()
+    report = reconcile_storage(tracker, providers, apply=not args.dry_run)
+
+    exit_code = 0
+    changed_total = 0
+    for provider, result in report.items():
+        log.separator()
+        if result is None:
+            log.error(f"[{provider}] 清单拉取失败，未核对")
+            exit_code = 1
+            continue
+
+        log.info(
+            f"[{provider}] 已入库 {len(result['stored'])} / "
+            f"未入库 {len(result['missing'])} / "
+            f"孤立 {len(result['orphaned'])} / "
+            f"状态变化 {len(result['changed'])}"
+        )
+        for change in result["changed"]:
+            log.info(
+                f"  {change['team']} {change['email']}: "
+                f"{change['old'] or '-'} -> {change['new']}"
+            )
+        if args.verbose:
+            for entry in result["missing"]:
+                log.info(f"  未入库: {entry['team']} {entry['email']}")
+            for email in result["orphaned"]:
+                log.info(f"  孤立 (服务商中存在，tracker 中无记录): {email}")
+        changed_total += len(result["changed"])
+
+    log.separator()
+    if args.dry_run:
+        log.info(f"dry-run: {changed_total} 处变化未写入")
+    elif changed_total:
+        save_team_tracker(tracker)
+        log.success(f"已更新 {changed_total} 处入库状态")
+    else:
+        log.success("入库状态与服务商一致，无需更新")
+
+    return exit_code
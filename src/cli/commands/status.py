@@ -5,11 +5,28 @@ import argparse
 
 def add_parser(subparsers: argparse._SubParsersAction) -> None:
     parser = subparsers.add_parser("status", help="查看当前进度")
+    parser.add_argument("--json", action="store_true", help="以 JSON 输出统计")
+    parser.add_argument(
+        "--watch",
+        type=float,
+        nargs="?",
+        const=2.0,
+        metavar="SECONDS",
+        help="持续刷新 (默认每 2 秒检查一次)",
+    )
+    parser.add_argument(
+        "--accounts", action="store_true", help="逐个列出账号 (加载完整追踪记录)"
+    )
     parser.set_defaults(func=status_command)
 
 
-def status_command(_: argparse.Namespace) -> int:
-    from src.core.workflow import show_status
+def status_command(args: argparse.Namespace) -> int:
+    from src.core.status import print_status_json, show_status, watch_status
 
-    show_status()
+    if args.watch is not None:
+        watch_status(max(args.watch, 0.2), as_json=args.json)
+    elif args.json:
+        print_status_json()
+    else:
+        show_status(accounts=args.accounts)
     return 0
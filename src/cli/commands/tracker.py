@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import argparse
+import json
+
+from src.core.logger import log
+
+
+def add_parser(subparsers: argparse._SubParsersAction) -> None:
+    parser = subparsers.add_parser("tracker", help="追踪记录导入/导出/归档")
+    actions = parser.add_subparsers(dest="tracker_action")
+
+    export_parser = actions.add_parser("export", help="导出追踪记录为 JSON")
+    export_parser.add_argument(
+        "--output", help="输出文件路径 (默认: tracker_file 配置路径)"
+    )
+    export_parser.set_defaults(func=export_command)
+
+    import_parser = actions.add_parser("import", help="从 JSON 导入追踪记录")
+    import_parser.add_argument(
+        "--input", help="输入文件路径 (默认: tracker_file 配置路径)"
+    )
+    import_parser.set_defaults(func=import_command)
+
+    compact_parser = actions.add_parser(
+        "compact", help="将早已完成的账号移入冷归档 (gzip JSONL，按月分区)"
+    )
+    compact_parser.add_argument(
+        "--days",
+        type=int,
+        help="归档超过 N 天未更新的 completed 账号 (默认: tracker_archive_days 配置)",
+    )
+    compact_parser.add_argument(
+        "--dry-run", action="store_true", help="只统计可归档的账号，不写入"
+    )
+    compact_parser.set_defaults(func=compact_command)
+
+    lookup_parser = actions.add_parser("lookup", help="按 email 查找账号 (含冷归档)")
+    lookup_parser.add_argument("email", help="邮箱地址")
+    lookup_parser.set_defaults(func=lookup_command)
+
+    parser.set_defaults(func=_help_command(parser))
+
+
+def _help_command(parser: argparse.ArgumentParser):
+    def _command(_: argparse.Namespace) -> int:
+        parser.print_help()
+        return 1
+
+    return _command
+
+
+def export_command(args: argparse.Namespace) -> int:
+    from src.core.config import TEAM_TRACKER_FILE
+    from src.core.fileio import locked_atomic_write_json
+    from src.core.utils import load_team_tracker
+
+    output = args.output or TEAM_TRACKER_FILE
+    tracker = load_team_tracker()
+    try:
+        locked_atomic_write_json(output, tracker)
+    except Exception as exc:
+        log.error(f"导出追踪记录失败: {exc}")
+        return 1
+
+    total = sum(len(accounts) for accounts in tracker.get("teams", {}).values())
+    log.success(f"已导出 {total} 个账号到 {output}")
+    return 0
+
+
+def import_command(args: argparse.Namespace) -> int:
+    from src.core.config import TEAM_TRACKER_FILE
+    from src.core.tracker_store import get_tracker_store
+
+    source = args.input or TEAM_TRACKER_FILE
+    try:
+        with open(source, "r", encoding="utf-8") as f:
+            tracker = json.load(f)
+    except (OSError, json.JSONDecodeError) as exc:
+        log.error(f"读取追踪记录失败: {exc}")
+        return 1
+
+    if not isinstance(tracker.get("teams"), dict):
+        log.error("追踪记录格式错误: 缺少 teams 字段")
+        return 1
+
+    store = get_tracker_store()
+    try:
+        store.import_tracker(tracker)
+    except Exception as exc:
+        log.error(f"导入追踪记录失败: {exc}")
+        return 1
+
+    total = sum(len(accounts) for accounts in tracker["teams"].values())
+    log.success(f"已导入 {total} 个账号 (后端: {store.backend})")
+    return 0
+
+
+def compact_command(args: argparse.Namespace) -> int:
+    from src.core.config import TRACKER_ARCHIVE_DAYS, TRACKER_ARCHIVE_DIR
+    from src.core.tracker_archive import compact_tracker
+    from src.core.utils import load_team_tracker, rewrite_team_tracker
+
+    days = TRACKER_ARCHIVE_DAYS if args.days is None else args.days
+    if days < 0:
+        log.error("--days 不能为负数")
+        return 1
+
+    tracker = load_team_tracker()
+    try:
+        report = compact_tracker(tracker, days, dry_run=args.dry_run)
+    except Exception as exc:
+        log.error(f"归档失败: {exc}")
+        return 1
+
+    for team_name, count in sorted(report["teams"].items()):
+        log.info(f"{team_name}: {count} 个账号")
+    if args.dry_run:
+        log.info(f"dry-run: {report['archived']} 个超过 {days} 天的已完成账号可归档")
+        return 0
+    if not report["archived"]:
+        log.success(f"没有超过 {days} 天的已完成账号，无需归档")
+        return 0
+
+    try:
+        rewrite_team_tracker(tracker)
+    except Exception as exc:
+        log.error(f"保存追踪记录失败 (归档已写入，可重新执行): {exc}")
+        return 1
+
+    for name, count in sorted(report["partitions"].items()):
+        log.info(f"{name}: +{count}")
+    log.success(f"已归档 {report['archived']} 个账号到 {TRACKER_ARCHIVE_DIR}")
+    return 0
+
+
+def lookup_command(args: argparse.Namespace) -> int:
+    from src.core.tracker_archive import find_archived_accounts
+    from src.core.utils import load_team_tracker
+
+    email = args.email.strip().lower()
+    found = False
+    tracker = load_team_tracker()
+    for team_name, accounts in tracker.get("teams", {}).items():
+        for account in accounts:
+            if account.get("email", "").lower() == email:
+                found = True
+                log.info(f"[追踪记录] {team_name}")
+                print(json.dumps(account, ensure_ascii=False, indent=2))
+
+    for record in find_archived_accounts(email):
+        found = True
+        log.info(f"[归档 {record.get('archived_at')}] {record.get('team')}")
+        print(json.dumps(record.get("account"), ensure_ascii=False, indent=2))
+
+    if not found:
+        log.warning(f"未找到账号: {args.email}")
+        return 1
+    return 0
@@ -2,10 +2,13 @@ import argparse
 import sys
 
 from src.cli.commands import create_parent_account as create_parent_account_cmd
+from src.cli.commands import metrics as metrics_cmd
 from src.cli.commands import migrate as migrate_cmd
+from src.cli.commands import reconcile as reconcile_cmd
 from src.cli.commands import register as register_cmd
 from src.cli.commands import start as start_cmd
 from src.cli.commands import status as status_cmd
+from src.cli.commands import tracker as tracker_cmd
 from src.cli.commands import validate as validate_cmd
 
 
@@ -19,6 +22,9 @@ def build_parser() -> argparse.ArgumentParser:
     migrate_cmd.add_parser(subparsers)
     register_cmd.add_parser(subparsers)
     create_parent_account_cmd.add_parser(subparsers)
+    tracker_cmd.add_parser(subparsers)
+    reconcile_cmd.add_parser(subparsers)
+    metrics_cmd.add_parser(subparsers)
 
     return parser
 
@@ -217,11 +217,71 @@ def _ensure_teams_loaded() -> None:
     for i, t in enumerate(_raw_teams):
         team_config = _parse_team_config(t, i)
         TEAMS.append(team_config)
+    reindex_teams()
 
 
 # 转换 team.json 格式为 team_service.py 期望的格式 (延迟加载)
 TEAMS: list[dict] = []
 
+# Team 查找索引: 类型 → {值: Team 配置}，加载 team.json 时建立
+_TEAM_INDEX_KINDS = ("name", "email", "org", "account_id")
+_team_index: dict[str, dict[str, dict]] = {kind: {} for kind in _TEAM_INDEX_KINDS}
+# id(team) → 建索引时的键值 (用于 update_team_index 删除旧值)
+_team_index_entries: dict[int, dict] = {}
+# 建索引时的 (id(TEAMS), len(TEAMS))，不一致时说明列表已变化
+_team_index_state: tuple = ()
+
+
+def _team_index_keys(team: dict) -> dict:
+    return {
+        "name": team.get("name", ""),
+        "email": (team.get("owner_email") or "").lower(),
+        "org": team.get("org_id", ""),
+        "account_id": team.get("account_id", ""),
+    }
+
+
+def reindex_teams() -> None:
+    """重建 Team 查找索引 (同一个值对应多个 Team 时保留第一个，与顺序查找一致)"""
+    global _team_index_state
+    for kind in _TEAM_INDEX_KINDS:
+        _team_index[kind] = {}
+    _team_index_entries.clear()
+    for team in TEAMS:
+        _index_team(team)
+    _team_index_state = (id(TEAMS), len(TEAMS))
+
+
+def _index_team(team: dict) -> None:
+    keys = _team_index_keys(team)
+    _team_index_entries[id(team)] = keys
+    for kind, value in keys.items():
+        if value:
+            _team_index[kind].setdefault(value, team)
+
+
+def update_team_index(team: dict) -> None:
+    """运行中修改了 Team 的名称 / 邮箱 / org_id / account_id 后调用，只更新这一个 Team 的索引项"""
+    _ensure_teams_loaded()
+    old_keys = _team_index_entries.get(id(team), {})
+    for kind, value in old_keys.items():
+        if _team_index[kind].get(value) is team:
+            del _team_index[kind][value]
+    _index_team(team)
+
+
+def _lookup_team(kind: str, value: str) -> dict:
+    _ensure_teams_loaded()
+    if not value:
+        return {}
+    if _team_index_state != (id(TEAMS), len(TEAMS)):
+        # TEAMS 被替换或增删过，整体重建；未命中本身不触发重建
+        reindex_teams()
+    team = _team_index[kind].get(value)
+    if team is not None and _team_index_keys(team)[kind] == value:
+        return team
+    return {}
+
 
 def get_teams() -> list[dict]:
     """获取 Team 列表 (按需加载 team.json)"""
@@ -238,45 +298,16 @@ def get_raw_teams() -> list:
 def save_team_json():
     """保存 team.json (用于持久化 account_id、token、authorized 等动态获取的数据)
 
-    仅对新格式的 Team 配置生效
+    仅对新格式的 Team 配置生效；只合并写入发生变化的字段 (文件锁 + 原子替换)，无变化时不写文件
     """
     _ensure_teams_loaded()
     if not TEAM_JSON_FILE.exists():
         return False
 
-    updated = False
-    for team in TEAMS:
-        if team.get("format") == "new":
-            raw = team.get("raw", {})
-            # 保存 account_id
-            if team.get("account_id") and raw.get("account_id") != team["account_id"]:
-                raw["account_id"] = team["account_id"]
-                updated = True
-            # 保存 access_token (使用新字段名)
-            if team.get("access_token"):
-                if raw.get("access_token") != team["access_token"]:
-                    raw["access_token"] = team["access_token"]
-                    updated = True
-            # 保存 refresh_token
-            if team.get("refresh_token") and raw.get("refresh_token") != team["refresh_token"]:
-                raw["refresh_token"] = team["refresh_token"]
-                updated = True
-            # 保存 token_expires_at
-            if team.get("token_expires_at") and raw.get("token_expires_at") != team["token_expires_at"]:
-                raw["token_expires_at"] = team["token_expires_at"]
-                updated = True
-            # 保存 authorized 状态
-            if team.get("authorized") and not raw.get("authorized"):
-                raw["authorized"] = True
-                updated = True
-
-    if not updated:
-        return False
+    from src.core.team_store import save_teams
 
     try:
-        with open(TEAM_JSON_FILE, "w", encoding="utf-8") as f:
-            json.dump(get_raw_teams(), f, ensure_ascii=False, indent=2)
-        return True
+        return save_teams(TEAMS, TEAM_JSON_FILE)
     except Exception as e:
         _log_config("ERROR", "team.json", "保存失败", str(e))
         return False
@@ -437,6 +468,19 @@ def get_random_birthday() -> dict:
 # 请求
 _req = _cfg.get("request", {})
 REQUEST_TIMEOUT = _req.get("timeout", 30)
+# 服务商账号清单缓存有效期 (秒)，0 表示每次查询都重新拉取
+STORAGE_INVENTORY_TTL = _req.get("inventory_ttl", 300)
+# 清单拉取失败后的退避时间 (秒)，期间直接回退逐个查询，不再重复拉取清单
+STORAGE_INVENTORY_RETRY_AFTER = _req.get("inventory_retry_after", 60)
+# 共享 HTTP 连接池: 每个 origin 一个 Session，pool_maxsize 为单个 origin 的最大连接数
+HTTP_POOL_CONNECTIONS = _req.get("pool_connections", 10)
+HTTP_POOL_MAXSIZE = _req.get("pool_maxsize", 10)
+HTTP_POOL_BLOCK = _req.get("pool_block", False)
+HTTP_MAX_RETRIES = _req.get("max_retries", 5)
+HTTP_BACKOFF_FACTOR = _req.get("backoff_factor", 1)
+# 允许自动重试的请求方法 (默认不含 PUT / DELETE / PATCH)，可按服务地址单独覆盖
+HTTP_RETRY_METHODS = _req.get("retry_methods", ["HEAD", "GET", "POST", "OPTIONS"])
+HTTP_RETRY_METHODS_BY_HOST = _req.get("retry_methods_by_host", {})
 USER_AGENT = _req.get(
     "user_agent", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/135.0.0.0"
 )
@@ -456,7 +500,42 @@ BROWSER_HEADLESS = _browser.get("headless", False)
 # 文件
 _files = _cfg.get("files", {})
 CSV_FILE = _files.get("csv_file", str(BASE_DIR / "accounts.csv"))
+# CSV 超过该大小 (字节) 后轮转，0 表示不轮转
+CSV_ROTATE_BYTES = _files.get("csv_rotate_bytes", 0)
+CSV_COMPRESS = _files.get("csv_compress", False)
 TEAM_TRACKER_FILE = _files.get("tracker_file", str(BASE_DIR / "team_tracker.json"))
+# 追踪记录存储后端: "json" (整文件) 或 "sqlite" (按账号行 upsert)
+TRACKER_BACKEND = _files.get("tracker_backend", "json")
+TRACKER_DB_FILE = _files.get("tracker_db_file", str(BASE_DIR / "team_tracker.db"))
+# JSON 后端写入模式: "immediate" (每次保存整文件) 或 "write_behind" (追加日志，边界时快照)
+TRACKER_WRITE_MODE = _files.get("tracker_write_mode", "immediate")
+# 追踪记录冷归档: completed 且超过 tracker_archive_days 天未更新的成员账号移入 gzip JSONL 归档
+TRACKER_ARCHIVE_DIR = _files.get(
+    "tracker_archive_dir", str(BASE_DIR / "tracker_archive")
+)
+TRACKER_ARCHIVE_DAYS = _files.get("tracker_archive_days", 30)
+# 每次 start 加载追踪记录后自动归档
+TRACKER_AUTO_COMPACT = _files.get("tracker_auto_compact", False)
+# 结构化事件流 (JSON Lines)，设为空字符串关闭
+EVENTS_FILE = _files.get("events_file", str(BASE_DIR / "logs" / "events.jsonl"))
+EVENTS_BUFFER_SIZE = _files.get("events_buffer_size", 50)
+# 运行结束时写入阶段耗时统计 (profile-*.json) 的目录，设为空字符串关闭
+PROFILE_DIR = _files.get("profile_dir", str(BASE_DIR / "logs" / "profiles"))
+# 失败现场 (截图 / 日志尾部 / 去重后的轮转日志段) 目录与保留策略 (0 表示不限)
+FAILURE_DIR = _files.get("failure_dir", str(BASE_DIR / "logs" / "falid"))
+FAILURE_MAX_COUNT = _files.get("failure_max_count", 200)
+FAILURE_MAX_BYTES = _files.get("failure_max_bytes", 512 * 1024 * 1024)
+FAILURE_LOG_TAIL_BYTES = _files.get("failure_log_tail_bytes", 256 * 1024)
+
+# 运行指标 (Prometheus 文本格式)
+_metrics = _cfg.get("metrics", {})
+# 定期原子写入的 textfile 路径 (node_exporter textfile collector)，空字符串表示不写
+METRICS_TEXTFILE = _metrics.get("textfile", "")
+# 提供 GET /metrics 的本地端口，0 表示不监听
+METRICS_PORT = _metrics.get("port", 0)
+METRICS_HOST = _metrics.get("host", "127.0.0.1")
+# textfile 写入间隔 (秒)
+METRICS_INTERVAL = _metrics.get("interval", 15)
 
 # 代理
 PROXY_ENABLED = _cfg.get("proxy_enabled", False)
@@ -660,18 +739,17 @@ def get_team(index: int = 0) -> dict:
     return teams[index] if 0 <= index < len(teams) else {}
 
 
+def get_team_by_name(name: str) -> dict:
+    return _lookup_team("name", name)
+
+
 def get_team_by_email(email: str) -> dict:
-    return next(
-        (t for t in get_teams() if t.get("user", {}).get("email") == email), {}
-    )
+    return _lookup_team("email", (email or "").lower())
 
 
 def get_team_by_org(org_id: str) -> dict:
-    return next(
-        (
-            t
-            for t in get_teams()
-            if t.get("account", {}).get("organizationId") == org_id
-        ),
-        {},
-    )
+    return _lookup_team("org", org_id)
+
+
+def get_team_by_account_id(account_id: str) -> dict:
+    return _lookup_team("account_id", account_id)
@@ -0,0 +1,232 @@
+# ==================== CSV 追加写入模块 ====================
+# 长期持有文件句柄的 accounts.csv 追加写入器，可选按大小轮转 / 压缩
+
+"""CSV Appender - accounts.csv 追加写入
+
+整个运行期间只打开一次文件，表头只在新文件时写入一次；
+调用方在账号边界调用 flush_csv()，进程退出时自动 flush 并关闭。
+
+csv_rotate_bytes > 0 时，文件超过该大小后轮转为编号递增的归档 accounts.csv.1, accounts.csv.2 ...
+(编号越大越新)。accounts.csv 是生成账号凭据的唯一记录，归档数量不设上限，轮转不会删除任何行。
+csv_compress = true 时写入线程只做一次改名，归档在后台线程 gzip 为 accounts.csv.N.gz；
+启动时遗留的未压缩归档会重新压缩。
+
+Classes:
+    CsvAppender: CSV 追加写入器
+
+Functions:
+    get_csv_appender: 获取全局写入器 (workflow / register 共用)
+    reset_csv_appender: 关闭并替换全局写入器 (测试用)
+    flush_csv: 将缓冲写入磁盘
+    close_csv: 关闭全局写入器
+"""
+
+from __future__ import annotations
+
+import atexit
+import csv
+import gzip
+import os
+import queue
+import re
+import shutil
+import threading
+import time
+from pathlib import Path
+
+from src.core.config import CSV_COMPRESS, CSV_FILE, CSV_ROTATE_BYTES
+from src.core.logger import log
+
+CSV_HEADER = ["email", "password", "team", "status", "crs_id", "timestamp"]
+
+
+class CsvAppender:
+    """CSV 追加写入器 (线程安全)"""
+
+    def __init__(
+        self,
+        path: str,
+        header: list[str] | None = None,
+        rotate_bytes: int = 0,
+        compress: bool = False,
+    ):
+        self.path = str(path)
+        self.header = list(header or CSV_HEADER)
+        self.rotate_bytes = max(0, int(rotate_bytes or 0))
+        self.compress = bool(compress)
+        self._file = None
+        self._writer = None
+        self._lock = threading.Lock()
+        self._next_index: int | None = None
+        self._tasks: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        if self.rotate_bytes and self.compress:
+            for archive in self._uncompressed_archives():
+                self._schedule_compress(archive)
+
+    def _open(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(self.path, "a", newline="", encoding="utf-8")
+        self._writer = csv.writer(self._file)
+        if self._file.tell() == 0:
+            self._writer.writerow(self.header)
+
+    def append(self, row: list):
+        """追加一行 (写入文件缓冲，flush 时落盘)"""
+        with self._lock:
+            if self._file is None:
+                self._open()
+            self._writer.writerow(row)
+            if self.rotate_bytes and self._file.tell() >= self.rotate_bytes:
+                self._rotate()
+
+    def _archive_indexes(self) -> dict[int, set[str]]:
+        """已有归档: {编号: {"", ".gz", ...}}"""
+        directory = Path(self.path).parent
+        if not directory.is_dir():
+            return {}
+        pattern = re.compile(re.escape(Path(self.path).name) + r"\.(\d+)(\.gz)?$")
+        indexes: dict[int, set[str]] = {}
+        for entry in directory.iterdir():
+            match = pattern.match(entry.name)
+            if match:
+                indexes.setdefault(int(match.group(1)), set()).add(match.group(2) or "")
+        return indexes
+
+    def _archive_name(self, index: int, compressed: bool = False) -> str:
+        return f"{self.path}.{index}{'.gz' if compressed else ''}"
+
+    def _rotate(self):
+        self._close_file()
+        if self._next_index is None:
+            self._next_index = max(self._archive_indexes(), default=0) + 1
+        archive = self._archive_name(self._next_index)
+        self._next_index += 1
+        os.replace(self.path, archive)
+        if not self.compress:
+            log.info(f"CSV 已轮转: {archive}", icon="save")
+            return
+        # 压缩在后台线程完成，写入线程只做一次改名
+        self._schedule_compress(archive)
+
+    # ==================== 后台压缩 ====================
+
+    def _uncompressed_archives(self) -> list[str]:
+        return [
+            self._archive_name(index)
+            for index, suffixes in sorted(self._archive_indexes().items())
+            if "" in suffixes
+        ]
+
+    def _schedule_compress(self, archive: str):
+        self._tasks.put(archive)
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run_compress, name="csv-compress", daemon=True
+                )
+                self._worker.start()
+
+    def _run_compress(self):
+        while True:
+            archive = self._tasks.get()
+            try:
+                self._compress(archive)
+            except Exception as e:
+                log.warning(f"CSV 轮转压缩失败 ({archive}): {e}")
+            finally:
+                self._tasks.task_done()
+
+    def _compress(self, archive: str):
+        if not os.path.exists(archive):
+            return
+        target = f"{archive}.gz"
+        tmp = f"{target}.tmp"
+        with open(archive, "rb") as src, gzip.open(tmp, "wb") as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(tmp, target)
+        os.remove(archive)
+        log.info(f"CSV 已轮转: {target}", icon="save")
+
+    def wait_compress(self, timeout: float | None = None) -> bool:
+        """等待后台压缩完成 (关闭时调用)，超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._tasks.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def flush(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def close(self):
+        with self._lock:
+            self._close_file()
+        self.wait_compress(10)
+
+
+_appender: CsvAppender | None = None
+_appender_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_csv_appender() -> CsvAppender:
+    """获取全局 CSV 写入器 (首次调用时创建，退出时自动关闭)"""
+    global _appender, _atexit_registered
+    if _appender is not None:
+        return _appender
+
+    with _appender_lock:
+        if _appender is None:
+            _appender = CsvAppender(
+                CSV_FILE,
+                rotate_bytes=CSV_ROTATE_BYTES,
+                compress=CSV_COMPRESS,
+            )
+            if not _atexit_registered:
+                atexit.register(close_csv)
+                _atexit_registered = True
+            log.info(f"账号记录保存到 {CSV_FILE}", icon="save")
+        return _appender
+
+
+def reset_csv_appender(appender: CsvAppender | None = None):
+    """关闭当前全局写入器并替换"""
+    global _appender
+    with _appender_lock:
+        if _appender is not None:
+            _appender.close()
+        _appender = appender
+
+
+def flush_csv():
+    """账号边界 / 退出时调用，将已追加的行写入磁盘"""
+    appender = _appender
+    if appender is None:
+        return
+    try:
+        appender.flush()
+    except Exception as e:
+        log.warning(f"写入 CSV 失败: {e}")
+
+
+def close_csv():
+    appender = _appender
+    if appender is None:
+        return
+    try:
+        appender.close()
+    except Exception as e:
+        log.warning(f"关闭 CSV 失败: {e}")
@@ -0,0 +1,147 @@
+# ==================== 结构化事件模块 ====================
+# 以 JSON Lines 格式记录运行事件 (logs/events.jsonl)，供吞吐量分析使用
+
+"""Events - 结构化事件流
+
+每行一个 JSON 对象:
+    {"ts": ..., "run_id": ..., "team": ..., "email_hash": ..., "stage": ..., "outcome": ..., "duration_ms": ...}
+
+事件先写入内存缓冲，缓冲满 EVENTS_BUFFER_SIZE 条、调用 flush_events() 或进程退出时才追加到文件，
+不会在流程循环中逐条写盘。email 只记录哈希，不写入明文。
+
+Classes:
+    EventLog: 带缓冲的 JSON Lines 追加写入器
+
+Functions:
+    hash_email: email 哈希 (小写后 sha256 前 16 位)
+    get_event_log: 获取全局事件写入器 (未启用时返回 None)
+    reset_event_log: 替换 / 清空全局事件写入器 (测试用)
+    emit_event: 记录一条事件 (未启用时为空操作，写入失败不抛异常)
+    flush_events: 将缓冲的事件写入文件
+"""
+
+from __future__ import annotations
+
+import atexit
+import hashlib
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+
+from src.core.config import EVENTS_BUFFER_SIZE, EVENTS_FILE
+
+
+def hash_email(email: str) -> str:
+    """email 哈希 (同一邮箱在不同运行中保持一致，便于关联)"""
+    if not email:
+        return ""
+    return hashlib.sha256(email.strip().lower().encode("utf-8")).hexdigest()[:16]
+
+
+class EventLog:
+    """带缓冲的 JSON Lines 追加写入器"""
+
+    def __init__(self, path: str, buffer_size: int = 50, run_id: str | None = None):
+        self.path = str(path)
+        self.buffer_size = max(1, int(buffer_size))
+        self.run_id = run_id or uuid.uuid4().hex[:12]
+        self._buffer: list[str] = []
+        self._lock = threading.Lock()
+
+    def emit(
+        self,
+        stage: str,
+        outcome: str,
+        team: str = "",
+        email: str = "",
+        duration_ms: float | None = None,
+        **fields,
+    ):
+        """记录一条事件 (额外字段原样写入)"""
+        event = {
+            "ts": datetime.now().isoformat(timespec="milliseconds"),
+            "run_id": self.run_id,
+            "team": team or "",
+            "email_hash": hash_email(email),
+            "stage": stage,
+            "outcome": outcome,
+            "duration_ms": round(duration_ms, 1) if duration_ms is not None else None,
+        }
+        event.update(fields)
+        line = json.dumps(event, ensure_ascii=False)
+        with self._lock:
+            self._buffer.append(line)
+            if len(self._buffer) >= self.buffer_size:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    @property
+    def pending(self) -> int:
+        """缓冲中尚未写入的事件数"""
+        return len(self._buffer)
+
+
+_event_log: EventLog | None = None
+_event_log_lock = threading.Lock()
+_atexit_registered = False
+
+
+def get_event_log() -> EventLog | None:
+    """获取全局事件写入器 (events_file 为空时不启用)"""
+    global _event_log, _atexit_registered
+    if _event_log is not None or not EVENTS_FILE:
+        return _event_log
+
+    with _event_log_lock:
+        if _event_log is None:
+            _event_log = EventLog(EVENTS_FILE, EVENTS_BUFFER_SIZE)
+            if not _atexit_registered:
+                atexit.register(flush_events)
+                _atexit_registered = True
+        return _event_log
+
+
+def reset_event_log(event_log: EventLog | None = None):
+    """替换全局事件写入器 (旧写入器的缓冲会先写出)"""
+    global _event_log
+    with _event_log_lock:
+        if _event_log is not None:
+            try:
+                _event_log.flush()
+            except Exception:
+                pass
+        _event_log = event_log
+
+
+def emit_event(stage: str, outcome: str, **kwargs):
+    """记录一条事件 (参数同 EventLog.emit)；事件记录失败不影响主流程"""
+    try:
+        event_log = get_event_log()
+        if event_log is not None:
+            event_log.emit(stage, outcome, **kwargs)
+    except Exception:
+        pass
+
+
+def flush_events():
+    try:
+        event_log = _event_log
+        if event_log is not None:
+            event_log.flush()
+    except Exception:
+        pass
@@ -0,0 +1,326 @@
+# ==================== 失败现场存储模块 ====================
+# 失败截图目录只保存清单与日志尾部，轮转日志按内容哈希只存一份，并按数量 / 大小自动清理
+
+"""Failure Artifacts - 失败现场存储
+
+目录结构 (默认 logs/falid):
+
+    index.json                      所有失败记录 {"failures": [...], "blobs": {sha256: 字节数}}
+    blobs/<sha[:2]>/<sha256>        轮转日志段 (app.log.1 ...)，同一内容只存一份
+    <时间戳>/manifest.json           原因、截图、日志尾部与引用的日志段
+    <时间戳>/app.log.tail           当前 app.log 末尾 failure_log_tail_bytes 字节
+    <时间戳>/screenshot_*.png       截图 (由调用方写入)
+
+轮转后的日志段内容不再变化，优先以硬链接存入 blobs (同一文件系统不额外占用空间)，
+不支持硬链接时复制一次；先链接到临时名再计算哈希，计算期间日志再次轮转也不会错配。
+失败记录超过 failure_max_count 条或总大小超过 failure_max_bytes 时删除最早的记录，
+不再被任何记录引用的日志段随之删除。
+
+Functions:
+    create_failure_dir: 创建本次失败的目录 (同一秒内多次失败自动加后缀)
+    record_failure: 写入日志尾部、日志段与清单，并执行保留策略
+    prune_failures: 按数量 / 大小删除最早的失败记录
+    list_failures: 读取失败记录索引
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from src.core.config import (
+    FAILURE_DIR,
+    FAILURE_LOG_TAIL_BYTES,
+    FAILURE_MAX_BYTES,
+    FAILURE_MAX_COUNT,
+)
+from src.core.fileio import atomic_write_json
+from src.core.logger import LOG_DIR, LOG_FILE, log
+
+INDEX_FILE = "index.json"
+MANIFEST_FILE = "manifest.json"
+BLOB_DIR = "blobs"
+
+_lock = threading.Lock()
+# (设备, inode, 大小, mtime) → sha256，日志段轮转改名后 inode 不变，无需重新计算哈希
+_hash_cache: dict[tuple, str] = {}
+
+
+def _root(root) -> Path:
+    return Path(root or FAILURE_DIR)
+
+
+def _dir_size(path: Path) -> int:
+    total = 0
+    for entry in path.rglob("*"):
+        try:
+            if entry.is_file():
+                total += entry.stat().st_size
+        except OSError:
+            continue
+    return total
+
+
+def _load_index(root: Path) -> dict:
+    path = root / INDEX_FILE
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            log.warning(f"失败记录索引读取失败，重新建立: {e}")
+
+    # 首次使用: 收录已有的失败目录 (旧版完整复制的日志也纳入保留策略)
+    failures = []
+    if root.is_dir():
+        for entry in sorted(root.iterdir()):
+            if entry.is_dir() and entry.name != BLOB_DIR:
+                failures.append(
+                    {
+                        "id": entry.name,
+                        "created_at": "",
+                        "reason": "",
+                        "bytes": _dir_size(entry),
+                        "segments": [],
+                    }
+                )
+    return {"failures": failures, "blobs": {}}
+
+
+def _save_index(root: Path, index: dict):
+    atomic_write_json(str(root / INDEX_FILE), index, indent=None, durable=False)
+
+
+def create_failure_dir(root=None) -> Path:
+    """创建本次失败的目录 (<root>/<YYYYmmdd_HHMMSS>[_N])"""
+    root = _root(root)
+    base = datetime.now().strftime("%Y%m%d_%H%M%S")
+    for attempt in range(1000):
+        name = base if attempt == 0 else f"{base}_{attempt}"
+        path = root / name
+        try:
+            path.mkdir(parents=True)
+            return path
+        except FileExistsError:
+            continue
+    raise FileExistsError(f"无法创建失败目录: {root / base}")
+
+
+def _write_log_tail(target: Path, tail_bytes: int) -> int:
+    """复制当前日志末尾 tail_bytes 字节 (从完整行开始)，返回写入字节数"""
+    if tail_bytes <= 0 or not LOG_FILE.exists():
+        return 0
+    with open(LOG_FILE, "rb") as src:
+        src.seek(0, os.SEEK_END)
+        size = src.tell()
+        start = max(0, size - tail_bytes)
+        src.seek(start)
+        data = src.read(size - start)
+    if start > 0:
+        newline = data.find(b"\n")
+        if newline != -1:
+            data = data[newline + 1 :]
+    with open(target, "wb") as dst:
+        dst.write(data)
+    return len(data)
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _blob_path(root: Path, sha: str) -> Path:
+    return root / BLOB_DIR / sha[:2] / sha
+
+
+def _store_segment(root: Path, source: Path) -> tuple[str, int] | None:
+    """将一个轮转日志段存入 blobs (已存在则复用)
+
+    Returns:
+        tuple | None: (sha256, 字节数)，日志段已不存在时返回 None
+    """
+    try:
+        st = source.stat()
+    except OSError:
+        return None
+    key = (st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns)
+    sha = _hash_cache.get(key)
+    if sha is not None and _blob_path(root, sha).exists():
+        return sha, st.st_size
+
+    blob_root = root / BLOB_DIR
+    blob_root.mkdir(parents=True, exist_ok=True)
+    temp = blob_root / f".incoming-{os.getpid()}-{threading.get_ident()}"
+    try:
+        try:
+            os.link(source, temp)
+        except OSError:
+            shutil.copyfile(source, temp)
+    except FileNotFoundError:
+        return None
+
+    try:
+        sha = _sha256(temp)
+        size = temp.stat().st_size
+        target = _blob_path(root, sha)
+        if target.exists():
+            temp.unlink()
+        else:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temp, target)
+    finally:
+        if temp.exists():
+            temp.unlink()
+
+    _hash_cache[key] = sha
+    return sha, size
+
+
+def record_failure(
+    failure_dir,
+    reason: str = "",
+    files: list | None = None,
+    root=None,
+    tail_bytes: int | None = None,
+) -> dict:
+    """记录一次失败: 写入日志尾部、存入轮转日志段、写清单并执行保留策略
+
+    Args:
+        failure_dir: create_failure_dir 创建的目录
+        reason: 失败原因
+        files: 已写入该目录的其他文件 (如截图)
+        root: 存储根目录 (默认 failure_dir 的上级目录)
+
+    Returns:
+        dict: 清单内容
+    """
+    failure_dir = Path(failure_dir)
+    root = Path(root) if root else failure_dir.parent
+    tail_bytes = FAILURE_LOG_TAIL_BYTES if tail_bytes is None else tail_bytes
+
+    try:
+        log.flush()
+    except Exception:
+        pass
+
+    with _lock:
+        index = _load_index(root)
+        tail_name = f"{LOG_FILE.name}.tail"
+        tail_size = _write_log_tail(failure_dir / tail_name, tail_bytes)
+
+        segments = []
+        for source in sorted(LOG_DIR.glob(f"{LOG_FILE.name}.*")):
+            # .tmp 为正在压缩中的轮转段
+            if not source.is_file() or source.name.endswith((".tail", ".tmp")):
+                continue
+            stored = _store_segment(root, source)
+            if stored is None:
+                continue
+            sha, size = stored
+            index["blobs"][sha] = size
+            segments.append(
+                {
+                    "name": source.name,
+                    "sha256": sha,
+                    "bytes": size,
+                    "blob": str(_blob_path(root, sha).relative_to(root)),
+                }
+            )
+
+        manifest = {
+            "id": failure_dir.name,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "reason": reason or "",
+            "files": [Path(path).name for path in files or [] if path],
+            "log_tail": {"file": tail_name, "bytes": tail_size} if tail_size else None,
+            "segments": segments,
+        }
+        with open(failure_dir / MANIFEST_FILE, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+
+        index["failures"] = [
+            entry for entry in index["failures"] if entry["id"] != failure_dir.name
+        ]
+        index["failures"].append(
+            {
+                "id": failure_dir.name,
+                "created_at": manifest["created_at"],
+                "reason": manifest["reason"],
+                "bytes": _dir_size(failure_dir),
+                "segments": [segment["sha256"] for segment in segments],
+            }
+        )
+        _prune(root, index, FAILURE_MAX_COUNT, FAILURE_MAX_BYTES, keep=failure_dir.name)
+        _save_index(root, index)
+    return manifest
+
+
+def _total_bytes(index: dict) -> int:
+    referenced = {sha for entry in index["failures"] for sha in entry["segments"]}
+    return sum(entry["bytes"] for entry in index["failures"]) + sum(
+        index["blobs"].get(sha, 0) for sha in referenced
+    )
+
+
+def _prune(root: Path, index: dict, max_count: int, max_bytes: int, keep: str | None = None) -> list[str]:
+    removed = []
+    failures = index["failures"]
+    while failures:
+        over_count = max_count > 0 and len(failures) > max_count
+        over_bytes = max_bytes > 0 and _total_bytes(index) > max_bytes
+        if not (over_count or over_bytes):
+            break
+        if failures[0]["id"] == keep:
+            break
+        entry = failures.pop(0)
+        shutil.rmtree(root / entry["id"], ignore_errors=True)
+        removed.append(entry["id"])
+
+    referenced = {sha for entry in failures for sha in entry["segments"]}
+    for sha in list(index["blobs"]):
+        if sha not in referenced:
+            index["blobs"].pop(sha)
+            try:
+                _blob_path(root, sha).unlink()
+            except FileNotFoundError:
+                pass
+
+    if removed:
+        log.info(f"已清理 {len(removed)} 条失败记录")
+    return removed
+
+
+def prune_failures(
+    max_count: int | None = None, max_bytes: int | None = None, root=None
+) -> list[str]:
+    """删除最早的失败记录直到满足数量 / 大小限制 (0 表示不限)
+
+    Returns:
+        list[str]: 被删除的失败记录 ID
+    """
+    root = _root(root)
+    with _lock:
+        index = _load_index(root)
+        removed = _prune(
+            root,
+            index,
+            FAILURE_MAX_COUNT if max_count is None else max_count,
+            FAILURE_MAX_BYTES if max_bytes is None else max_bytes,
+        )
+        if root.is_dir():
+            _save_index(root, index)
+    return removed
+
+
+def list_failures(root=None) -> list[dict]:
+    """读取失败记录索引 (按时间顺序)"""
+    return list(_load_index(_root(root))["failures"])
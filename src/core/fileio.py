@@ -0,0 +1,108 @@
+# ==================== 文件写入模块 ====================
+# 原子写入与跨进程文件锁，供追踪记录、Team 配置、迁移记录、归档等模块共用
+
+"""File IO - 原子写入与文件锁
+
+Functions:
+    import_filelock: 延迟导入 filelock，返回 (FileLock, Timeout)
+    atomic_write_text: 原子写入文本 (临时文件 + fsync + os.replace)
+    atomic_write_json: 原子写入 JSON
+    file_lock: 跨进程文件锁 (<file>.lock)
+    locked_atomic_write_json: 在文件锁保护下原子写入 JSON
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+
+from src.core.logger import log
+
+
+def import_filelock():
+    """延迟导入 filelock (导入开销较大，只在首次写入时加载)
+
+    Returns:
+        tuple: (FileLock, Timeout)，未安装 filelock 时为 (None, None)
+    """
+    try:
+        from filelock import FileLock, Timeout
+    except Exception:  # pragma: no cover - 兼容无 filelock 环境
+        return None, None
+    return FileLock, Timeout
+
+
+def _atomic_write(file_path: str, write, durable: bool):
+    target_dir = os.path.dirname(file_path) or "."
+    base_name = os.path.basename(file_path)
+    fd, temp_path = tempfile.mkstemp(prefix=f".{base_name}.", dir=target_dir)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
+            write(temp_file)
+            if durable:
+                temp_file.flush()
+                os.fsync(temp_file.fileno())
+        os.replace(temp_path, file_path)
+    except Exception:
+        try:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        except Exception as cleanup_error:
+            log.warning(f"清理临时文件失败: {cleanup_error}")
+        raise
+
+
+def atomic_write_text(file_path: str, text: str, durable: bool = True):
+    """原子写入文本 (临时文件 + fsync + os.replace)
+
+    durable=False 时跳过 fsync，用于可随时重建的文件。
+    """
+    _atomic_write(str(file_path), lambda f: f.write(text), durable)
+
+
+def atomic_write_json(file_path: str, data, indent: int | None = 2, durable: bool = True):
+    """原子写入 JSON 数据 (临时文件 + fsync + os.replace)
+
+    durable=False 时跳过 fsync，用于可随时重建的缓存文件。
+    """
+    _atomic_write(
+        str(file_path),
+        lambda f: json.dump(data, f, ensure_ascii=False, indent=indent),
+        durable,
+    )
+
+
+@contextmanager
+def file_lock(file_path: str):
+    """独占 <file_path>.lock (FileLock 优先，缺失时回退 fcntl)，用于跨进程的读-改-写
+
+    Raises:
+        Timeout: 获取 FileLock 超时
+    """
+    lock_path = f"{file_path}.lock"
+    FileLock, _ = import_filelock()
+    if FileLock:
+        with FileLock(lock_path, timeout=10):
+            yield
+        return
+
+    import fcntl
+
+    with open(lock_path, "w", encoding="utf-8") as lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def locked_atomic_write_json(file_path: str, data):
+    """在文件锁保护下原子写入 JSON (FileLock 优先，缺失时回退 fcntl)
+
+    Raises:
+        Timeout: 获取 FileLock 超时
+    """
+    with file_lock(file_path):
+        atomic_write_json(file_path, data)
@@ -0,0 +1,253 @@
+# ==================== HTTP 会话模块 ====================
+# 按 origin 共享的 requests Session 注册表、统一重试策略与请求统计
+
+"""HTTP - 共享 HTTP 会话
+
+每个 origin (scheme://host:port) 对应一个带连接池的 requests.Session，
+所有服务模块 (邮箱 / Team / CRS / CPA / S2A) 共用同一套重试策略与连接池参数。
+Session 在首次请求该 origin 时才创建，代理也在此时选择，导入模块不再产生副作用。
+
+Classes:
+    HttpClient: 按请求 URL 路由到共享 Session 的轻量句柄 (各模块的 http_session)
+
+Functions:
+    get_session: 获取 (或创建) URL 所属 origin 的 Session
+    set_retry_methods: 设置指定服务地址允许自动重试的请求方法
+    request: 发送请求并记录耗时/错误统计
+    get_http_stats: 获取按 origin 统计的请求数、重试数、错误数与耗时
+    reset_http_stats: 清空统计
+    close_sessions: 关闭并清空所有 Session
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from src.core.config import (
+    HTTP_BACKOFF_FACTOR,
+    HTTP_MAX_RETRIES,
+    HTTP_POOL_BLOCK,
+    HTTP_POOL_CONNECTIONS,
+    HTTP_POOL_MAXSIZE,
+    HTTP_RETRY_METHODS,
+    HTTP_RETRY_METHODS_BY_HOST,
+    PROXY_ENABLED,
+    get_proxy_dict,
+)
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# 统一重试策略: 限流/网关错误自动重试 (默认不重试 PUT / DELETE / PATCH)
+RETRY_STATUS_FORCELIST = [429, 500, 502, 503, 504]
+RETRY_ALLOWED_METHODS = [method.upper() for method in HTTP_RETRY_METHODS]
+
+# origin → 允许重试的方法 (服务模块注册的默认值，配置 retry_methods_by_host 优先)
+_retry_methods: dict[str, list[str]] = {}
+
+_sessions: dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+_stats: dict[str, dict] = {}
+_stats_lock = threading.Lock()
+
+
+def _origin(scheme: str | None, host: str | None, port: int | None) -> str:
+    scheme = (scheme or "http").lower()
+    if not host:
+        return ""
+    return f"{scheme}://{host.lower()}:{port or _DEFAULT_PORTS.get(scheme, 80)}"
+
+
+def origin_of(url: str) -> str:
+    """URL 所属 origin (scheme://host:port)，无法解析时返回空字符串"""
+    try:
+        parts = urlsplit(url or "")
+        return _origin(parts.scheme, parts.hostname, parts.port)
+    except ValueError:
+        return ""
+
+
+def _stat_entry(origin: str) -> dict:
+    entry = _stats.get(origin)
+    if entry is None:
+        entry = {
+            "requests": 0,
+            "errors": 0,
+            "retries": 0,
+            "total_time": 0.0,
+            "max_time": 0.0,
+        }
+        _stats[origin] = entry
+    return entry
+
+
+class _CountingRetry(Retry):
+    """每次触发重试时按 origin 计数"""
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        if _pool is not None:
+            origin = _origin(
+                getattr(_pool, "scheme", None),
+                getattr(_pool, "host", None),
+                getattr(_pool, "port", None),
+            )
+            with _stats_lock:
+                _stat_entry(origin)["retries"] += 1
+        return super().increment(
+            method=method,
+            url=url,
+            response=response,
+            error=error,
+            _pool=_pool,
+            _stacktrace=_stacktrace,
+        )
+
+
+def set_retry_methods(base_url: str, methods: list[str]):
+    """设置服务地址允许自动重试的请求方法 (需在该 origin 首次请求前调用)"""
+    origin = origin_of(base_url)
+    if origin:
+        _retry_methods[origin] = [method.upper() for method in methods]
+
+
+def _allowed_methods(origin: str) -> list[str]:
+    for base_url, methods in HTTP_RETRY_METHODS_BY_HOST.items():
+        if origin_of(base_url) == origin:
+            return [method.upper() for method in methods]
+    return _retry_methods.get(origin, RETRY_ALLOWED_METHODS)
+
+
+def _create_session(origin: str) -> requests.Session:
+    session = requests.Session()
+    retry_strategy = _CountingRetry(
+        total=HTTP_MAX_RETRIES,
+        backoff_factor=HTTP_BACKOFF_FACTOR,
+        status_forcelist=RETRY_STATUS_FORCELIST,
+        allowed_methods=_allowed_methods(origin),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=HTTP_POOL_CONNECTIONS,
+        pool_maxsize=HTTP_POOL_MAXSIZE,
+        pool_block=HTTP_POOL_BLOCK,
+        max_retries=retry_strategy,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+    # 代理设置 (首次访问该 origin 时才轮换选择)
+    if PROXY_ENABLED:
+        proxy_dict = get_proxy_dict()
+        if proxy_dict:
+            session.proxies = proxy_dict
+
+    return session
+
+
+def get_session(url: str) -> requests.Session:
+    """获取 URL 所属 origin 的共享 Session (不存在则创建)"""
+    origin = origin_of(url)
+    session = _sessions.get(origin)
+    if session is not None:
+        return session
+
+    with _sessions_lock:
+        session = _sessions.get(origin)
+        if session is None:
+            session = _create_session(origin)
+            _sessions[origin] = session
+        return session
+
+
+def request(method: str, url: str, **kwargs) -> requests.Response:
+    """通过共享 Session 发送请求，并记录该 origin 的耗时与错误数"""
+    origin = origin_of(url)
+    start = time.perf_counter()
+    failed = False
+    try:
+        response = get_session(url).request(method, url, **kwargs)
+        failed = response.status_code >= 400
+        return response
+    except Exception:
+        failed = True
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        with _stats_lock:
+            entry = _stat_entry(origin)
+            entry["requests"] += 1
+            entry["total_time"] += elapsed
+            entry["max_time"] = max(entry["max_time"], elapsed)
+            if failed:
+                entry["errors"] += 1
+
+
+def get_http_stats() -> dict[str, dict]:
+    """按 origin 返回统计快照
+
+    Returns:
+        dict: {origin: {"requests", "errors", "retries", "total_time", "max_time", "avg_time"}}
+    """
+    with _stats_lock:
+        snapshot = {}
+        for origin, entry in _stats.items():
+            item = dict(entry)
+            item["avg_time"] = (
+                entry["total_time"] / entry["requests"] if entry["requests"] else 0.0
+            )
+            snapshot[origin] = item
+        return snapshot
+
+
+def reset_http_stats():
+    with _stats_lock:
+        _stats.clear()
+
+
+def close_sessions():
+    """关闭所有 Session (释放连接池)"""
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+class HttpClient:
+    """按请求 URL 路由到共享 Session 的轻量句柄
+
+    各服务模块以 http_session = HttpClient() 持有，接口与 requests.Session 的常用方法一致。
+    """
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return request(method, url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self.request("PATCH", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self.request("DELETE", url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.request("HEAD", url, **kwargs)
@@ -1,12 +1,27 @@
 # ==================== 日志模块 ====================
 # 统一的日志输出，支持控制台和文件日志，带日志轮转
+# 可选异步模式 (LOG_ASYNC=1): 格式化与文件写入在后台线程完成
+# 可选分段模式: 轮转段后台 gzip 压缩、按时间轮转、logs/ 总大小预算
 
 import os
+import re
 import sys
+import copy
+import gzip
+import time
+import queue
+import shutil
+import atexit
 import logging
-from datetime import datetime
+import threading
+from datetime import datetime, timedelta
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import (
+    BaseRotatingHandler,
+    QueueHandler,
+    QueueListener,
+    RotatingFileHandler,
+)
 
 
 # ==================== 日志配置 ====================
@@ -15,12 +30,32 @@ LOG_FILE = LOG_DIR / "app.log"
 LOG_MAX_BYTES = 10 * 1024 * 1024  # 10MB
 LOG_BACKUP_COUNT = 5  # 保留 5 个备份
 
+# 分段轮转 (环境变量，任意一项启用时替代默认的 app.log.1 ~ app.log.5 轮转):
+#   LOG_COMPRESS=1           轮转段在后台线程压缩为 app.log.<时间>.gz
+#   LOG_ROTATE_WHEN=midnight 按时间轮转: midnight 或 <N>s/m/h/d (如 6h)，与大小轮转同时生效
+#   LOG_BUDGET_BYTES=0       logs/ 目录 (含失败现场) 总大小上限，超出时先删最早的轮转段，再清理失败现场
+#   LOG_MAX_BYTES / LOG_BACKUP_COUNT 覆盖上面的默认值
+
+# 异步日志 (环境变量):
+#   LOG_ASYNC=1              启用 QueueHandler/QueueListener，日志调用只负责入队
+#   LOG_QUEUE_SIZE=10000     队列容量
+#   LOG_QUEUE_POLICY=block   队列满时的策略: block (等待) / drop (丢弃并计数)
+LOG_QUEUE_SIZE = 10000
+LOG_QUEUE_POLICIES = ("block", "drop")
+
 
 def _parse_bool_env(name: str) -> bool:
     value = os.environ.get(name, "").strip().lower()
     return value in {"1", "true", "yes", "on"}
 
 
+def _parse_int_env(name: str, default: int) -> int:
+    try:
+        return int(os.environ.get(name, "").strip())
+    except ValueError:
+        return default
+
+
 def _parse_step_targets(value: str) -> set[int]:
     targets: set[int] = set()
     for chunk in value.split(","):
@@ -55,6 +90,18 @@ def _ensure_log_dir():
     LOG_DIR.mkdir(exist_ok=True)
 
 
+def _format_traceback(formatter: logging.Formatter, record) -> str:
+    """异常堆栈 / stack_info 文本 (追加在消息之后，无则为空字符串)"""
+    if record.exc_info and not record.exc_text:
+        record.exc_text = formatter.formatException(record.exc_info)
+    text = ""
+    if record.exc_text:
+        text += f"\n{record.exc_text}"
+    if record.stack_info:
+        text += f"\n{formatter.formatStack(record.stack_info)}"
+    return text
+
+
 class ColoredFormatter(logging.Formatter):
     """带颜色的控制台日志格式化器"""
 
@@ -91,7 +138,7 @@ class ColoredFormatter(logging.Formatter):
 
         # 构建消息
         message = f"[{timestamp}] {color}{icon}{record.getMessage()}{self.RESET}"
-        return message
+        return message + _format_traceback(self, record)
 
 
 class FileFormatter(logging.Formatter):
@@ -103,7 +150,270 @@ class FileFormatter(logging.Formatter):
         icon = getattr(record, "icon", "")
         if icon:
             icon = f"{icon} "
-        return f"[{timestamp}] [{level}] {icon}{record.getMessage()}"
+        return f"[{timestamp}] [{level}] {icon}{record.getMessage()}" + _format_traceback(
+            self, record
+        )
+
+
+_traceback_formatter = logging.Formatter()
+
+
+class _BoundedQueueHandler(QueueHandler):
+    """入队处理器: 只复制记录，格式化留给后台线程
+
+    队列满时按 policy 处理: block 等待空位，drop 丢弃并计数。
+    """
+
+    def __init__(self, log_queue: queue.Queue, policy: str = "block"):
+        super().__init__(log_queue)
+        self.policy = policy
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 默认实现会在调用线程格式化消息；这里只固定消息文本，
+        # 控制台/文件格式化器在 QueueListener 线程中执行
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        # 异常对象不跨线程传递，先在调用线程格式化为 exc_text
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _traceback_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        if self.policy == "drop":
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                self.dropped += 1
+        else:
+            self.queue.put(record)
+
+
+class _BlockingQueueListener(QueueListener):
+    """队列有界时 stop() 的结束标记也需要等待空位"""
+
+    def enqueue_sentinel(self):
+        self.queue.put(self._sentinel)
+
+
+def _parse_rotate_interval(value: str) -> int | str | None:
+    """解析 LOG_ROTATE_WHEN: "midnight" 或 <N>s/m/h/d，返回秒数 / "midnight" / None"""
+    value = (value or "").strip().lower()
+    if not value:
+        return None
+    if value == "midnight":
+        return value
+    match = re.fullmatch(r"(\d+)\s*([smhd]?)", value)
+    if not match:
+        return None
+    seconds = int(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}[match.group(2)]
+    return seconds or None
+
+
+class _SegmentedFileHandler(BaseRotatingHandler):
+    """分段轮转文件处理器
+
+    超过 max_bytes 或到达时间点时把当前文件改名为 <file>.<YYYYmmdd-HHMMSS>，
+    改名在写入线程中完成 (不阻塞)，压缩与清理交给后台线程:
+        compress: 压缩为 .gz (先写临时文件再改名，保留原修改时间)
+        保留最新的 backup_count 段 (0 表示不限)
+        budget_bytes > 0 时统计 budget_dir 下所有文件 (硬链接只计一次)，
+        超出时依次删除最早的轮转段、清理失败现场 (failure_artifacts)。
+    启动时遗留的未压缩轮转段 (上次退出时未处理完) 会重新加入队列。
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes: int = 0,
+        backup_count: int = 0,
+        when: int | str | None = None,
+        compress: bool = False,
+        budget_bytes: int = 0,
+        budget_dir=None,
+    ):
+        super().__init__(filename, "a", encoding="utf-8")
+        self.max_bytes = max(0, int(max_bytes or 0))
+        self.backup_count = max(0, int(backup_count or 0))
+        self.when = when
+        self.compress = compress
+        self.budget_bytes = max(0, int(budget_bytes or 0))
+        self.budget_dir = Path(budget_dir or Path(self.baseFilename).parent).resolve()
+        self.next_rollover = self._compute_next_rollover(time.time())
+        self._last_stamp = ""
+        self._suffix = 0
+        self._tasks: queue.Queue = queue.Queue()
+        self._worker: threading.Thread | None = None
+        self._worker_lock = threading.Lock()
+        self._schedule_maintenance()
+
+    # ==================== 轮转 ====================
+
+    def _compute_next_rollover(self, now: float) -> float | None:
+        if self.when is None:
+            return None
+        if self.when == "midnight":
+            tomorrow = datetime.fromtimestamp(now).date() + timedelta(days=1)
+            return datetime.combine(tomorrow, datetime.min.time()).timestamp()
+        return now + self.when
+
+    def shouldRollover(self, record) -> bool:
+        if self.next_rollover is not None and time.time() >= self.next_rollover:
+            return True
+        if self.max_bytes:
+            if self.stream is None:
+                self.stream = self._open()
+            size = self.stream.tell()
+            if size and size + len(self.format(record)) + 1 >= self.max_bytes:
+                return True
+        return False
+
+    def _segment_pattern(self):
+        base = os.path.basename(self.baseFilename)
+        return re.compile(re.escape(base) + r"\.(\d{8}-\d{6}(?:-\d+)?)(\.gz)?$")
+
+    def _segment_name(self, stamp: str, suffix: int) -> str:
+        if suffix:
+            return f"{self.baseFilename}.{stamp}-{suffix}"
+        return f"{self.baseFilename}.{stamp}"
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+            # 同一秒内多次轮转递增后缀 (已被清理的名称也不复用，保持名称有序)
+            self._suffix = self._suffix + 1 if stamp == self._last_stamp else 0
+            self._last_stamp = stamp
+            target = self._segment_name(stamp, self._suffix)
+            while os.path.exists(target) or os.path.exists(f"{target}.gz"):
+                self._suffix += 1
+                target = self._segment_name(stamp, self._suffix)
+            os.rename(self.baseFilename, target)
+            self._schedule_maintenance(target)
+
+        self.stream = self._open()
+        self.next_rollover = self._compute_next_rollover(time.time())
+
+    # ==================== 后台压缩与清理 ====================
+
+    def _schedule_maintenance(self, segment: str | None = None):
+        if not (self.compress or self.backup_count or self.budget_bytes):
+            return
+        self._tasks.put(segment)
+        with self._worker_lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(
+                    target=self._run_maintenance, name="log-maintenance", daemon=True
+                )
+                self._worker.start()
+
+    def _run_maintenance(self):
+        while True:
+            self._tasks.get()
+            try:
+                self._maintain()
+            except Exception as e:
+                print(f"[WARNING] 日志轮转维护失败: {e}", file=sys.stderr)
+            finally:
+                self._tasks.task_done()
+
+    def wait_maintenance(self, timeout: float | None = None) -> bool:
+        """等待后台压缩 / 清理完成 (退出时调用)，超时返回 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._tasks.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def segments(self) -> list[Path]:
+        """所有轮转段，按时间从早到晚"""
+        directory = Path(self.baseFilename).parent
+        pattern = self._segment_pattern()
+        found = []
+        for path in directory.iterdir():
+            match = pattern.match(path.name)
+            if match and path.is_file():
+                found.append((path.stat().st_mtime_ns, path.name, path))
+        return [path for _, _, path in sorted(found)]
+
+    def _compress_segment(self, path: Path):
+        target = path.with_name(path.name + ".gz")
+        temp = path.with_name(path.name + ".gz.tmp")
+        with open(path, "rb") as src, gzip.open(temp, "wb") as dst:
+            shutil.copyfileobj(src, dst, 1024 * 1024)
+        shutil.copystat(path, temp)
+        os.replace(temp, target)
+        path.unlink()
+
+    def _maintain(self):
+        if self.compress:
+            for path in self.segments():
+                if not path.name.endswith(".gz"):
+                    self._compress_segment(path)
+
+        segments = self.segments()
+        if self.backup_count and len(segments) > self.backup_count:
+            for path in segments[: len(segments) - self.backup_count]:
+                path.unlink(missing_ok=True)
+            segments = segments[len(segments) - self.backup_count :]
+
+        if self.budget_bytes:
+            self._enforce_budget(segments)
+
+    def _usage(self) -> tuple[int, int]:
+        """(budget_dir 总字节数, 其中失败现场字节数)，硬链接只计一次"""
+        failure_dir = self._failure_dir()
+        seen = set()
+        total = failures = 0
+        for root, _, files in os.walk(self.budget_dir):
+            in_failures = failure_dir is not None and Path(root).is_relative_to(failure_dir)
+            for name in files:
+                try:
+                    st = os.stat(os.path.join(root, name))
+                except OSError:
+                    continue
+                key = (st.st_dev, st.st_ino)
+                if key in seen:
+                    continue
+                seen.add(key)
+                total += st.st_size
+                if in_failures:
+                    failures += st.st_size
+        return total, failures
+
+    def _failure_dir(self) -> Path | None:
+        try:
+            from src.core.config import FAILURE_DIR
+        except Exception:
+            return None
+        return Path(FAILURE_DIR).resolve()
+
+    def _enforce_budget(self, segments: list[Path]):
+        total, failures = self._usage()
+        for path in segments:
+            if total <= self.budget_bytes:
+                return
+            try:
+                size = path.stat().st_size
+                links = path.stat().st_nlink
+                path.unlink()
+            except OSError:
+                continue
+            # 被失败现场硬链接引用的段删除后不释放空间
+            if links <= 1:
+                total -= size
+
+        if total > self.budget_bytes and failures:
+            from src.core.failure_artifacts import prune_failures
+
+            prune_failures(max_bytes=max(1, failures - (total - self.budget_bytes)))
 
 
 class Logger:
@@ -140,6 +450,9 @@ class Logger:
         use_color: bool = True,
         level: int | None = None,
         enable_file_log: bool = True,
+        async_mode: bool | None = None,
+        queue_size: int | None = None,
+        queue_policy: str | None = None,
     ):
         """初始化日志器
 
@@ -148,10 +461,22 @@ class Logger:
             use_color: 是否使用颜色 (仅控制台)
             level: 日志级别
             enable_file_log: 是否启用文件日志
+            async_mode: 是否异步写日志 (默认读取 LOG_ASYNC)
+            queue_size: 异步队列容量 (默认读取 LOG_QUEUE_SIZE)
+            queue_policy: 队列满时的策略 block / drop (默认读取 LOG_QUEUE_POLICY)
         """
         self.name = name
         self.use_color = use_color
         self.enable_file_log = enable_file_log
+        self.async_mode = _parse_bool_env("LOG_ASYNC") if async_mode is None else async_mode
+        self.queue_size = queue_size or _parse_int_env("LOG_QUEUE_SIZE", LOG_QUEUE_SIZE)
+        policy = (queue_policy or os.environ.get("LOG_QUEUE_POLICY", "block")).strip().lower()
+        self.queue_policy = policy if policy in LOG_QUEUE_POLICIES else "block"
+        self._handlers: list[logging.Handler] = []
+        self._queue_handler: _BoundedQueueHandler | None = None
+        self._listener: QueueListener | None = None
+        self._flush_lock = threading.Lock()
+        self._atexit_registered = False
         self._step_counter = 0
         self._step_pause_each = _parse_bool_env("STEP_PAUSE_EACH")
         self._step_stop_at = _parse_step_targets(os.environ.get("STEP_STOP_AT", ""))
@@ -172,9 +497,14 @@ class Logger:
 
     def _setup_logger(self):
         """设置日志器"""
+        self._stop_listener()
         self._logger = logging.getLogger(self.name)
         self._logger.setLevel(self.level)
         self._logger.handlers.clear()  # 清除已有的处理器
+        self._handlers = []
+        if not self._atexit_registered:
+            atexit.register(self._at_exit)
+            self._atexit_registered = True
 
         # 控制台处理器
         console_handler = logging.StreamHandler(sys.stdout)
@@ -183,25 +513,94 @@ class Logger:
             console_handler.setFormatter(ColoredFormatter())
         else:
             console_handler.setFormatter(FileFormatter())
-        self._logger.addHandler(console_handler)
+        self._handlers.append(console_handler)
 
         # 文件处理器 (带轮转)
         if self.enable_file_log:
             try:
                 _ensure_log_dir()
-                file_handler = RotatingFileHandler(
-                    LOG_FILE,
-                    maxBytes=LOG_MAX_BYTES,
-                    backupCount=LOG_BACKUP_COUNT,
-                    encoding="utf-8",
-                )
+                file_handler = self._create_file_handler()
                 file_handler.setLevel(self.level)
                 file_handler.setFormatter(FileFormatter())
-                self._logger.addHandler(file_handler)
+                self._handlers.append(file_handler)
             except Exception as e:
                 # 文件日志初始化失败时继续使用控制台日志
                 print(f"[WARNING] 文件日志初始化失败: {e}")
 
+        if not self.async_mode:
+            for handler in self._handlers:
+                self._logger.addHandler(handler)
+            return
+
+        # 异步模式: 调用线程只入队，后台线程格式化并写控制台/文件
+        log_queue: queue.Queue = queue.Queue(maxsize=self.queue_size)
+        self._queue_handler = _BoundedQueueHandler(log_queue, self.queue_policy)
+        self._queue_handler.setLevel(self.level)
+        self._listener = _BlockingQueueListener(
+            log_queue, *self._handlers, respect_handler_level=True
+        )
+        self._listener.start()
+        self._logger.addHandler(self._queue_handler)
+
+    def _at_exit(self):
+        """退出时写完异步队列并等待轮转段压缩 / 清理 (每个 Logger 只注册一次)"""
+        self.flush()
+        for handler in self._handlers:
+            wait_maintenance = getattr(handler, "wait_maintenance", None)
+            if wait_maintenance is not None:
+                wait_maintenance(10)
+
+    def _create_file_handler(self) -> logging.Handler:
+        max_bytes = _parse_int_env("LOG_MAX_BYTES", LOG_MAX_BYTES)
+        backup_count = _parse_int_env("LOG_BACKUP_COUNT", LOG_BACKUP_COUNT)
+        compress = _parse_bool_env("LOG_COMPRESS")
+        when = _parse_rotate_interval(os.environ.get("LOG_ROTATE_WHEN", ""))
+        budget = _parse_int_env("LOG_BUDGET_BYTES", 0)
+        if not (compress or when or budget > 0):
+            return RotatingFileHandler(
+                LOG_FILE,
+                maxBytes=max_bytes,
+                backupCount=backup_count,
+                encoding="utf-8",
+            )
+
+        handler = _SegmentedFileHandler(
+            LOG_FILE,
+            max_bytes=max_bytes,
+            backup_count=backup_count,
+            when=when,
+            compress=compress,
+            budget_bytes=budget,
+            budget_dir=LOG_DIR,
+        )
+        return handler
+
+    def _stop_listener(self):
+        listener = getattr(self, "_listener", None)
+        if listener is not None:
+            listener.stop()
+            self._listener = None
+
+    @property
+    def dropped(self) -> int:
+        """异步模式下因队列已满被丢弃的日志条数"""
+        return self._queue_handler.dropped if self._queue_handler else 0
+
+    def flush(self):
+        """确保已记录的日志全部写出
+
+        异步模式下等待后台线程处理完队列 (atexit / 信号处理时调用)，之后继续异步写入。
+        """
+        with self._flush_lock:
+            if self._listener is not None:
+                self._listener.stop()
+                self._listener.start()
+            for handler in self._handlers:
+                try:
+                    handler.flush()
+                except Exception:
+                    pass
+
     def _get_icon(self, icon: str | None = None) -> str:
         """获取图标"""
         if icon:
@@ -238,6 +637,12 @@ class Logger:
         extra = {"icon": self._get_icon("error")}
         self._logger.error(f"{prefix}{msg}", extra=extra)
 
+    def exception(self, msg: str, indent: int = 0):
+        """错误日志 (附带当前异常的堆栈，需在 except 块中调用)"""
+        prefix = "  " * indent
+        extra = {"icon": self._get_icon("error")}
+        self._logger.error(f"{prefix}{msg}", exc_info=True, extra=extra)
+
     def debug(self, msg: str, indent: int = 0):
         """调试日志"""
         prefix = "  " * indent
@@ -252,6 +657,7 @@ class Logger:
         extra = {"icon": ""}
         self._logger.info(f"{prefix}[step {step_number}] -> {msg}", extra=extra)
         if self._step_pause_each or step_number in self._step_stop_at:
+            self.flush()
             try:
                 input("Press Enter to continue...")
             except EOFError:
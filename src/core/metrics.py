@@ -0,0 +1,364 @@
+# ==================== 运行指标模块 ====================
+# 以 Prometheus 文本格式导出账号状态、阶段耗时与 HTTP 统计 (textfile / 本地端口)
+
+"""Metrics - Prometheus 指标导出
+
+指标 (Prometheus 文本格式 0.0.4):
+
+    oai_accounts{team,status}                       gauge      各 Team 按邀请状态的账号数
+    oai_storage_accounts{team,provider,status}      gauge      各 Team 各服务商入库状态的账号数
+    oai_tracker_last_updated_timestamp_seconds      gauge      追踪记录最后保存时间
+    oai_stage_duration_seconds{stage}               histogram  Timer 阶段耗时 (tracker_save / storage_check / account ...)
+    oai_provider_query_duration_seconds{provider}   histogram  入库状态查询耗时
+    oai_http_requests_total{origin}                 counter    HTTP 请求数
+    oai_http_errors_total{origin}                   counter    HTTP 失败数
+    oai_http_retries_total{origin}                  counter    会话层自动重试次数
+    oai_http_request_seconds_total{origin}          counter    HTTP 请求累计耗时
+
+账号统计不读取追踪记录: 进程内由 save_tracker_stats 在每次保存时推送 (与状态统计缓存同一份数据)，
+独立的 metrics 命令读取状态统计缓存 (缓存失效时才与 status 一样重新统计)。
+
+阶段耗时、入库查询耗时与 HTTP 统计是进程内计数，不落盘: 只有运行流程的进程 (start 按 [metrics]
+配置调用 start_metrics) 导出这些指标。独立的 metrics 命令 (--textfile / --serve) 是另一个进程，
+只导出账号状态指标；需要完整指标时应配置 [metrics].textfile / port，由 start 进程自己导出。
+
+[metrics] 配置 textfile 时由后台线程每 interval 秒原子替换写入 (供 node_exporter textfile collector 采集)，
+配置 port 时在本地端口提供 GET /metrics。
+
+Functions:
+    observe_stage: 记录一次阶段耗时 (由 profiler.end_span 调用)
+    observe_provider_query: 记录一次入库状态查询耗时
+    update_tracker_metrics: 更新账号状态统计 (由 save_tracker_stats 调用)
+    render_metrics: 生成 Prometheus 文本
+    write_textfile: 原子写入 textfile
+    serve_metrics: 在本地端口提供 GET /metrics
+    start_metrics: 按配置启动 textfile 写入线程 / HTTP 端口
+    stop_metrics: 停止并写出最后一次 textfile
+"""
+
+from __future__ import annotations
+
+import atexit
+import bisect
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+from src.core.config import METRICS_HOST, METRICS_INTERVAL, METRICS_PORT, METRICS_TEXTFILE
+from src.core.fileio import atomic_write_text
+from src.core.logger import log
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 阶段耗时跨度大 (tracker_save 毫秒级，account 分钟级)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+QUERY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_lock = threading.Lock()
+# (指标名, 标签值) → [各桶计数..., 总数, 总和]
+_histograms: dict[tuple[str, str], list] = {}
+_tracker_stats: dict | None = None
+
+_server = None
+_writer: threading.Thread | None = None
+_textfile = ""
+_stop = threading.Event()
+_atexit_registered = False
+
+
+# ==================== 采集 ====================
+
+
+def _observe(name: str, label: str, buckets: tuple, value: float):
+    with _lock:
+        entry = _histograms.get((name, label))
+        if entry is None:
+            entry = _histograms[(name, label)] = [0] * (len(buckets) + 2)
+        index = bisect.bisect_left(buckets, value)
+        if index < len(buckets):
+            entry[index] += 1
+        entry[-2] += 1
+        entry[-1] += value
+
+
+def observe_stage(stage: str, duration: float):
+    """记录一次阶段耗时 (秒)"""
+    _observe("stage", stage, STAGE_BUCKETS, duration)
+
+
+def observe_provider_query(provider: str, duration: float):
+    """记录一次入库状态查询耗时 (秒)"""
+    _observe("provider_query", provider, QUERY_BUCKETS, duration)
+
+
+def update_tracker_metrics(stats: dict):
+    """更新账号状态统计
+
+    Args:
+        stats: {"last_updated": str | None, "teams": compute_aggregates(...)}
+    """
+    global _tracker_stats
+    with _lock:
+        _tracker_stats = stats
+
+
+def reset_metrics():
+    global _tracker_stats
+    with _lock:
+        _histograms.clear()
+        _tracker_stats = None
+
+
+# ==================== 输出 ====================
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(**labels) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _number(value) -> str:
+    if isinstance(value, float):
+        return repr(round(value, 6))
+    return str(value)
+
+
+def _header(lines: list, name: str, kind: str, help_text: str):
+    lines.append(f"# HELP {name} {help_text}")
+    lines.append(f"# TYPE {name} {kind}")
+
+
+def _timestamp(text) -> float | None:
+    try:
+        return datetime.strptime(text, "%Y-%m-%d %H:%M:%S").timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def _load_tracker_stats() -> dict | None:
+    """进程内推送的统计优先；否则读取状态统计缓存 (与 status 命令相同)"""
+    with _lock:
+        stats = _tracker_stats
+    if stats is not None:
+        return stats
+    try:
+        from src.core.status import load_status_stats
+
+        return load_status_stats()
+    except Exception as e:
+        log.warning(f"读取状态统计失败: {e}")
+        return None
+
+
+def _render_accounts(lines: list, stats: dict):
+    teams = stats.get("teams") or {}
+
+    _header(lines, "oai_accounts", "gauge", "按邀请状态统计的账号数")
+    for team, aggregate in sorted(teams.items()):
+        for status, count in sorted(aggregate.get("invitation", {}).items()):
+            lines.append(f"oai_accounts{_labels(team=team, status=status or 'unknown')} {count}")
+
+    _header(lines, "oai_storage_accounts", "gauge", "按服务商入库状态统计的账号数")
+    for team, aggregate in sorted(teams.items()):
+        for provider, counts in sorted(aggregate.get("storage", {}).items()):
+            for status, count in sorted(counts.items()):
+                labels = _labels(team=team, provider=provider, status=status)
+                lines.append(f"oai_storage_accounts{labels} {count}")
+
+    last_updated = _timestamp(stats.get("last_updated"))
+    if last_updated is not None:
+        _header(
+            lines,
+            "oai_tracker_last_updated_timestamp_seconds",
+            "gauge",
+            "追踪记录最后保存时间",
+        )
+        lines.append(f"oai_tracker_last_updated_timestamp_seconds {_number(last_updated)}")
+
+
+def _render_histograms(lines: list, key: str, name: str, label: str, buckets: tuple, help_text: str):
+    with _lock:
+        entries = {
+            value: list(entry) for (kind, value), entry in _histograms.items() if kind == key
+        }
+    if not entries:
+        return
+    _header(lines, name, "histogram", help_text)
+    for value, entry in sorted(entries.items()):
+        cumulative = 0
+        for bound, count in zip(buckets, entry):
+            cumulative += count
+            lines.append(f"{name}_bucket{_labels(**{label: value, 'le': _number(float(bound))})} {cumulative}")
+        lines.append(f"{name}_bucket{_labels(**{label: value, 'le': '+Inf'})} {entry[-2]}")
+        lines.append(f"{name}_count{_labels(**{label: value})} {entry[-2]}")
+        lines.append(f"{name}_sum{_labels(**{label: value})} {_number(float(entry[-1]))}")
+
+
+def _render_http(lines: list):
+    # 只在流程进程中导出 (metrics 命令不为此导入 requests)
+    http_module = sys.modules.get("src.core.http")
+    if http_module is None:
+        return
+    stats = http_module.get_http_stats()
+    if not stats:
+        return
+    for field, name, help_text in (
+        ("requests", "oai_http_requests_total", "HTTP 请求数"),
+        ("errors", "oai_http_errors_total", "HTTP 失败数 (异常或状态码 >= 400)"),
+        ("retries", "oai_http_retries_total", "会话层自动重试次数"),
+        ("total_time", "oai_http_request_seconds_total", "HTTP 请求累计耗时"),
+    ):
+        _header(lines, name, "counter", help_text)
+        for origin, entry in sorted(stats.items()):
+            lines.append(f"{name}{_labels(origin=origin)} {_number(entry[field])}")
+
+
+def render_metrics() -> str:
+    """生成 Prometheus 文本格式的全部指标"""
+    lines: list[str] = []
+    stats = _load_tracker_stats()
+    if stats:
+        _render_accounts(lines, stats)
+    _render_histograms(
+        lines, "stage", "oai_stage_duration_seconds", "stage", STAGE_BUCKETS, "阶段耗时"
+    )
+    _render_histograms(
+        lines,
+        "provider_query",
+        "oai_provider_query_duration_seconds",
+        "provider",
+        QUERY_BUCKETS,
+        "入库状态查询耗时",
+    )
+    _render_http(lines)
+    _header(lines, "oai_metrics_generated_timestamp_seconds", "gauge", "指标生成时间")
+    lines.append(f"oai_metrics_generated_timestamp_seconds {_number(round(time.time(), 3))}")
+    return "\n".join(lines) + "\n"
+
+
+def write_textfile(path: str | None = None) -> str:
+    """原子写入 textfile (临时文件 + os.replace，采集方不会读到半个文件)
+
+    Returns:
+        str: 写入的路径
+    """
+    path = str(path or METRICS_TEXTFILE)
+    text = render_metrics()
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # textfile collector 只读取 *.prom，临时文件 (.oai.prom.xxx) 不会被采集
+    atomic_write_text(path, text, durable=False)
+    return path
+
+
+# ==================== 导出 ====================
+
+
+def _handler_class():
+    from http.server import BaseHTTPRequestHandler
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+                self.send_error(404)
+                return
+            body = render_metrics().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", CONTENT_TYPE)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return MetricsHandler
+
+
+def serve_metrics(port: int, host: str = METRICS_HOST):
+    """在后台线程提供 GET /metrics (port=0 时随机分配端口)
+
+    Returns:
+        ThreadingHTTPServer: 已启动的服务器 (调用 shutdown() 停止)
+    """
+    from http.server import ThreadingHTTPServer
+
+    server = ThreadingHTTPServer((host, port), _handler_class())
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="metrics-http", daemon=True).start()
+    return server
+
+
+def _write_loop(path: str, interval: float):
+    while not _stop.wait(interval):
+        try:
+            write_textfile(path)
+        except Exception as e:
+            log.warning(f"写入指标文件失败: {e}")
+
+
+def start_metrics(
+    textfile: str | None = None,
+    port: int | None = None,
+    interval: float | None = None,
+) -> bool:
+    """按 [metrics] 配置启动导出 (都未配置时不做任何事)
+
+    Returns:
+        bool: 是否启动了任一导出方式
+    """
+    global _server, _writer, _textfile, _atexit_registered
+    textfile = METRICS_TEXTFILE if textfile is None else textfile
+    port = METRICS_PORT if port is None else port
+    interval = METRICS_INTERVAL if interval is None else interval
+
+    started = False
+    if port and _server is None:
+        try:
+            _server = serve_metrics(port)
+            log.info(f"指标端口: http://{METRICS_HOST}:{_server.server_port}/metrics")
+            started = True
+        except OSError as e:
+            log.warning(f"指标端口启动失败: {e}")
+
+    if textfile and _writer is None:
+        _textfile = textfile
+        _stop.clear()
+        _writer = threading.Thread(
+            target=_write_loop,
+            args=(textfile, max(float(interval), 1.0)),
+            name="metrics-textfile",
+            daemon=True,
+        )
+        _writer.start()
+        if not _atexit_registered:
+            atexit.register(stop_metrics)
+            _atexit_registered = True
+        started = True
+    return started
+
+
+def stop_metrics():
+    """停止导出；启用了 textfile 时写出最后一次指标"""
+    global _server, _writer
+    _stop.set()
+    if _writer is not None:
+        _writer.join(timeout=5)
+        _writer = None
+    # 可重复调用 (退出保存状态后再次调用以写出最终统计)
+    if _textfile:
+        try:
+            write_textfile(_textfile)
+        except Exception as e:
+            log.warning(f"写入指标文件失败: {e}")
+    if _server is not None:
+        _server.shutdown()
+        _server.server_close()
+        _server = None
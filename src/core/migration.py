@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 import uuid
-from typing import Optional
+from typing import Iterable, List, Optional
 
 from src.core.logger import log
 from src.core.migration_store import MigrationStore
@@ -39,6 +39,27 @@ def execute_migration(
     return record
 
 
+def execute_migrations(
+    requests: Iterable[MigrationRequest], store: Optional[MigrationStore] = None
+) -> List[MigrationRecord]:
+    """批量创建迁移记录 (所有记录一次性追加到存储日志)"""
+    store = store or MigrationStore()
+    records = []
+    with store.batch():
+        for request in requests:
+            records.append(
+                store.create_record(
+                    record_id=str(uuid.uuid4()),
+                    legacy_path=request.legacy_reference,
+                    new_path=request.target_reference,
+                    status="migrated",
+                    notes="自动创建迁移记录",
+                )
+            )
+    log.success(f"迁移记录已创建: {len(records)} 条")
+    return records
+
+
 def verify_migration(
     record_id: str,
     verification: MigrationVerification,
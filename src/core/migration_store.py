@@ -1,51 +1,202 @@
 from __future__ import annotations
 
 import json
+import os
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional
 
 from src.core.config import BASE_DIR
+from src.core.fileio import atomic_write_json
 from src.core.logger import log
 from src.core.models import MigrationRecord, ValidationError, now_iso
 
+# 日志累计超过该条数时，下一次写入后压缩为快照
+COMPACT_THRESHOLD = 1000
+
 
 class MigrationStore:
-    """迁移记录存储 (JSON 文件)。"""
+    """迁移记录存储 (快照 JSON + 追加日志)。
+
+    migration_records.json 为快照 (格式与旧版相同)，每次创建 / 验收只向
+    migration_records.json.log 追加一行 {"op": "upsert", "record": {...}}。
+    加载时先读快照再重放日志；日志超过 compact_threshold 条时合并写入快照并清空日志。
+    先写快照、再清空日志: 中途崩溃时重放的是同样的 upsert，结果不变。
 
-    def __init__(self, path: Optional[Path] = None):
-        self.path = path or (BASE_DIR / "migration_records.json")
+    按 status / capability_id 的查询由内存索引提供，不遍历全部记录。
+    """
+
+    def __init__(self, path: Optional[Path] = None, compact_threshold: int = COMPACT_THRESHOLD):
+        self.path = Path(path or (BASE_DIR / "migration_records.json"))
+        self.log_path = self.path.with_name(self.path.name + ".log")
+        self.compact_threshold = max(1, int(compact_threshold))
         self._records: Dict[str, MigrationRecord] = {}
+        # 索引值用 dict 保持插入顺序 (作为有序集合)
+        self._by_status: Dict[str, Dict[str, None]] = {}
+        self._by_capability: Dict[str, Dict[str, None]] = {}
+        self._indexed: Dict[str, tuple[str, str]] = {}
+        # 记录首次出现的顺序 (状态变化会把记录移到索引桶末尾，筛选结果按此排序)
+        self._order: Dict[str, int] = {}
+        self._log_entries = 0
+        self._batch: Optional[List[MigrationRecord]] = None
         self._load()
 
+    # ==================== 加载 ====================
+
     def _load(self) -> None:
-        if not self.path.exists():
+        if self.path.exists():
+            try:
+                payload = json.loads(self.path.read_text(encoding="utf-8"))
+                for item in payload.get("records", []):
+                    self._put(MigrationRecord.from_dict(item))
+            except (OSError, json.JSONDecodeError, ValidationError) as exc:
+                log.warning(f"迁移记录加载失败: {exc}")
+        self._replay_log()
+
+    def _replay_log(self) -> None:
+        if not self.log_path.exists():
             return
         try:
-            payload = json.loads(self.path.read_text(encoding="utf-8"))
-            for item in payload.get("records", []):
-                record = MigrationRecord.from_dict(item)
-                self._records[record.id] = record
-        except (OSError, json.JSONDecodeError, ValidationError) as exc:
-            log.warning(f"迁移记录加载失败: {exc}")
+            with open(self.log_path, "r", encoding="utf-8") as f:
+                lines = f.readlines()
+        except OSError as exc:
+            log.warning(f"迁移记录日志读取失败: {exc}")
+            return
 
-    def save(self) -> None:
+        for number, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+                if entry.get("op") == "upsert":
+                    self._put(MigrationRecord.from_dict(entry["record"]))
+            except (json.JSONDecodeError, KeyError, ValidationError) as exc:
+                # 末行可能因写入中断而不完整
+                log.warning(f"迁移记录日志第 {number} 行无效，已跳过: {exc}")
+                continue
+            self._log_entries += 1
+
+    # ==================== 索引 ====================
+
+    def _put(self, record: MigrationRecord) -> None:
+        status, capability_id = self._indexed.get(record.id, (None, None))
+        # 只移动发生变化的索引项，其余保持原有顺序
+        if status != record.status:
+            if status is not None:
+                self._by_status[status].pop(record.id, None)
+            self._by_status.setdefault(record.status, {})[record.id] = None
+        if capability_id != record.capability_id:
+            if capability_id is not None:
+                self._by_capability[capability_id].pop(record.id, None)
+            self._by_capability.setdefault(record.capability_id, {})[record.id] = None
+
+        self._records[record.id] = record
+        self._indexed[record.id] = (record.status, record.capability_id)
+        self._order.setdefault(record.id, len(self._order))
+
+    def _matching_ids(self, status: Optional[str], capability_id: Optional[str]) -> Iterable[str]:
+        if status is None and capability_id is None:
+            return self._records.keys()
+        if status is None:
+            return self._by_capability.get(capability_id, {}).keys()
+        by_status = self._by_status.get(status, {})
+        if capability_id is None:
+            return by_status.keys()
+        by_capability = self._by_capability.get(capability_id, {})
+        # 从较小的集合出发求交集
+        if len(by_capability) < len(by_status):
+            return [record_id for record_id in by_capability if record_id in by_status]
+        return [record_id for record_id in by_status if record_id in by_capability]
+
+    # ==================== 持久化 ====================
+
+    def _append_log(self, records: List[MigrationRecord]) -> None:
+        if not records:
+            return
+        ts = now_iso()
+        lines = [
+            json.dumps(
+                {"op": "upsert", "ts": ts, "record": record.to_dict()},
+                ensure_ascii=False,
+            )
+            for record in records
+        ]
+        with open(self.log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        self._log_entries += len(records)
+        if self._log_entries >= self.compact_threshold:
+            self.compact()
+
+    def compact(self) -> None:
+        """将全部记录写入快照并清空日志"""
         data = {
             "records": [record.to_dict() for record in self._records.values()],
             "updated_at": now_iso(),
         }
-        self.path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        atomic_write_json(str(self.path), data)
+        if self.log_path.exists():
+            os.remove(self.log_path)
+        self._log_entries = 0
+
+    def save(self) -> None:
+        self.compact()
+
+    @contextmanager
+    def batch(self) -> Iterator["MigrationStore"]:
+        """批量写入: 块内的 upsert 只更新内存，退出时一次性追加到日志"""
+        if self._batch is not None:
+            yield self
+            return
+        self._batch = []
+        try:
+            yield self
+        finally:
+            pending, self._batch = self._batch, None
+            self._append_log(pending)
 
-    def list_records(self) -> List[MigrationRecord]:
-        return list(self._records.values())
+    # ==================== 查询 ====================
+
+    def list_records(
+        self,
+        status: Optional[str] = None,
+        capability_id: Optional[str] = None,
+        offset: int = 0,
+        limit: Optional[int] = None,
+    ) -> List[MigrationRecord]:
+        """按条件列出记录 (按创建顺序)，offset / limit 用于分页"""
+        ids = list(self._matching_ids(status, capability_id))
+        if status is not None or capability_id is not None:
+            ids.sort(key=self._order.__getitem__)
+        end = None if limit is None else offset + limit
+        return [self._records[record_id] for record_id in ids[offset:end]]
+
+    def count_records(self, status: Optional[str] = None, capability_id: Optional[str] = None) -> int:
+        ids = self._matching_ids(status, capability_id)
+        return len(ids)
 
     def get_record(self, record_id: str) -> Optional[MigrationRecord]:
         return self._records.get(record_id)
 
+    # ==================== 写入 ====================
+
     def upsert(self, record: MigrationRecord) -> MigrationRecord:
-        self._records[record.id] = record
-        self.save()
+        self._put(record)
+        if self._batch is not None:
+            self._batch.append(record)
+        else:
+            self._append_log([record])
         return record
 
+    def upsert_many(self, records: Iterable[MigrationRecord]) -> List[MigrationRecord]:
+        records = list(records)
+        with self.batch():
+            for record in records:
+                self.upsert(record)
+        return records
+
     def create_record(
         self,
         record_id: str,
@@ -0,0 +1,207 @@
+# ==================== 运行耗时统计模块 ====================
+# 记录 Timer 的嵌套 span，并按阶段汇总耗时分布
+
+"""Profiler - 阶段耗时统计
+
+带 stage 的 Timer 会登记一个 span (span_id / parent_id 按线程内嵌套关系分配)，
+结束时把耗时计入该阶段的统计 (同时计入 src.core.metrics 的阶段耗时直方图)。
+run_all_teams 结束时输出各阶段的次数 / 总耗时 / p50 / p95 / max 表格，并写入 JSON 文件 (PROFILE_DIR)，便于比较不同版本的运行耗时。
+
+Functions:
+    start_span: 开始一个 span，返回 (span_id, parent_id)
+    end_span: 结束 span 并记录耗时
+    get_profile: 获取各阶段耗时统计
+    reset_profile: 清空统计
+    format_profile: 格式化为表格文本行
+    write_profile: 写入 JSON 文件
+    report_profile: 输出表格并写入 JSON (流程结束时调用)
+"""
+
+from __future__ import annotations
+
+import itertools
+import math
+import os
+import threading
+from datetime import datetime
+
+from src.core.config import PROFILE_DIR
+from src.core.fileio import atomic_write_json
+from src.core.logger import log
+from src.core.metrics import observe_stage
+
+_span_ids = itertools.count(1)
+_local = threading.local()
+_lock = threading.Lock()
+# stage → {"durations": [秒], "parent": 父阶段}
+_stages: dict[str, dict] = {}
+
+
+def _stack() -> list:
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    return stack
+
+
+def start_span(stage: str) -> tuple[int, int | None]:
+    """开始一个 span (当前线程最内层未结束的 span 为其父 span)
+
+    Returns:
+        tuple: (span_id, parent_id)
+    """
+    stack = _stack()
+    parent = stack[-1] if stack else None
+    span_id = next(_span_ids)
+    stack.append((span_id, stage))
+    return span_id, parent[0] if parent else None
+
+
+def end_span(span_id: int, stage: str, duration: float):
+    """结束 span 并把耗时 (秒) 计入阶段统计"""
+    stack = _stack()
+    parent_stage = None
+    for index in range(len(stack) - 1, -1, -1):
+        if stack[index][0] == span_id:
+            parent_stage = stack[index - 1][1] if index > 0 else None
+            del stack[index:]
+            break
+
+    with _lock:
+        entry = _stages.get(stage)
+        if entry is None:
+            entry = _stages[stage] = {"durations": [], "parent": parent_stage}
+        entry["durations"].append(duration)
+    observe_stage(stage, duration)
+
+
+def _percentile(ordered: list[float], pct: float) -> float:
+    # nearest-rank
+    rank = math.ceil(len(ordered) * pct / 100)
+    return ordered[max(0, min(len(ordered), rank) - 1)]
+
+
+def get_profile() -> dict:
+    """各阶段耗时统计 (按首次出现顺序)
+
+    Returns:
+        dict: {stage: {"parent", "count", "total_ms", "mean_ms", "p50_ms", "p95_ms", "max_ms"}}
+    """
+    with _lock:
+        snapshot = {
+            stage: (entry["parent"], sorted(entry["durations"]))
+            for stage, entry in _stages.items()
+        }
+
+    profile = {}
+    for stage, (parent, ordered) in snapshot.items():
+        total = sum(ordered)
+        profile[stage] = {
+            "parent": parent,
+            "count": len(ordered),
+            "total_ms": round(total * 1000, 1),
+            "mean_ms": round(total / len(ordered) * 1000, 1),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 1),
+            "p95_ms": round(_percentile(ordered, 95) * 1000, 1),
+            "max_ms": round(ordered[-1] * 1000, 1),
+        }
+    return profile
+
+
+def reset_profile():
+    with _lock:
+        _stages.clear()
+    _local.stack = []
+
+
+def _depth(profile: dict, stage: str) -> int:
+    depth = 0
+    parent = profile[stage]["parent"]
+    seen = {stage}
+    while parent in profile and parent not in seen:
+        seen.add(parent)
+        depth += 1
+        parent = profile[parent]["parent"]
+    return depth
+
+
+def _ordered_stages(profile: dict) -> list[str]:
+    """父阶段在前，子阶段紧随其后"""
+    children: dict[str | None, list[str]] = {}
+    for stage, stats in profile.items():
+        parent = stats["parent"] if stats["parent"] in profile else None
+        children.setdefault(parent, []).append(stage)
+
+    ordered: list[str] = []
+
+    def visit(parent):
+        for stage in children.get(parent, []):
+            if stage not in ordered:
+                ordered.append(stage)
+                visit(stage)
+
+    visit(None)
+    return ordered
+
+
+def format_profile(profile: dict | None = None) -> list[str]:
+    """格式化为表格文本行 (子阶段缩进显示)"""
+    profile = get_profile() if profile is None else profile
+    lines = [
+        f"{'stage':<28}{'count':>7}{'total':>11}{'p50':>10}{'p95':>10}{'max':>10}"
+    ]
+    for stage in _ordered_stages(profile):
+        stats = profile[stage]
+        label = "  " * _depth(profile, stage) + stage
+        lines.append(
+            f"{label:<28}{stats['count']:>7}"
+            f"{stats['total_ms'] / 1000:>10.1f}s"
+            f"{stats['p50_ms'] / 1000:>9.2f}s"
+            f"{stats['p95_ms'] / 1000:>9.2f}s"
+            f"{stats['max_ms'] / 1000:>9.2f}s"
+        )
+    return lines
+
+
+def write_profile(path: str | None = None, run_id: str | None = None) -> str | None:
+    """写入 JSON 文件 (默认 PROFILE_DIR/profile-<时间>.json)，PROFILE_DIR 为空时不写入
+
+    Returns:
+        str | None: 写入的文件路径
+    """
+    if path is None:
+        if not PROFILE_DIR:
+            return None
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(PROFILE_DIR, f"profile-{timestamp}.json")
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    atomic_write_json(
+        path,
+        {
+            "run_id": run_id,
+            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "stages": get_profile(),
+        },
+        durable=False,
+    )
+    return path
+
+
+def report_profile(run_id: str | None = None):
+    """输出阶段耗时表格并写入 JSON 文件"""
+    profile = get_profile()
+    if not profile:
+        return
+
+    log.section("阶段耗时统计")
+    for line in format_profile(profile):
+        log.info(line)
+    try:
+        path = write_profile(run_id=run_id)
+        if path:
+            log.info(f"耗时统计已保存: {path}", icon="save")
+    except Exception as e:
+        log.warning(f"保存耗时统计失败: {e}")
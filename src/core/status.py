@@ -0,0 +1,185 @@
+# ==================== 状态查看模块 ====================
+# status 命令: 只读取追踪记录，不加载浏览器 / HTTP 客户端
+
+"""Status - 显示当前进度
+
+与 workflow.py 分离，status 子命令只依赖 config / logger / utils，
+启动时不会导入 DrissionPage、服务商客户端，也不会注册信号处理器。
+
+默认读取 save_team_tracker 时同步写入的状态统计缓存 (team_tracker.stats.json)，
+缓存缺失或追踪记录已被其他方式修改时才加载完整追踪记录重新统计。
+
+Functions:
+    load_status_stats: 获取状态统计 (优先使用缓存)
+    show_status: 显示各 Team 状态统计 (accounts=True 时逐个列出账号)
+    print_status_json: 以 JSON 输出状态统计
+    watch_status: 持续刷新状态统计
+"""
+
+import json
+import time
+
+from src.core.logger import log
+from src.core.tracker import account_status, compute_aggregates
+from src.core.tracker_store import get_tracker_store, read_tracker_stats, write_tracker_stats
+from src.core.utils import load_team_tracker
+
+
+def load_status_stats() -> dict:
+    """获取状态统计
+
+    Returns:
+        dict: {"last_updated": str | None, "teams": {team: {"total", "invitation", "storage"}}}
+    """
+    store = get_tracker_store()
+    stats = read_tracker_stats(store)
+    if stats is not None:
+        return stats
+
+    tracker = load_team_tracker()
+    stats = {
+        "last_updated": tracker.get("last_updated"),
+        "teams": compute_aggregates(tracker),
+    }
+    try:
+        write_tracker_stats(store, stats)
+    except Exception as e:
+        log.warning(f"保存状态统计失败: {e}")
+    return stats
+
+
+def _summarize(stats: dict) -> dict:
+    total = completed = 0
+    storage: dict[str, dict[str, int]] = {}
+    for team in stats.get("teams", {}).values():
+        total += team.get("total", 0)
+        completed += team.get("invitation", {}).get("completed", 0)
+        for provider, counts in team.get("storage", {}).items():
+            merged = storage.setdefault(provider, {})
+            for status, count in counts.items():
+                merged[status] = merged.get(status, 0) + count
+    return {
+        "total": total,
+        "completed": completed,
+        "incomplete": total - completed,
+        "storage": storage,
+    }
+
+
+def _format_storage(storage: dict, total: int) -> str:
+    return ", ".join(
+        f"{provider} {counts.get('stored', 0)}/{total}"
+        for provider, counts in sorted(storage.items())
+    )
+
+
+def _show_accounts():
+    """逐个列出账号状态 (需要加载完整追踪记录)"""
+    tracker = load_team_tracker()
+
+    if not tracker.get("teams"):
+        log.info("没有任何记录")
+        return
+
+    total_accounts = 0
+    total_completed = 0
+    total_incomplete = 0
+
+    for team_name, accounts in tracker["teams"].items():
+        log.info(f"{team_name}:", icon="team")
+        status_count = {}
+        for acc in accounts:
+            total_accounts += 1
+            status = account_status(acc) or "unknown"
+            status_count[status] = status_count.get(status, 0) + 1
+
+            if status == "completed":
+                total_completed += 1
+                log.success(f"{acc['email']} ({status})")
+            elif status in ["invited", "registered", "authorized", "processing"]:
+                total_incomplete += 1
+                log.warning(f"{acc['email']} ({status})")
+            else:
+                total_incomplete += 1
+                log.error(f"{acc['email']} ({status})")
+
+        log.info(f"统计: {status_count}")
+
+    log.separator("-", 40)
+    log.info(f"总计: {total_accounts} 个账号")
+    log.success(f"完成: {total_completed}")
+    log.warning(f"未完成: {total_incomplete}")
+    log.info(f"最后更新: {tracker.get('last_updated', 'N/A')}", icon="time")
+
+
+def _render(stats: dict):
+    teams = stats.get("teams", {})
+    if not teams:
+        log.info("没有任何记录")
+        return
+
+    for team_name, team in teams.items():
+        log.info(f"{team_name}:", icon="team")
+        log.info(f"统计: {team.get('invitation', {})}", indent=1)
+        if team.get("storage"):
+            log.info(
+                f"入库: {_format_storage(team['storage'], team.get('total', 0))}",
+                indent=1,
+            )
+
+    summary = _summarize(stats)
+    log.separator("-", 40)
+    log.info(f"总计: {summary['total']} 个账号")
+    log.success(f"完成: {summary['completed']}")
+    log.warning(f"未完成: {summary['incomplete']}")
+    if summary["storage"]:
+        log.info(f"入库: {_format_storage(summary['storage'], summary['total'])}")
+    log.info(f"最后更新: {stats.get('last_updated') or 'N/A'}", icon="time")
+
+
+def show_status(accounts: bool = False):
+    """显示当前状态
+
+    Args:
+        accounts: 是否逐个列出账号 (需要加载完整追踪记录)
+    """
+    log.header("当前状态")
+    if accounts:
+        _show_accounts()
+        return
+    _render(load_status_stats())
+
+
+def print_status_json():
+    """以 JSON 输出状态统计 (附带汇总)"""
+    stats = load_status_stats()
+    output = {
+        "last_updated": stats.get("last_updated"),
+        "summary": _summarize(stats),
+        "teams": stats.get("teams", {}),
+    }
+    print(json.dumps(output, ensure_ascii=False, indent=2))
+
+
+def watch_status(interval: float = 2.0, as_json: bool = False):
+    """持续刷新状态统计 (Ctrl+C 退出)
+
+    每个周期只检查数据文件指纹，数据有变化时才重新读取统计缓存。
+    """
+    store = get_tracker_store()
+    last_fingerprint = None
+    try:
+        while True:
+            fingerprint = store.fingerprint()
+            if fingerprint != last_fingerprint:
+                last_fingerprint = fingerprint
+                # 清屏并回到左上角
+                print("\033[2J\033[H", end="", flush=True)
+                if as_json:
+                    print_status_json()
+                else:
+                    show_status()
+                    log.info(f"每 {interval:g}s 刷新，Ctrl+C 退出", icon="time")
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        pass
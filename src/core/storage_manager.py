@@ -6,17 +6,23 @@
 Functions:
     init_storage_status: 初始化入库状态结构
     get_enabled_providers: 获取已启用的服务商列表
+    get_provider_inventory: 获取服务商账号清单 (email → account_id，按 TTL 缓存)
+    record_provider_account: 新入库账号写入清单缓存
+    invalidate_provider_inventory: 清除清单缓存
     check_account_stored: 查询账号在指定服务商中的入库状态
     update_storage_status: 更新 team_tracker.json 中的入库状态
+    reconcile_storage: 按服务商账号清单批量核对 tracker 入库状态
 """
 
 from __future__ import annotations
 
+import threading
+import time
 from datetime import datetime
 
-from src.auth.cpa.client import cpa_query_account
-from src.auth.crs.client import crs_query_account
-from src.auth.s2a.client import s2a_get_accounts
+from src.auth.cpa.client import cpa_iter_accounts, cpa_query_account
+from src.auth.crs.client import crs_iter_accounts, crs_query_account
+from src.auth.s2a.client import s2a_account_emails, s2a_iter_accounts
 from src.core.config import (
     CPA_ADMIN_PASSWORD,
     CPA_API_BASE,
@@ -24,17 +30,15 @@ from src.core.config import (
     CRS_API_BASE,
     S2A_ADMIN_KEY,
     S2A_API_BASE,
+    STORAGE_INVENTORY_RETRY_AFTER,
+    STORAGE_INVENTORY_TTL,
 )
+from src.core.events import emit_event
 from src.core.logger import log
-
-
-def init_storage_status() -> dict:
-    """初始化入库状态结构"""
-    return {
-        "crs": {"status": "not_stored"},
-        "cpa": {"status": "not_stored"},
-        "s2a": {"status": "not_stored"},
-    }
+from src.core.metrics import observe_provider_query
+from src.core.tracker_migration import init_storage_status
+from src.core.tracker_store import get_tracker_store
+from src.core.utils import Timer, find_account, record_account_change
 
 
 def _is_configured(value: str | None) -> bool:
@@ -54,16 +58,12 @@ def _s2a_query_account(email: str) -> dict:
     if not target_email:
         return {"exists": False, "account_id": None}
 
-    accounts = s2a_get_accounts("openai")
-    for account in accounts:
-        account_name = (account.get("name") or "").lower()
-        credentials = account.get("credentials") or {}
-        account_email = (credentials.get("email") or "").lower()
-        if account_name == target_email or account_email == target_email:
-            return {
-                "exists": True,
-                "account_id": account.get("id") or account.get("account_id"),
-            }
+    try:
+        for record in s2a_iter_accounts("openai"):
+            if target_email in s2a_account_emails(record["raw"]):
+                return {"exists": True, "account_id": record["id"]}
+    except Exception as e:
+        log.warning(f"S2A 获取账号列表异常: {e}")
 
     return {"exists": False, "account_id": None}
 
@@ -80,8 +80,115 @@ def get_enabled_providers() -> list[str]:
     return providers
 
 
+# ==================== 服务商账号清单缓存 ====================
+# provider -> {"fetched_at": monotonic 秒, "accounts": {email(小写): account_id}}
+# 拉取失败时 accounts 为 None，退避 STORAGE_INVENTORY_RETRY_AFTER 秒内不再重新拉取
+_inventory_cache: dict[str, dict] = {}
+_inventory_lock = threading.Lock()
+
+
+def _iter_provider_accounts(provider_key: str):
+    if provider_key == "crs":
+        return crs_iter_accounts()
+    if provider_key == "cpa":
+        return cpa_iter_accounts()
+    return s2a_iter_accounts("openai")
+
+
+def _fetch_inventory(provider_key: str) -> dict | None:
+    """流式遍历服务商账号列表，构建 email → account_id 映射 (失败返回 None)
+
+    只保留映射本身，不保存原始账号数据。
+    """
+    if provider_key not in ("crs", "cpa", "s2a"):
+        return None
+
+    inventory = {}
+    try:
+        for record in _iter_provider_accounts(provider_key):
+            if provider_key == "s2a":
+                # S2A 账号名称与凭证邮箱都可能是注册邮箱
+                emails = s2a_account_emails(record["raw"])
+            else:
+                emails = [record["email"]]
+            for email in emails:
+                if email:
+                    inventory.setdefault(email, record["id"])
+    except Exception as e:
+        log.warning(f"拉取服务商账号清单失败 ({provider_key}): {e}")
+        return None
+    return inventory
+
+
+def get_provider_inventory(provider: str, refresh: bool = False) -> dict | None:
+    """获取服务商账号清单 (email 小写 → account_id)
+
+    TTL (request.inventory_ttl) 内复用上次拉取的结果；
+    服务商未配置或拉取失败时返回 None，由调用方回退到逐个查询。
+    拉取失败后 request.inventory_retry_after 秒内直接返回 None，服务商故障期间不重复拉取。
+
+    Args:
+        provider: 服务商 (crs/cpa/s2a)
+        refresh: 忽略缓存强制重新拉取
+    """
+    provider_key = _normalize_provider(provider)
+    if provider_key not in get_enabled_providers():
+        return None
+
+    with _inventory_lock:
+        cached = _inventory_cache.get(provider_key)
+        if not refresh and cached is not None:
+            ttl = (
+                STORAGE_INVENTORY_TTL
+                if cached["accounts"] is not None
+                else STORAGE_INVENTORY_RETRY_AFTER
+            )
+            if time.monotonic() - cached["fetched_at"] < ttl:
+                return cached["accounts"]
+
+        inventory = _fetch_inventory(provider_key)
+        if inventory is None:
+            _inventory_cache[provider_key] = {"fetched_at": time.monotonic(), "accounts": None}
+            return None
+
+        _inventory_cache[provider_key] = {
+            "fetched_at": time.monotonic(),
+            "accounts": inventory,
+        }
+        log.info(f"服务商账号清单已刷新: provider={provider_key}, 共 {len(inventory)} 个")
+        return inventory
+
+
+def record_provider_account(provider: str, email: str, account_id=None) -> None:
+    """新账号入库后直接写入清单缓存，避免 TTL 内误判为未入库"""
+    provider_key = _normalize_provider(provider)
+    if not email:
+        return
+    with _inventory_lock:
+        cached = _inventory_cache.get(provider_key)
+        if cached is not None and cached["accounts"] is not None:
+            cached["accounts"][email.lower()] = account_id
+
+
+def invalidate_provider_inventory(provider: str | None = None) -> None:
+    """清除清单缓存 (不指定服务商时清除全部)"""
+    with _inventory_lock:
+        if provider is None:
+            _inventory_cache.clear()
+        else:
+            _inventory_cache.pop(_normalize_provider(provider), None)
+
+
 def check_account_stored(email: str, provider: str) -> dict:
-    """查询账号在指定服务商中的入库状态"""
+    """查询账号在指定服务商中的入库状态 (耗时计入 storage_check 阶段与按服务商的查询耗时指标)"""
+    start = time.perf_counter()
+    with Timer(stage="storage_check", event=False):
+        result = _check_account_stored(email, provider)
+    observe_provider_query(_normalize_provider(provider) or "unknown", time.perf_counter() - start)
+    return result
+
+
+def _check_account_stored(email: str, provider: str) -> dict:
     last_check = _now_str()
     provider_key = _normalize_provider(provider)
 
@@ -90,7 +197,16 @@ def check_account_stored(email: str, provider: str) -> dict:
 
     try:
         log.info(f"开始查询入库状态: provider={provider_key}, email={email}")
-        if provider_key == "crs":
+        inventory = (
+            get_provider_inventory(provider_key) if STORAGE_INVENTORY_TTL > 0 else None
+        )
+        if inventory is not None:
+            target_email = email.lower()
+            result = {
+                "exists": target_email in inventory,
+                "account_id": inventory.get(target_email),
+            }
+        elif provider_key == "crs":
             result = crs_query_account(email)
         elif provider_key == "cpa":
             result = cpa_query_account(email)
@@ -130,40 +246,133 @@ def update_storage_status(
     if not isinstance(teams, dict):
         return
 
-    if team_name not in teams:
+    account = find_account(tracker, team_name, email)
+    if account is None:
         return
 
-    for account in teams[team_name]:
-        if account.get("email") != email:
-            continue
-
-        log.info(
-            f"更新入库状态: team={team_name}, email={email}, provider={provider_key}"
+    log.info(
+        f"更新入库状态: team={team_name}, email={email}, provider={provider_key}"
+    )
+    if not isinstance(account.get("storage_status"), dict):
+        account["storage_status"] = init_storage_status()
+
+    if provider_key not in account["storage_status"]:
+        account["storage_status"][provider_key] = {"status": "not_stored"}
+
+    provider_status = account["storage_status"][provider_key]
+    previous_status = provider_status.get("status", "")
+    explicit_status = status_data.get("status")
+    exists = status_data.get("exists")
+
+    if explicit_status:
+        provider_status["status"] = explicit_status
+    elif exists is not None:
+        provider_status["status"] = "stored" if exists else "not_stored"
+
+    if "account_id" in status_data:
+        provider_status["account_id"] = status_data.get("account_id")
+    if "last_check" in status_data:
+        provider_status["last_check"] = status_data.get("last_check")
+
+    account["updated_at"] = _now_str()
+    record_account_change(tracker, team_name, account)
+    if provider_status.get("status") != previous_status:
+        emit_event(
+            "storage",
+            provider_status.get("status", ""),
+            team=team_name,
+            email=email,
+            provider=provider_key,
+            previous=previous_status,
         )
-        if not isinstance(account.get("storage_status"), dict):
-            account["storage_status"] = init_storage_status()
-
-        if provider_key not in account["storage_status"]:
-            account["storage_status"][provider_key] = {"status": "not_stored"}
+    log.info(
+        "入库状态更新完成: "
+        f"team={team_name}, email={email}, provider={provider_key}, "
+        f"status={provider_status.get('status')}"
+    )
+
+
+def reconcile_storage(
+    tracker: dict, providers: list[str] | None = None, apply: bool = True
+) -> dict:
+    """按服务商账号清单批量核对 tracker 中所有账号的入库状态
+
+    每个服务商只拉取一次完整清单，在内存中与 tracker 做 join；
+    仅入库状态或 account_id 有变化的账号会调用 update_storage_status，
+    这些变更在存储后端的同一个批次中提交 (SQLite 单事务 / write-behind 单次日志写入)。
+    调用方负责在核对后保存一次 tracker。
+
+    Args:
+        tracker: team_tracker 数据
+        providers: 需要核对的服务商 (默认: 全部已启用的服务商)
+        apply: False 时只生成报告，不修改 tracker 也不写入存储后端 (dry-run)
+
+    Returns:
+        dict: {provider: {"stored": [...], "missing": [...], "orphaned": [...], "changed": [...]}}
+            拉取清单失败的服务商值为 None
+    """
+    if providers is None:
+        providers = get_enabled_providers()
 
-        provider_status = account["storage_status"][provider_key]
-        explicit_status = status_data.get("status")
-        exists = status_data.get("exists")
+    teams = tracker.get("teams")
+    if not isinstance(teams, dict):
+        teams = {}
+
+    report = {}
+    pending = []
+    for provider in providers:
+        provider_key = _normalize_provider(provider)
+        inventory = get_provider_inventory(provider_key, refresh=True)
+        if inventory is None:
+            log.error(f"获取服务商账号清单失败，跳过核对: {provider_key}")
+            report[provider_key] = None
+            continue
 
-        if explicit_status:
-            provider_status["status"] = explicit_status
-        elif exists is not None:
-            provider_status["status"] = "stored" if exists else "not_stored"
+        last_check = _now_str()
+        result = {"stored": [], "missing": [], "orphaned": [], "changed": []}
+        tracked_emails = set()
+
+        for team_name, accounts in teams.items():
+            for account in accounts:
+                email = account.get("email")
+                if not email:
+                    continue
+                target_email = email.lower()
+                tracked_emails.add(target_email)
+
+                exists = target_email in inventory
+                account_id = inventory.get(target_email)
+                entry = {"team": team_name, "email": email, "account_id": account_id}
+                result["stored" if exists else "missing"].append(entry)
+
+                storage_status = account.get("storage_status")
+                current = (
+                    storage_status.get(provider_key)
+                    if isinstance(storage_status, dict)
+                    else None
+                ) or {}
+                new_status = "stored" if exists else "not_stored"
+                if current.get("status") == new_status and (
+                    not exists or current.get("account_id") == account_id
+                ):
+                    continue
+
+                result["changed"].append(
+                    {**entry, "old": current.get("status"), "new": new_status}
+                )
+                status_data = {"exists": exists, "last_check": last_check}
+                if exists:
+                    status_data["account_id"] = account_id
+                pending.append((team_name, email, provider_key, status_data))
+
+        result["orphaned"] = sorted(
+            email for email in inventory if email not in tracked_emails
+        )
+        report[provider_key] = result
 
-        if "account_id" in status_data:
-            provider_status["account_id"] = status_data.get("account_id")
-        if "last_check" in status_data:
-            provider_status["last_check"] = status_data.get("last_check")
+    if apply and pending:
+        with get_tracker_store().batch():
+            for team_name, email, provider_key, status_data in pending:
+                update_storage_status(tracker, team_name, email, provider_key, status_data)
 
-        account["updated_at"] = _now_str()
-        log.info(
-            "入库状态更新完成: "
-            f"team={team_name}, email={email}, provider={provider_key}, "
-            f"status={provider_status.get('status')}"
-        )
-        return
+    return report
@@ -0,0 +1,111 @@
+# ==================== Team 配置存储模块 ====================
+# team.json 的增量持久化: 只写入发生变化的 Team 字段，文件锁 + 原子替换
+
+"""Team Store - team.json 持久化
+
+运行中动态获取的 account_id / token / authorized 先写入内存中的 Team 配置，
+save_teams 对比原始数据 (team["raw"]) 找出发生变化的 Team，一次性写入:
+
+    1. 获取 team.json.lock 文件锁
+    2. 重新读取磁盘上的 team.json (其他进程可能已更新了别的 Team)
+    3. 只把本进程变化的字段合并进去，合并后与磁盘内容相同则不写
+    4. 临时文件 + os.replace 原子替换
+
+两个 CLI 进程同时刷新不同 Team 的 token 时，彼此的更新不会被覆盖。
+仅新格式 (account 为邮箱字符串) 的 Team 配置会被持久化。
+
+Functions:
+    pending_changes: 计算单个 Team 相对原始数据的变化字段
+    save_teams: 合并写入所有发生变化的 Team
+"""
+
+from __future__ import annotations
+
+import json
+import os
+
+from src.core.fileio import atomic_write_json, file_lock
+from src.core.logger import log
+
+
+def pending_changes(team: dict) -> dict:
+    """计算 Team 相对 team.json 原始数据需要写入的字段
+
+    Returns:
+        dict: {字段: 新值}，无变化时为空
+    """
+    if team.get("format") != "new":
+        return {}
+
+    raw = team.get("raw", {})
+    changes = {}
+    for field in ("account_id", "access_token", "refresh_token", "token_expires_at"):
+        value = team.get(field)
+        if value and raw.get(field) != value:
+            changes[field] = value
+
+    # 旧版 token 字段与 access_token 保持一致 (仅在原始配置包含该字段时)
+    access_token = team.get("access_token")
+    if access_token and "token" in raw and raw["token"] != access_token:
+        changes["token"] = access_token
+
+    if team.get("authorized") and not raw.get("authorized"):
+        changes["authorized"] = True
+    return changes
+
+
+def _find_entry(entries: list, index: int, raw: dict) -> dict | None:
+    """在磁盘数据中定位 Team (优先同一位置，其次按 account 匹配)"""
+    account = raw.get("account")
+    if 0 <= index < len(entries):
+        entry = entries[index]
+        if isinstance(entry, dict) and entry.get("account") == account:
+            return entry
+    for entry in entries:
+        if isinstance(entry, dict) and entry.get("account") == account:
+            return entry
+    return None
+
+
+def save_teams(teams: list[dict], path) -> bool:
+    """把所有发生变化的 Team 合并写入 team.json
+
+    Returns:
+        bool: 有变化且已持久化返回 True，无变化或写入失败返回 False
+    """
+    dirty = {}
+    for index, team in enumerate(teams):
+        changes = pending_changes(team)
+        if changes:
+            dirty[index] = changes
+    if not dirty:
+        return False
+
+    path = str(path)
+    if not os.path.exists(path):
+        return False
+
+    with file_lock(path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        entries = data if isinstance(data, list) else [data]
+
+        written = False
+        saved = []
+        for index, changes in dirty.items():
+            entry = _find_entry(entries, index, teams[index].get("raw", {}))
+            if entry is None:
+                log.warning(f"team.json 中未找到 Team {teams[index].get('name')}，跳过保存")
+                continue
+            saved.append(index)
+            for field, value in changes.items():
+                if entry.get(field) != value:
+                    entry[field] = value
+                    written = True
+
+        if written:
+            atomic_write_json(path, data)
+
+    for index in saved:
+        teams[index].get("raw", {}).update(dirty[index])
+    return bool(saved)
@@ -0,0 +1,224 @@
+# ==================== 追踪记录索引模块 ====================
+# 为 team_tracker 数据提供 email / 状态索引
+
+"""Tracker - 带索引的 team_tracker 数据
+
+Tracker 是 dict 的子类，序列化格式与 team_tracker.json 完全一致；
+额外为每个 Team 维护 email → 账号记录、email → 位置 以及 状态 → 位置集合的索引，
+使按 email 查找、状态更新和未完成账号查询不再线性扫描整个 Team。
+
+索引按 Team 惰性构建；当 Team 列表被整体替换或长度变化 (调用方直接修改了列表) 时会自动重建。
+通过辅助函数修改状态后需调用 refresh_account 同步索引。
+
+索引同时维护每个 Team 的入库状态计数，aggregates() 直接由计数得出
+(邀请状态 / 各服务商入库状态)，不需要重新遍历账号。
+"""
+
+from __future__ import annotations
+
+
+def account_status(account: dict) -> str:
+    """读取邀请状态 (优先 invitation_status，回退旧 status 字段)"""
+    return account.get("invitation_status") or account.get("status", "")
+
+
+def account_storage(account: dict) -> dict[str, str]:
+    """读取各服务商入库状态 {provider: status}"""
+    storage_status = account.get("storage_status")
+    if not isinstance(storage_status, dict):
+        return {}
+    return {
+        provider: (value.get("status") or "not_stored")
+        for provider, value in storage_status.items()
+        if isinstance(value, dict)
+    }
+
+
+class _TeamIndex:
+    __slots__ = (
+        "accounts",
+        "size",
+        "by_email",
+        "positions",
+        "statuses",
+        "by_status",
+        "storage",
+        "storage_counts",
+    )
+
+    def __init__(self, accounts: list):
+        self.accounts = accounts
+        self.size = len(accounts)
+        # email → 第一条记录 (与逐条扫描时的命中一致)；状态与计数按列表位置维护，重复 email 各自计数
+        self.by_email: dict[str, dict] = {}
+        self.positions: dict[str, int] = {}
+        self.statuses: list[str] = []
+        self.by_status: dict[str, dict[int, None]] = {}
+        self.storage: list[dict[str, str]] = []
+        self.storage_counts: dict[str, dict[str, int]] = {}
+        for position, account in enumerate(accounts):
+            self._add(account, position)
+
+    def _add(self, account: dict, position: int):
+        email = account.get("email")
+        if email and email not in self.by_email:
+            self.by_email[email] = account
+            self.positions[email] = position
+        status = account_status(account)
+        self.statuses.append(status)
+        self.by_status.setdefault(status, {})[position] = None
+        self.storage.append({})
+        self._set_storage(position, account_storage(account))
+
+    def _set_status(self, position: int, status: str):
+        previous = self.statuses[position]
+        if previous == status:
+            return
+        bucket = self.by_status[previous]
+        del bucket[position]
+        if not bucket:
+            del self.by_status[previous]
+        self.statuses[position] = status
+        self.by_status.setdefault(status, {})[position] = None
+
+    def _set_storage(self, position: int, storage: dict[str, str]):
+        previous = self.storage[position]
+        if previous == storage:
+            return
+        for provider, status in previous.items():
+            counts = self.storage_counts[provider]
+            counts[status] -= 1
+            if not counts[status]:
+                del counts[status]
+        for provider, status in storage.items():
+            counts = self.storage_counts.setdefault(provider, {})
+            counts[status] = counts.get(status, 0) + 1
+        self.storage[position] = storage
+
+    def refresh(self, email: str, account: dict):
+        position = self.positions[email]
+        self._set_status(position, account_status(account))
+        self._set_storage(position, account_storage(account))
+
+    def aggregate(self) -> dict:
+        return {
+            "total": self.size,
+            "invitation": {
+                status: len(bucket) for status, bucket in self.by_status.items()
+            },
+            "storage": {
+                provider: dict(counts)
+                for provider, counts in self.storage_counts.items()
+                if counts
+            },
+        }
+
+    def append(self, account: dict):
+        self.accounts.append(account)
+        self._add(account, self.size)
+        self.size += 1
+
+    def incomplete_positions(self) -> list[int]:
+        positions = [
+            position
+            for status, bucket in self.by_status.items()
+            if status != "completed"
+            for position in bucket
+        ]
+        positions.sort()
+        return positions
+
+    def has_incomplete(self) -> bool:
+        return any(status != "completed" for status in self.by_status)
+
+
+class Tracker(dict):
+    """带 email / 状态索引的追踪记录 (dict 子类，可直接 json.dump)"""
+
+    def __init__(self, data: dict | None = None):
+        super().__init__(data or {})
+        if not isinstance(self.get("teams"), dict):
+            self["teams"] = {}
+        self._indexes: dict[str, _TeamIndex] = {}
+
+    def _team_index(self, team_name: str) -> _TeamIndex | None:
+        accounts = self["teams"].get(team_name)
+        if accounts is None:
+            self._indexes.pop(team_name, None)
+            return None
+        index = self._indexes.get(team_name)
+        if index is None or index.accounts is not accounts or index.size != len(accounts):
+            index = _TeamIndex(accounts)
+            self._indexes[team_name] = index
+        return index
+
+    def reindex(self, team_name: str | None = None):
+        """丢弃索引 (全部或指定 Team)，下次访问时重建"""
+        if team_name is None:
+            self._indexes.clear()
+        else:
+            self._indexes.pop(team_name, None)
+
+    def find_account(self, team_name: str, email: str) -> dict | None:
+        index = self._team_index(team_name)
+        if index is None:
+            return None
+        return index.by_email.get(email)
+
+    def append_account(self, team_name: str, account: dict):
+        self["teams"].setdefault(team_name, [])
+        self._team_index(team_name).append(account)
+
+    def remove_account(self, team_name: str, email: str) -> bool:
+        index = self._team_index(team_name)
+        if index is None or email not in index.by_email:
+            return False
+        # 与逐条过滤一致: 同一 email 的重复记录一并删除
+        index.accounts[:] = [account for account in index.accounts if account.get("email") != email]
+        # 删除会移动后续账号的位置，重建该 Team 的索引
+        self._indexes[team_name] = _TeamIndex(index.accounts)
+        return True
+
+    def refresh_account(self, team_name: str, account: dict):
+        """账号状态变化后同步状态索引"""
+        index = self._team_index(team_name)
+        email = account.get("email")
+        if index is None or not email:
+            return
+        if index.by_email.get(email) is not account:
+            self._indexes[team_name] = _TeamIndex(index.accounts)
+            return
+        index.refresh(email, account)
+
+    def incomplete_accounts(self, team_name: str) -> list[dict]:
+        """未完成 (非 completed) 的账号记录，按 Team 内顺序"""
+        index = self._team_index(team_name)
+        if index is None:
+            return []
+        return [index.accounts[position] for position in index.incomplete_positions()]
+
+    def teams_with_incomplete(self) -> list[str]:
+        return [
+            team_name
+            for team_name in self["teams"]
+            if (index := self._team_index(team_name)) is not None
+            and index.has_incomplete()
+        ]
+
+    def aggregates(self) -> dict:
+        """各 Team 的状态统计
+
+        Returns:
+            dict: {team: {"total": int, "invitation": {status: n}, "storage": {provider: {status: n}}}}
+        """
+        return {
+            team_name: self._team_index(team_name).aggregate()
+            for team_name in self["teams"]
+        }
+
+
+def compute_aggregates(tracker: dict) -> dict:
+    """计算追踪记录的状态统计 (Tracker 直接读索引，普通 dict 临时建索引)"""
+    if not isinstance(tracker, Tracker):
+        tracker = Tracker(tracker)
+    return tracker.aggregates()
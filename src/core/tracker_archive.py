@@ -0,0 +1,227 @@
+# ==================== 追踪记录归档模块 ====================
+# 将早已完成的账号移出 team_tracker，写入按月分区的 gzip JSONL 冷归档
+
+"""Tracker Archive - 追踪记录压缩与冷归档
+
+completed 状态且 updated_at (缺失时用 created_at) 早于 N 天的成员账号会从追踪记录中移出，
+追加写入 <archive_dir>/tracker-YYYY-MM.jsonl.gz (按账号最后更新月份分区，每行一条:
+{"team", "archived_at", "account"})。gzip 以追加方式写入新的 member，归档文件只增不改。
+
+<archive_dir>/index.json 记录 email → 分区文件，按 email 查找时只解压相关分区。
+Team Owner 账号不归档 (add_team_owners_to_tracker 按是否存在于追踪记录判断是否需要重新处理)。
+
+先写归档、再写追踪记录: 中途崩溃最多导致记录同时存在于两边 (查找时以追踪记录为准)，不会丢失；
+重新归档时按 (team, email) 跳过分区中已有的记录，不会重复写入。
+
+追踪记录顶层的 archived_counts 记录每个 Team 已归档的成员数，
+workflow 判断 Team 是否已满员时把它计入成员数 / 完成数。
+
+Functions:
+    select_archivable: 选出可归档的账号
+    compact_tracker: 归档并从追踪记录中移除
+    find_archived_accounts: 按 email 查找归档记录
+    archived_count: 获取 Team 已归档的成员数
+    iter_archive: 遍历全部归档记录
+"""
+
+from __future__ import annotations
+
+import gzip
+import json
+import os
+from datetime import datetime, timedelta
+
+from src.core.config import TRACKER_ARCHIVE_DIR
+from src.core.fileio import atomic_write_json
+from src.core.tracker import Tracker, account_status
+
+_TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+INDEX_FILE = "index.json"
+ARCHIVED_COUNTS_KEY = "archived_counts"
+
+
+def archived_count(tracker: dict, team_name: str) -> int:
+    """Team 已归档 (已从追踪记录移出) 的成员数"""
+    counts = tracker.get(ARCHIVED_COUNTS_KEY)
+    if not isinstance(counts, dict):
+        return 0
+    return int(counts.get(team_name) or 0)
+
+
+def _account_time(account: dict) -> datetime | None:
+    for field in ("updated_at", "created_at"):
+        value = account.get(field)
+        if not value:
+            continue
+        try:
+            return datetime.strptime(value, _TIME_FORMAT)
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def _partition_file(archive_dir: str, when: datetime) -> str:
+    return os.path.join(archive_dir, f"tracker-{when:%Y-%m}.jsonl.gz")
+
+
+def _load_index(archive_dir: str) -> dict[str, list[str]]:
+    path = os.path.join(archive_dir, INDEX_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def select_archivable(
+    tracker: dict, older_than_days: int, now: datetime | None = None
+) -> list[tuple[str, dict]]:
+    """选出可归档的账号 (completed、非 Owner、最后更新早于 older_than_days 天)
+
+    Returns:
+        list: [(team_name, account)]
+    """
+    cutoff = (now or datetime.now()) - timedelta(days=older_than_days)
+    selected = []
+    for team_name, accounts in tracker.get("teams", {}).items():
+        for account in accounts:
+            if account_status(account) != "completed":
+                continue
+            if account.get("role") == "owner":
+                continue
+            updated = _account_time(account)
+            if updated is not None and updated < cutoff:
+                selected.append((team_name, account))
+    return selected
+
+
+def _append_to_archive(
+    records: list[tuple[str, dict]], archive_dir: str
+) -> dict[str, int]:
+    """按分区追加写入归档并更新 email 索引
+
+    分区中已存在的 (team, email) 不再写入 (上次归档后、保存追踪记录前中断的情况)。
+
+    Returns:
+        dict: {分区文件名: 写入条数}
+    """
+    os.makedirs(archive_dir, exist_ok=True)
+    archived_at = datetime.now().strftime(_TIME_FORMAT)
+
+    partitions: dict[str, list[str]] = {}
+    index = _load_index(archive_dir)
+    existing: dict[str, set[tuple[str, str]]] = {}
+    for team_name, account in records:
+        path = _partition_file(archive_dir, _account_time(account))
+        name = os.path.basename(path)
+        email = account["email"].lower()
+        if name in index.get(email, []):
+            if path not in existing:
+                existing[path] = _partition_keys(path)
+            if (team_name, email) in existing[path]:
+                continue
+        line = json.dumps(
+            {"team": team_name, "archived_at": archived_at, "account": account},
+            ensure_ascii=False,
+        )
+        partitions.setdefault(path, []).append(line)
+
+        files = index.setdefault(email, [])
+        if name not in files:
+            files.append(name)
+
+    for path, lines in partitions.items():
+        # 追加一个新的 gzip member，已有内容不变
+        with gzip.open(path, "at", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+    atomic_write_json(os.path.join(archive_dir, INDEX_FILE), index, indent=None)
+    return {os.path.basename(path): len(lines) for path, lines in partitions.items()}
+
+
+def compact_tracker(
+    tracker: dict,
+    older_than_days: int,
+    archive_dir: str | None = None,
+    now: datetime | None = None,
+    dry_run: bool = False,
+) -> dict:
+    """归档早已完成的账号并从追踪记录中移除 (只修改内存中的 tracker，由调用方保存)
+
+    Returns:
+        dict: {"archived": int, "teams": {team: n}, "partitions": {文件名: n}}
+    """
+    archive_dir = archive_dir or TRACKER_ARCHIVE_DIR
+    records = select_archivable(tracker, older_than_days, now)
+    teams: dict[str, int] = {}
+    for team_name, _ in records:
+        teams[team_name] = teams.get(team_name, 0) + 1
+
+    report = {"archived": len(records), "teams": teams, "partitions": {}}
+    if dry_run or not records:
+        return report
+
+    report["partitions"] = _append_to_archive(records, archive_dir)
+
+    archived_ids = {id(account) for _, account in records}
+    counts = tracker.get(ARCHIVED_COUNTS_KEY)
+    if not isinstance(counts, dict):
+        counts = tracker[ARCHIVED_COUNTS_KEY] = {}
+    for team_name in teams:
+        counts[team_name] = archived_count(tracker, team_name) + teams[team_name]
+        tracker["teams"][team_name] = [
+            account
+            for account in tracker["teams"][team_name]
+            if id(account) not in archived_ids
+        ]
+        if isinstance(tracker, Tracker):
+            tracker.reindex(team_name)
+    return report
+
+
+def _read_partition(path: str):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _partition_keys(path: str) -> set[tuple[str, str]]:
+    if not os.path.exists(path):
+        return set()
+    return {
+        (record.get("team"), record.get("account", {}).get("email", "").lower())
+        for record in _read_partition(path)
+    }
+
+
+def iter_archive(archive_dir: str | None = None):
+    """按分区时间顺序遍历全部归档记录"""
+    archive_dir = archive_dir or TRACKER_ARCHIVE_DIR
+    if not os.path.isdir(archive_dir):
+        return
+    for name in sorted(os.listdir(archive_dir)):
+        if name.startswith("tracker-") and name.endswith(".jsonl.gz"):
+            yield from _read_partition(os.path.join(archive_dir, name))
+
+
+def find_archived_accounts(email: str, archive_dir: str | None = None) -> list[dict]:
+    """按 email 查找归档记录 (通过索引只读取相关分区)
+
+    Returns:
+        list[dict]: [{"team", "archived_at", "account"}]，按归档顺序
+    """
+    archive_dir = archive_dir or TRACKER_ARCHIVE_DIR
+    target = (email or "").strip().lower()
+    files = _load_index(archive_dir).get(target, [])
+    results = []
+    for name in sorted(files):
+        path = os.path.join(archive_dir, name)
+        if not os.path.exists(path):
+            continue
+        results.extend(
+            record
+            for record in _read_partition(path)
+            if record.get("account", {}).get("email", "").lower() == target
+        )
+    return results
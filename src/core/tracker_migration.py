@@ -0,0 +1,178 @@
+# ==================== 追踪记录迁移模块 ====================
+# team_tracker 数据格式迁移 (load_team_tracker 与 scripts/migrate_tracker.py 共用)
+
+"""Tracker Migration - team_tracker 数据格式迁移
+
+追踪记录顶层带 schema_version 字段。版本低于 SCHEMA_VERSION 时才逐条迁移账号记录，
+迁移完成后写入新的版本号；之后加载直接跳过逐条检查。
+
+版本历史:
+    0: 旧格式 (status 字段，没有 storage_status)
+    1: invitation_status + storage_status (crs / cpa / s2a)
+
+Functions:
+    init_storage_status: 初始化入库状态结构
+    schema_version: 读取追踪记录的 schema 版本
+    needs_migration: 判断追踪记录是否需要迁移
+    migrate_account: 原地迁移单个账号记录
+    migrate_tracker: 原地迁移整个追踪记录并写入 schema_version
+    validate_tracker: 校验追踪记录是否符合当前格式
+"""
+
+from __future__ import annotations
+
+SCHEMA_VERSION = 1
+
+PROVIDERS = ("crs", "cpa", "s2a")
+
+MIGRATION_COUNTERS = (
+    "status_migrated",
+    "status_initialized",
+    "storage_added",
+    "storage_fixed",
+)
+
+
+def init_storage_status() -> dict:
+    """初始化入库状态结构"""
+    return {provider: {"status": "not_stored"} for provider in PROVIDERS}
+
+
+def schema_version(tracker: dict) -> int:
+    """追踪记录的 schema 版本 (没有该字段视为 0)"""
+    version = tracker.get("schema_version", 0)
+    return version if isinstance(version, int) else 0
+
+
+def needs_migration(tracker: dict) -> bool:
+    return schema_version(tracker) < SCHEMA_VERSION
+
+
+def _normalize_storage_status(storage_status: dict) -> bool:
+    changed = False
+    for provider in PROVIDERS:
+        entry = storage_status.get(provider)
+        if not isinstance(entry, dict):
+            storage_status[provider] = {"status": "not_stored"}
+            changed = True
+        elif not entry.get("status"):
+            entry["status"] = "not_stored"
+            changed = True
+    return changed
+
+
+def migrate_account(account: dict) -> dict:
+    """原地迁移单个账号记录
+
+    字段映射:
+        status → invitation_status (两者都存在时丢弃 status)
+        (缺失) invitation_status → ""
+        (缺失/不完整) storage_status → 补齐 crs / cpa / s2a
+
+    Returns:
+        dict: 各项变更计数 {"status_migrated", "status_initialized", "storage_added", "storage_fixed"}
+    """
+    report = dict.fromkeys(MIGRATION_COUNTERS, 0)
+
+    if "status" in account:
+        status = account.pop("status")
+        account.setdefault("invitation_status", status)
+        report["status_migrated"] += 1
+
+    if "invitation_status" not in account:
+        account["invitation_status"] = ""
+        report["status_initialized"] += 1
+
+    storage_status = account.get("storage_status")
+    if "storage_status" not in account:
+        account["storage_status"] = init_storage_status()
+        report["storage_added"] += 1
+    elif not isinstance(storage_status, dict):
+        account["storage_status"] = init_storage_status()
+        report["storage_fixed"] += 1
+    elif _normalize_storage_status(storage_status):
+        report["storage_fixed"] += 1
+
+    return report
+
+
+def migrate_tracker(tracker: dict) -> tuple[dict, dict]:
+    """原地迁移整个追踪记录，并写入当前 schema_version
+
+    非列表的 Team 账号列表置为空列表，非字典的账号记录会被丢弃。
+
+    Returns:
+        tuple: (统计 {"teams", "accounts", ...变更计数}, 每个 Team 变更的记录数 {team: n})
+    """
+    totals = {"teams": 0, "accounts": 0, **dict.fromkeys(MIGRATION_COUNTERS, 0)}
+    per_team_changes: dict[str, int] = {}
+
+    teams = tracker.get("teams")
+    if not isinstance(teams, dict):
+        teams = tracker["teams"] = {}
+
+    totals["teams"] = len(teams)
+    for team_name, accounts in teams.items():
+        if not isinstance(accounts, list):
+            teams[team_name] = []
+            continue
+        if not all(isinstance(account, dict) for account in accounts):
+            accounts[:] = [account for account in accounts if isinstance(account, dict)]
+
+        team_changed = 0
+        for account in accounts:
+            totals["accounts"] += 1
+            report = migrate_account(account)
+            if any(report.values()):
+                team_changed += 1
+            for key in MIGRATION_COUNTERS:
+                totals[key] += report[key]
+        if team_changed:
+            per_team_changes[team_name] = team_changed
+
+    tracker["schema_version"] = SCHEMA_VERSION
+    return totals, per_team_changes
+
+
+def validate_tracker(tracker: dict) -> list[str]:
+    """校验追踪记录是否符合当前格式
+
+    Returns:
+        list[str]: 错误信息 (空列表表示通过)
+    """
+    errors: list[str] = []
+    teams = tracker.get("teams")
+    if not isinstance(teams, dict):
+        errors.append("teams 字段不是字典")
+        return errors
+
+    if schema_version(tracker) != SCHEMA_VERSION:
+        errors.append(f"schema_version 不是 {SCHEMA_VERSION}")
+
+    for team_name, accounts in teams.items():
+        if not isinstance(accounts, list):
+            errors.append(f"团队 {team_name} 的账号列表不是列表")
+            continue
+        for account in accounts:
+            if not isinstance(account, dict):
+                errors.append(f"团队 {team_name} 存在非字典账号记录")
+                continue
+            if "status" in account:
+                errors.append(f"团队 {team_name} 仍包含 status 字段")
+            if "invitation_status" not in account:
+                errors.append(f"团队 {team_name} 缺少 invitation_status 字段")
+            storage_status = account.get("storage_status")
+            if not isinstance(storage_status, dict):
+                errors.append(f"团队 {team_name} storage_status 非字典")
+                continue
+            for provider in PROVIDERS:
+                entry = storage_status.get(provider)
+                if not isinstance(entry, dict):
+                    errors.append(f"团队 {team_name} storage_status 缺少 {provider}")
+                    continue
+                if not entry.get("status"):
+                    errors.append(
+                        f"团队 {team_name} storage_status.{provider}.status 为空"
+                    )
+
+    return errors
@@ -0,0 +1,518 @@
+# ==================== 追踪记录存储模块 ====================
+# team_tracker 的持久化后端: JSON 整文件 / SQLite 按账号行存储
+
+"""Tracker Store - team_tracker 持久化后端
+
+Classes:
+    JsonTrackerStore: 整文件 JSON 存储 (原子替换 + 文件锁，可选 write-behind 日志)
+    SqliteTrackerStore: SQLite (WAL) 存储，按 (team, email) 单行 upsert
+
+Functions:
+    get_tracker_store: 根据配置获取当前存储后端
+    reset_tracker_store: 关闭并重置当前存储后端 (测试/切换配置时使用)
+    write_tracker_stats: 写入状态统计缓存 (team_tracker.stats.json)
+    read_tracker_stats: 读取未过期的状态统计缓存
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from src.core.fileio import atomic_write_json, import_filelock, locked_atomic_write_json
+from src.core.logger import log
+
+
+def _empty_tracker() -> dict:
+    return {"teams": {}, "last_updated": None}
+
+
+def _read_json_file(file_path: str) -> dict | None:
+    if not os.path.exists(file_path):
+        return None
+    with open(file_path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _stat_key(file_path: str) -> list | None:
+    try:
+        st = os.stat(file_path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def stats_path_for(file_path: str) -> str:
+    """统计缓存文件路径: team_tracker.json -> team_tracker.stats.json"""
+    base, _ = os.path.splitext(str(file_path))
+    return f"{base}.stats.json"
+
+
+class JsonTrackerStore:
+    """整文件 JSON 存储
+
+    immediate 模式: 每次 save 都完整重写 team_tracker.json。
+    write_behind 模式: 每个账号变更追加到 team_tracker.json.journal (fsync)，
+    save 不再重写整文件；只在 checkpoint (账号/Team 边界、退出时) 写完整快照并清空日志。
+    加载时在快照之上重放日志，崩溃不会丢失已登记的变更。
+    """
+
+    backend = "json"
+
+    def __init__(self, path: str, write_behind: bool = False):
+        self.path = str(path)
+        self.journal_path = f"{self.path}.journal"
+        self.stats_path = stats_path_for(self.path)
+        self.write_behind = write_behind
+        self._lock = threading.RLock()
+        self._journal_file = None
+        self._journal_entries = 0
+        self._journal_batch: list[str] | None = None
+        self._dirty = False
+
+    def load(self) -> dict | None:
+        """读取追踪记录 (快照 + 重放 write-behind 日志)，文件不存在时返回 None"""
+        tracker = _read_json_file(self.path)
+        entries = self._read_journal()
+        if not entries:
+            return tracker
+
+        tracker = tracker if tracker is not None else _empty_tracker()
+        teams = tracker.setdefault("teams", {})
+        for entry in entries:
+            team_name = entry.get("team")
+            op = entry.get("op")
+            if op == "upsert":
+                account = entry.get("account") or {}
+                accounts = teams.setdefault(team_name, [])
+                for i, existing in enumerate(accounts):
+                    if existing.get("email") == account.get("email"):
+                        accounts[i] = account
+                        break
+                else:
+                    accounts.append(account)
+            elif op == "remove" and team_name in teams:
+                teams[team_name] = [
+                    acc for acc in teams[team_name] if acc.get("email") != entry.get("email")
+                ]
+        # 下一次 checkpoint 会把重放的变更合并进快照
+        self._journal_entries = len(entries)
+        log.info(f"已重放 {len(entries)} 条追踪记录日志", icon="sync")
+        return tracker
+
+    def fingerprint(self) -> list:
+        """数据文件指纹 (快照与日志的 mtime/size)，用于判断统计缓存是否过期"""
+        return [self.backend, _stat_key(self.path), _stat_key(self.journal_path)]
+
+    def _read_journal(self) -> list[dict]:
+        if not os.path.exists(self.journal_path):
+            return []
+        entries = []
+        with open(self.journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entries.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 崩溃时最后一行可能写了一半，忽略
+                    log.warning("追踪记录日志存在不完整的行，已忽略")
+        return entries
+
+    def _append_journal(self, entry: dict):
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+        with self._lock:
+            if self._journal_batch is not None:
+                self._journal_batch.append(line)
+                return
+            self._write_journal([line])
+
+    def _write_journal(self, lines: list[str]):
+        try:
+            if self._journal_file is None:
+                self._journal_file = open(self.journal_path, "a", encoding="utf-8")
+            self._journal_file.write("".join(lines))
+            self._journal_file.flush()
+            os.fsync(self._journal_file.fileno())
+            self._journal_entries += len(lines)
+        except Exception as e:
+            log.warning(f"写入追踪记录日志失败: {e}")
+
+    @contextmanager
+    def batch(self):
+        """批量变更: write_behind 模式下期间的日志合并为一次写入 + fsync"""
+        with self._lock:
+            if self._journal_batch is not None:
+                yield
+                return
+            self._journal_batch = []
+            try:
+                yield
+            finally:
+                lines, self._journal_batch = self._journal_batch, None
+                if lines:
+                    self._write_journal(lines)
+
+    def _truncate_journal(self):
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+            if os.path.exists(self.journal_path):
+                os.remove(self.journal_path)
+            self._journal_entries = 0
+
+    def _write_snapshot(self, tracker: dict) -> bool:
+        try:
+            locked_atomic_write_json(self.path, tracker)
+            return True
+        except Exception as e:
+            _, Timeout = import_filelock()
+            if Timeout is not None and isinstance(e, Timeout):
+                log.warning("保存追踪记录失败: 获取文件锁超时")
+            else:
+                log.warning(f"保存追踪记录失败: {e}")
+            return False
+
+    def save(self, tracker: dict) -> bool:
+        """写入整文件快照 (write_behind 模式下不写，返回是否实际写入)"""
+        if self.write_behind:
+            # 变更已逐条写入日志，整文件快照延迟到 checkpoint
+            return False
+        if self._write_snapshot(tracker):
+            self._dirty = False
+            return True
+        return False
+
+    def checkpoint(self, tracker: dict):
+        """写入完整快照 (write_behind 模式下同时清空日志)"""
+        with self._lock:
+            if self.write_behind:
+                if not self._journal_entries and not self._dirty:
+                    return
+                if self._write_snapshot(tracker):
+                    self._truncate_journal()
+                    self._dirty = False
+            elif self._dirty:
+                self.save(tracker)
+
+    def import_tracker(self, tracker: dict):
+        """用完整的 tracker 数据替换当前内容 (同时丢弃未合并的日志)"""
+        with self._lock:
+            locked_atomic_write_json(self.path, tracker)
+            self._truncate_journal()
+            self._dirty = False
+
+    def record_account(self, team_name: str, account: dict):
+        """单账号变更 (write_behind 模式追加日志，否则在 save 时统一落盘)"""
+        self._dirty = True
+        if self.write_behind:
+            self._append_journal({"op": "upsert", "team": team_name, "account": account})
+
+    def remove_account(self, team_name: str, email: str):
+        """单账号移除 (write_behind 模式追加日志，否则在 save 时统一落盘)"""
+        self._dirty = True
+        if self.write_behind:
+            self._append_journal({"op": "remove", "team": team_name, "email": email})
+
+    def close(self):
+        with self._lock:
+            if self._journal_file is not None:
+                self._journal_file.close()
+                self._journal_file = None
+
+
+class SqliteTrackerStore:
+    """SQLite 存储: 每个账号一行，主键 (team, email)，WAL 模式
+
+    账号记录以 JSON 文本存储在 data 列，保持与 team_tracker.json 相同的字段；
+    行的插入顺序 (rowid) 即 Team 内账号顺序。顶层字段 (last_updated 等) 存于 meta 表。
+    revision 表记录写入次数 (触发器维护)，作为跨进程一致的数据指纹。
+    """
+
+    backend = "sqlite"
+
+    _SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS accounts (
+            team TEXT NOT NULL,
+            email TEXT NOT NULL,
+            data TEXT NOT NULL,
+            UNIQUE (team, email)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS meta (
+            key TEXT PRIMARY KEY,
+            value TEXT
+        )
+        """,
+        # 写入计数: accounts / meta 的每次写入由触发器递增，用作统计缓存指纹
+        """
+        CREATE TABLE IF NOT EXISTS revision (
+            id INTEGER PRIMARY KEY CHECK (id = 0),
+            value INTEGER NOT NULL
+        )
+        """,
+        "INSERT OR IGNORE INTO revision (id, value) VALUES (0, 0)",
+        *(
+            f"""
+            CREATE TRIGGER IF NOT EXISTS {table}_{event.lower()}_revision
+            AFTER {event} ON {table}
+            BEGIN
+                UPDATE revision SET value = value + 1 WHERE id = 0;
+            END
+            """
+            for table in ("accounts", "meta")
+            for event in ("INSERT", "UPDATE", "DELETE")
+        ),
+    )
+
+    def __init__(self, db_path: str, json_path: str | None = None):
+        self.db_path = str(db_path)
+        self.json_path = str(json_path) if json_path else None
+        self.stats_path = stats_path_for(self.db_path)
+        self._lock = threading.RLock()
+        self._in_batch = False
+        self._conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False, timeout=10
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in self._SCHEMA:
+            self._conn.execute(statement)
+
+    # ---------- 读取 ----------
+    def fingerprint(self) -> list:
+        """数据库写入计数，用于判断统计缓存是否过期
+
+        不使用 -wal 文件的 mtime: 其他进程仅打开连接也会修改它，导致缓存永远不命中。
+        """
+        try:
+            inode = os.stat(self.db_path).st_ino
+        except OSError:
+            inode = None
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM revision WHERE id = 0").fetchone()
+        return [self.backend, inode, row[0] if row else None]
+
+    def _is_empty(self) -> bool:
+        row = self._conn.execute("SELECT 1 FROM accounts LIMIT 1").fetchone()
+        meta = self._conn.execute("SELECT 1 FROM meta LIMIT 1").fetchone()
+        return row is None and meta is None
+
+    def load(self) -> dict | None:
+        """读取追踪记录
+
+        数据库为空且存在 team_tracker.json 时，自动导入 JSON (一次性迁移)。
+        """
+        with self._lock:
+            if self._is_empty():
+                if self.json_path and os.path.exists(self.json_path):
+                    data = _read_json_file(self.json_path)
+                    if data is not None:
+                        self.import_tracker(data)
+                        log.info(
+                            f"已从 {self.json_path} 导入追踪记录到 SQLite", icon="sync"
+                        )
+                        return data
+                return None
+
+            tracker: dict = {}
+            for key, value in self._conn.execute("SELECT key, value FROM meta"):
+                tracker[key] = json.loads(value)
+            teams: dict = {}
+            for team, data in self._conn.execute(
+                "SELECT team, data FROM accounts ORDER BY rowid"
+            ):
+                teams.setdefault(team, []).append(json.loads(data))
+            # 保留没有账号的 Team
+            for team in tracker.pop("empty_teams", []) or []:
+                teams.setdefault(team, [])
+            tracker["teams"] = teams
+            return tracker
+
+    # ---------- 写入 ----------
+    def _write_meta(self, tracker: dict):
+        """写入顶层字段，并删除 tracker 中已不存在的字段 (调用方负责事务)"""
+        rows = [
+            (key, json.dumps(value, ensure_ascii=False))
+            for key, value in tracker.items()
+            if key != "teams"
+        ]
+        empty_teams = [
+            name for name, accounts in (tracker.get("teams") or {}).items() if not accounts
+        ]
+        rows.append(("empty_teams", json.dumps(empty_teams, ensure_ascii=False)))
+        self._conn.executemany(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            rows,
+        )
+        keys = [key for key, _ in rows]
+        self._conn.execute(
+            f"DELETE FROM meta WHERE key NOT IN ({', '.join('?' * len(keys))})", keys
+        )
+
+    def save(self, tracker: dict) -> bool:
+        """保存顶层字段 (账号行已在变更时逐行 upsert)，返回是否写入成功"""
+        try:
+            with self.batch():
+                self._write_meta(tracker)
+            return True
+        except Exception as e:
+            log.warning(f"保存追踪记录失败: {e}")
+            return False
+
+    def checkpoint(self, tracker: dict):
+        """保存顶层字段并将 WAL 合并回主数据库"""
+        self.save(tracker)
+        try:
+            with self._lock:
+                self._conn.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        except Exception as e:
+            log.warning(f"SQLite checkpoint 失败: {e}")
+
+    @contextmanager
+    def batch(self):
+        """批量变更: 期间的 upsert / delete 在同一个事务中提交"""
+        with self._lock:
+            if self._in_batch:
+                yield
+                return
+            self._conn.execute("BEGIN IMMEDIATE")
+            self._in_batch = True
+            try:
+                yield
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            else:
+                self._conn.execute("COMMIT")
+            finally:
+                self._in_batch = False
+
+    def record_account(self, team_name: str, account: dict):
+        """单行 upsert 账号记录"""
+        email = account.get("email")
+        if not email:
+            return
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "INSERT INTO accounts (team, email, data) VALUES (?, ?, ?) "
+                    "ON CONFLICT(team, email) DO UPDATE SET data = excluded.data",
+                    (team_name, email, json.dumps(account, ensure_ascii=False)),
+                )
+        except Exception as e:
+            log.warning(f"写入追踪记录失败 ({team_name}/{email}): {e}")
+
+    def remove_account(self, team_name: str, email: str):
+        """删除单行账号记录"""
+        try:
+            with self._lock:
+                self._conn.execute(
+                    "DELETE FROM accounts WHERE team = ? AND email = ?",
+                    (team_name, email),
+                )
+        except Exception as e:
+            log.warning(f"删除追踪记录失败 ({team_name}/{email}): {e}")
+
+    def import_tracker(self, tracker: dict):
+        """用完整的 tracker 数据替换数据库内容 (单事务)"""
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.execute("DELETE FROM accounts")
+                self._conn.execute("DELETE FROM meta")
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO accounts (team, email, data) VALUES (?, ?, ?)",
+                    (
+                        (team_name, account["email"], json.dumps(account, ensure_ascii=False))
+                        for team_name, accounts in (tracker.get("teams") or {}).items()
+                        for account in accounts
+                        if isinstance(account, dict) and account.get("email")
+                    ),
+                )
+                self._write_meta(tracker)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def export_tracker(self, file_path: str) -> int:
+        """导出为 team_tracker.json 格式，返回导出的账号数量"""
+        tracker = self.load() or _empty_tracker()
+        locked_atomic_write_json(file_path, tracker)
+        return sum(len(accounts) for accounts in tracker["teams"].values())
+
+    def close(self):
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+
+
+# ==================== 状态统计缓存 ====================
+def write_tracker_stats(store, stats: dict):
+    """写入状态统计缓存 (附带数据文件指纹，需在 tracker 落盘之后调用)"""
+    payload = dict(stats)
+    payload["fingerprint"] = store.fingerprint()
+    atomic_write_json(store.stats_path, payload, indent=None, durable=False)
+
+
+def read_tracker_stats(store) -> dict | None:
+    """读取状态统计缓存；缓存缺失或数据文件已变化时返回 None"""
+    try:
+        stats = _read_json_file(store.stats_path)
+    except (OSError, ValueError):
+        return None
+    if not stats or stats.get("fingerprint") != store.fingerprint():
+        return None
+    return stats
+
+
+_store = None
+
+
+def get_tracker_store():
+    """根据 [files].tracker_backend 获取 (并缓存) 存储后端"""
+    global _store
+    if _store is not None:
+        return _store
+
+    from src.core.config import (
+        TEAM_TRACKER_FILE,
+        TRACKER_BACKEND,
+        TRACKER_DB_FILE,
+        TRACKER_WRITE_MODE,
+    )
+
+    backend = (TRACKER_BACKEND or "json").strip().lower()
+    if backend == "sqlite":
+        try:
+            _store = SqliteTrackerStore(TRACKER_DB_FILE, json_path=TEAM_TRACKER_FILE)
+            return _store
+        except Exception as e:
+            log.warning(f"初始化 SQLite 追踪存储失败，回退到 JSON: {e}")
+    elif backend != "json":
+        log.warning(f"未知的 tracker_backend: {TRACKER_BACKEND}，使用 JSON")
+
+    write_mode = (TRACKER_WRITE_MODE or "immediate").strip().lower()
+    if write_mode not in ("immediate", "write_behind"):
+        log.warning(f"未知的 tracker_write_mode: {TRACKER_WRITE_MODE}，使用 immediate")
+    _store = JsonTrackerStore(TEAM_TRACKER_FILE, write_behind=write_mode == "write_behind")
+    return _store
+
+
+def reset_tracker_store(store=None):
+    """关闭当前存储后端，并可选地替换为指定实例"""
+    global _store
+    if _store is not None and _store is not store:
+        _store.close()
+    _store = store
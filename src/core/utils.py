@@ -1,21 +1,22 @@
 # ==================== 工具函数模块 ====================
 # 通用工具函数: CSV 记录、JSON 追踪等
 
-import os
-import csv
-import json
 import time
-import tempfile
 from datetime import datetime
 
-from src.core.config import CSV_FILE, TEAM_TRACKER_FILE
+from src.core.csv_appender import get_csv_appender
+from src.core.events import emit_event
 from src.core.logger import log
-
-try:
-    from filelock import FileLock, Timeout
-except Exception:  # pragma: no cover - 兼容无 filelock 环境
-    FileLock = None
-    Timeout = None
+from src.core.metrics import update_tracker_metrics
+from src.core.profiler import end_span, start_span
+from src.core.tracker import Tracker, account_status, compute_aggregates
+from src.core.tracker_migration import (
+    SCHEMA_VERSION,
+    init_storage_status,
+    migrate_tracker,
+    needs_migration,
+)
+from src.core.tracker_store import get_tracker_store, write_tracker_stats
 
 
 def save_to_csv(
@@ -27,6 +28,9 @@ def save_to_csv(
 ):
     """保存账号信息到 CSV 文件
 
+    通过全局 CsvAppender 追加 (文件句柄在整个运行期间保持打开)，
+    调用方在账号边界调用 flush_csv() 落盘。
+
     Args:
         email: 邮箱地址
         password: 密码
@@ -34,142 +38,126 @@ def save_to_csv(
         status: 状态 (success/failed)
         crs_id: CRS 账号 ID
     """
-    file_exists = os.path.exists(CSV_FILE)
+    get_csv_appender().append(
+        [
+            email,
+            password,
+            team_name,
+            status,
+            crs_id,
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        ]
+    )
 
-    with open(CSV_FILE, "a", newline="", encoding="utf-8") as f:
-        writer = csv.writer(f)
 
-        if not file_exists:
-            writer.writerow(
-                ["email", "password", "team", "status", "crs_id", "timestamp"]
-            )
+def load_team_tracker() -> Tracker:
+    """加载 Team 追踪记录 (支持新旧格式自动转换)
 
-        writer.writerow(
-            [
-                email,
-                password,
-                team_name,
-                status,
-                crs_id,
-                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            ]
-        )
+    只有 schema_version 低于当前版本时才逐条迁移账号记录，迁移结果立即写回存储，
+    之后的加载直接跳过迁移。
 
-    log.info(f"保存到 {CSV_FILE}", icon="save")
+    Returns:
+        Tracker: {"teams": {"team_name": [{"email": "...", "invitation_status": "...", "storage_status": {...}}]}}
+            (dict 子类，附带 email / 状态索引)
+    """
+    try:
+        store = get_tracker_store()
+        tracker = store.load()
+        if tracker is not None:
+            if needs_migration(tracker):
+                _migrate_and_persist(store, tracker)
+            return Tracker(tracker)
+    except Exception as e:
+        log.warning(f"加载追踪记录失败: {e}")
 
+    return Tracker({"teams": {}, "last_updated": None, "schema_version": SCHEMA_VERSION})
 
-def _migrate_account_record(account: dict) -> dict:
-    """迁移单个账号记录到新格式 (向后兼容)
 
-    字段映射:
-        status → invitation_status
-        (新增) storage_status
-    """
-    # 如果已经是新格式，直接返回
-    if "invitation_status" in account:
-        # 确保 storage_status 存在
-        if "storage_status" not in account:
-            account["storage_status"] = _init_storage_status()
-        return account
-
-    # 迁移 status → invitation_status
-    if "status" in account:
-        account["invitation_status"] = account.pop("status")
-
-    # 初始化 storage_status
-    if "storage_status" not in account:
-        account["storage_status"] = _init_storage_status()
-
-    return account
-
-
-def _init_storage_status() -> dict:
-    """初始化入库状态结构"""
-    return {
-        "crs": {"status": "not_stored"},
-        "cpa": {"status": "not_stored"},
-        "s2a": {"status": "not_stored"},
-    }
+def _migrate_and_persist(store, tracker: dict):
+    """迁移旧格式追踪记录并写回存储 (只在首次加载旧数据时执行)"""
+    totals, _ = migrate_tracker(tracker)
+    try:
+        store.import_tracker(tracker)
+        log.info(
+            f"追踪记录已迁移到 schema v{SCHEMA_VERSION} ({totals['accounts']} 个账号)",
+            icon="sync",
+        )
+    except Exception as e:
+        log.warning(f"保存迁移后的追踪记录失败: {e}")
 
 
-def load_team_tracker() -> dict:
-    """加载 Team 追踪记录 (支持新旧格式自动转换)
+def save_team_tracker(tracker: dict):
+    """保存 Team 追踪记录
 
-    Returns:
-        dict: {"teams": {"team_name": [{"email": "...", "invitation_status": "...", "storage_status": {...}}]}}
+    存储实际写入时才更新状态统计缓存；write_behind 模式下 save 不落盘，
+    统计延迟到 checkpoint_team_tracker (status 按指纹发现缓存过期时会重新统计)。
     """
-    if os.path.exists(TEAM_TRACKER_FILE):
-        try:
-            with open(TEAM_TRACKER_FILE, "r", encoding="utf-8") as f:
-                tracker = json.load(f)
-
-            # 自动迁移旧格式数据
-            for team_name in tracker.get("teams", {}):
-                tracker["teams"][team_name] = [
-                    _migrate_account_record(acc)
-                    for acc in tracker["teams"][team_name]
-                ]
+    tracker["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with Timer(stage="tracker_save", event=False):
+        store = get_tracker_store()
+        if store.save(tracker):
+            save_tracker_stats(tracker, store)
 
-            return tracker
-        except Exception as e:
-            log.warning(f"加载追踪记录失败: {e}")
 
-    return {"teams": {}, "last_updated": None}
+def rewrite_team_tracker(tracker: dict):
+    """用内存中的追踪记录整体替换存储内容 (批量移除账号后使用，例如归档)"""
+    tracker["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    store = get_tracker_store()
+    store.import_tracker(tracker)
+    save_tracker_stats(tracker, store)
 
 
-def save_team_tracker(tracker: dict):
-    """保存 Team 追踪记录"""
+def checkpoint_team_tracker(tracker: dict):
+    """在账号/Team 边界或退出时写入完整快照 (write-behind 模式下清空日志)"""
     tracker["last_updated"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    store = get_tracker_store()
+    store.checkpoint(tracker)
+    save_tracker_stats(tracker, store)
 
-    lock_path = f"{TEAM_TRACKER_FILE}.lock"
-    if FileLock:
-        try:
-            with FileLock(lock_path, timeout=10):
-                _atomic_write_tracker(TEAM_TRACKER_FILE, tracker)
-        except Timeout:
-            log.warning("保存追踪记录失败: 获取文件锁超时")
-        except Exception as e:
-            log.warning(f"保存追踪记录失败: {e}")
-        return
 
+def save_tracker_stats(tracker: dict, store=None):
+    """保存状态统计缓存 (status 命令直接读取，无需加载完整追踪记录)"""
+    store = store or get_tracker_store()
     try:
-        _save_tracker_with_fcntl_lock(lock_path, TEAM_TRACKER_FILE, tracker)
+        stats = {
+            "last_updated": tracker.get("last_updated"),
+            "teams": compute_aggregates(tracker),
+        }
+        # 指标导出直接使用同一份统计，不再读取追踪记录
+        update_tracker_metrics(stats)
+        write_tracker_stats(store, stats)
     except Exception as e:
-        log.warning(f"保存追踪记录失败: {e}")
+        log.warning(f"保存状态统计失败: {e}")
 
 
-def _atomic_write_tracker(file_path: str, tracker: dict):
-    """原子写入 tracker 数据"""
-    target_dir = os.path.dirname(file_path) or "."
-    base_name = os.path.basename(file_path)
-    fd, temp_path = tempfile.mkstemp(prefix=f".{base_name}.", dir=target_dir)
-    try:
-        with os.fdopen(fd, "w", encoding="utf-8") as temp_file:
-            json.dump(tracker, temp_file, ensure_ascii=False, indent=2)
-            temp_file.flush()
-            os.fsync(temp_file.fileno())
-        os.replace(temp_path, file_path)
-    except Exception:
-        try:
-            if os.path.exists(temp_path):
-                os.remove(temp_path)
-        except Exception as cleanup_error:
-            log.warning(f"清理临时文件失败: {cleanup_error}")
-        raise
-
-
-def _save_tracker_with_fcntl_lock(
-    lock_path: str, file_path: str, tracker: dict
-):
-    """使用 fcntl 锁保存 tracker (filelock 不可用时使用)"""
-    import fcntl
+def record_account_change(tracker: dict, team_name: str, account: dict):
+    """登记单个账号的变更 (行级存储后端会立即 upsert 该账号)"""
+    if isinstance(tracker, Tracker):
+        tracker.refresh_account(team_name, account)
+    get_tracker_store().record_account(team_name, account)
+
+
+def _emit_status_event(team_name: str, email: str, previous: str, status: str):
+    """邀请状态变化时记录结构化事件"""
+    if previous != status:
+        emit_event("invitation", status, team=team_name, email=email, previous=previous)
 
-    with open(lock_path, "w", encoding="utf-8") as lock_file:
-        try:
-            fcntl.flock(lock_file, fcntl.LOCK_EX)
-            _atomic_write_tracker(file_path, tracker)
-        finally:
-            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def find_account(tracker: dict, team_name: str, email: str) -> dict | None:
+    """按 email 查找账号记录 (Tracker 走索引，普通 dict 线性查找)"""
+    if isinstance(tracker, Tracker):
+        return tracker.find_account(team_name, email)
+    for account in tracker.get("teams", {}).get(team_name, []):
+        if account.get("email") == email:
+            return account
+    return None
+
+
+def _append_account(tracker: dict, team_name: str, account: dict):
+    if isinstance(tracker, Tracker):
+        tracker.append_account(team_name, account)
+    else:
+        tracker["teams"].setdefault(team_name, []).append(account)
 
 
 def add_account_to_tracker(
@@ -183,36 +171,36 @@ def add_account_to_tracker(
         email: 邮箱地址
         status: 邀请状态 (invited/registered/authorized/completed)
     """
-    if team_name not in tracker["teams"]:
-        tracker["teams"][team_name] = []
-
     # 检查是否已存在
-    for account in tracker["teams"][team_name]:
-        if account["email"] == email:
-            account["invitation_status"] = status
-            account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return
+    account = find_account(tracker, team_name, email)
+    if account is not None:
+        _emit_status_event(team_name, email, account_status(account), status)
+        account["invitation_status"] = status
+        account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        record_account_change(tracker, team_name, account)
+        return
 
     # 添加新记录 (使用新格式)
-    tracker["teams"][team_name].append(
-        {
-            "email": email,
-            "invitation_status": status,
-            "storage_status": _init_storage_status(),
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
-    )
+    account = {
+        "email": email,
+        "invitation_status": status,
+        "storage_status": init_storage_status(),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    _append_account(tracker, team_name, account)
+    record_account_change(tracker, team_name, account)
+    _emit_status_event(team_name, email, "", status)
 
 
 def update_account_status(tracker: dict, team_name: str, email: str, status: str):
     """更新账号邀请状态"""
-    if team_name in tracker["teams"]:
-        for account in tracker["teams"][team_name]:
-            if account["email"] == email:
-                account["invitation_status"] = status
-                account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                return
+    account = find_account(tracker, team_name, email)
+    if account is not None:
+        _emit_status_event(team_name, email, account_status(account), status)
+        account["invitation_status"] = status
+        account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        record_account_change(tracker, team_name, account)
 
 
 def remove_account_from_tracker(tracker: dict, team_name: str, email: str) -> bool:
@@ -226,12 +214,20 @@ def remove_account_from_tracker(tracker: dict, team_name: str, email: str) -> bo
     Returns:
         bool: 是否成功移除
     """
+    if isinstance(tracker, Tracker):
+        if tracker.remove_account(team_name, email):
+            get_tracker_store().remove_account(team_name, email)
+            return True
+        return False
+
     if team_name in tracker["teams"]:
         original_len = len(tracker["teams"][team_name])
         tracker["teams"][team_name] = [
             acc for acc in tracker["teams"][team_name] if acc["email"] != email
         ]
-        return len(tracker["teams"][team_name]) < original_len
+        if len(tracker["teams"][team_name]) < original_len:
+            get_tracker_store().remove_account(team_name, email)
+            return True
     return False
 
 
@@ -252,22 +248,25 @@ def get_incomplete_accounts(tracker: dict, team_name: str) -> list:
     Returns:
         list: [{"email": "...", "invitation_status": "...", "password": "...", "role": "..."}]
     """
-    incomplete = []
-    if team_name in tracker.get("teams", {}):
-        for account in tracker["teams"][team_name]:
-            # 支持新旧字段名
-            status = account.get("invitation_status") or account.get("status", "")
-            # 只要不是 completed 都算未完成，需要继续处理
-            if status != "completed":
-                incomplete.append(
-                    {
-                        "email": account["email"],
-                        "invitation_status": status,
-                        "password": account.get("password", ""),
-                        "role": account.get("role", "member"),
-                    }
-                )
-    return incomplete
+    if isinstance(tracker, Tracker):
+        accounts = tracker.incomplete_accounts(team_name)
+    else:
+        # 只要不是 completed 都算未完成，需要继续处理
+        accounts = [
+            account
+            for account in tracker.get("teams", {}).get(team_name, [])
+            if account_status(account) != "completed"
+        ]
+
+    return [
+        {
+            "email": account["email"],
+            "invitation_status": account_status(account),
+            "password": account.get("password", ""),
+            "role": account.get("role", "member"),
+        }
+        for account in accounts
+    ]
 
 
 def get_all_incomplete_accounts(tracker: dict) -> dict:
@@ -277,7 +276,11 @@ def get_all_incomplete_accounts(tracker: dict) -> dict:
         dict: {"team_name": [{"email": "...", "status": "..."}]}
     """
     result = {}
-    for team_name in tracker.get("teams", {}):
+    if isinstance(tracker, Tracker):
+        team_names = tracker.teams_with_incomplete()
+    else:
+        team_names = list(tracker.get("teams", {}))
+    for team_name in team_names:
         incomplete = get_incomplete_accounts(tracker, team_name)
         if incomplete:
             result[team_name] = incomplete
@@ -288,28 +291,29 @@ def add_account_with_password(
     tracker: dict, team_name: str, email: str, password: str, status: str = "invited"
 ):
     """添加账号到追踪记录 (带密码)"""
-    if team_name not in tracker["teams"]:
-        tracker["teams"][team_name] = []
-
     # 检查是否已存在
-    for account in tracker["teams"][team_name]:
-        if account["email"] == email:
-            account["status"] = status
-            account["password"] = password
-            account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            return
+    account = find_account(tracker, team_name, email)
+    if account is not None:
+        _emit_status_event(team_name, email, account_status(account), status)
+        account["invitation_status"] = status
+        account["password"] = password
+        account["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        record_account_change(tracker, team_name, account)
+        return
 
     # 添加新记录
-    tracker["teams"][team_name].append(
-        {
-            "email": email,
-            "password": password,
-            "status": status,
-            "role": "member",  # 角色: owner 或 member
-            "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        }
-    )
+    account = {
+        "email": email,
+        "password": password,
+        "invitation_status": status,
+        "role": "member",  # 角色: owner 或 member
+        "storage_status": init_storage_status(),
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+    }
+    _append_account(tracker, team_name, account)
+    record_account_change(tracker, team_name, account)
+    _emit_status_event(team_name, email, "", status)
 
 
 def print_summary(results: list):
@@ -370,32 +374,67 @@ def format_duration(seconds: float) -> str:
 
 
 class Timer:
-    """计时器"""
+    """计时器 / span 记录器
+
+    指定 stage 时登记一个 span: 耗时计入该阶段的耗时统计 (src.core.profiler)，
+    嵌套的 Timer 记录 parent_id；event=True 时结束时额外记录一条结构化事件。
+    outcome 默认 ok (块内抛出异常时为 error)，可在块内赋值 timer.outcome 覆盖。
+    """
 
-    def __init__(self, name: str = ""):
+    def __init__(
+        self,
+        name: str = "",
+        stage: str = "",
+        team: str = "",
+        email: str = "",
+        event: bool = True,
+    ):
         self.name = name
+        self.stage = stage
+        self.team = team
+        self.email = email
+        self.event = event
+        self.outcome = "ok"
+        self.span_id = None
+        self.parent_id = None
         self.start_time = None
         self.end_time = None
 
     def start(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        if self.stage:
+            self.span_id, self.parent_id = start_span(self.stage)
         if self.name:
             log.info(f"{self.name} 开始", icon="time")
 
     def stop(self):
         if self.start_time is None:
             return 0.0
-        self.end_time = time.time()
+        self.end_time = time.perf_counter()
         duration = self.end_time - self.start_time
         if self.name:
             log.info(f"{self.name} 完成 ({format_duration(duration)})", icon="time")
+        if self.stage:
+            end_span(self.span_id, self.stage, duration)
+            if self.event:
+                emit_event(
+                    self.stage,
+                    self.outcome,
+                    team=self.team,
+                    email=self.email,
+                    duration_ms=duration * 1000,
+                    span_id=self.span_id,
+                    parent_id=self.parent_id,
+                )
         return duration
 
     def __enter__(self):
         self.start()
         return self
 
-    def __exit__(self, *args):
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            self.outcome = "error"
         self.stop()
 
 
@@ -442,18 +481,7 @@ def add_team_owners_to_tracker(tracker: dict, password: str) -> int:
             continue
 
         # 检查是否已在 tracker 中
-        existing = False
-        if team_name in tracker.get("teams", {}):
-            for acc in tracker["teams"][team_name]:
-                if acc.get("email") == email:
-                    existing = True
-                    break
-
-        if not existing:
-            # 添加到 tracker
-            if team_name not in tracker["teams"]:
-                tracker["teams"][team_name] = []
-
+        if find_account(tracker, team_name, email) is None:
             # 根据格式和授权状态决定 tracker 状态
             # - 新格式且已授权: 状态为 completed (跳过)
             # - 新格式未授权: 状态为 registered (需要授权)
@@ -466,17 +494,18 @@ def add_team_owners_to_tracker(tracker: dict, password: str) -> int:
             else:
                 status = "team_owner"  # 旧格式，使用 OTP 登录授权
 
-            tracker["teams"][team_name].append(
-                {
-                    "email": email,
-                    "password": owner_password,
-                    "status": status,
-                    "role": "owner",
-                    "storage_status": _init_storage_status(),
-                    "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                }
-            )
+            owner_account = {
+                "email": email,
+                "password": owner_password,
+                "invitation_status": status,
+                "role": "owner",
+                "storage_status": init_storage_status(),
+                "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                "updated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            }
+            _append_account(tracker, team_name, owner_account)
+            record_account_change(tracker, team_name, owner_account)
+            _emit_status_event(team_name, email, "", status)
             log.info(
                 f"Team Owner 添加到 tracker: {email} -> {team_name} (格式: {team_format}, 状态: {status})"
             )
@@ -18,6 +18,8 @@ import atexit
 
 from src.core.config import (
     ACCOUNTS_PER_TEAM,
+    TRACKER_ARCHIVE_DAYS,
+    TRACKER_AUTO_COMPACT,
     DEFAULT_PASSWORD,
     AUTH_PROVIDER,
     add_domain_to_blacklist,
@@ -25,7 +27,9 @@ from src.core.config import (
     is_email_blacklisted,
     save_team_json,
     get_teams,
+    get_team_by_name,
     get_next_proxy,
+    update_team_index,
 )
 from src.email.service import batch_create_emails, unified_create_email
 from src.team.service import (
@@ -51,6 +55,8 @@ from src.core.utils import (
     save_to_csv,
     load_team_tracker,
     save_team_tracker,
+    checkpoint_team_tracker,
+    rewrite_team_tracker,
     add_account_with_password,
     update_account_status,
     remove_account_from_tracker,
@@ -59,8 +65,18 @@ from src.core.utils import (
     Timer,
     add_team_owners_to_tracker,
 )
+from src.core.csv_appender import flush_csv
+from src.core.events import flush_events, get_event_log
+from src.core.metrics import start_metrics, stop_metrics
 from src.core.logger import log
-from src.core.storage_manager import check_account_stored, update_storage_status
+from src.core.profiler import report_profile, reset_profile
+from src.core.status import show_status
+from src.core.tracker_archive import archived_count, compact_tracker
+from src.core.storage_manager import (
+    check_account_stored,
+    record_provider_account,
+    update_storage_status,
+)
 
 
 # ==================== 全局状态 ====================
@@ -80,7 +96,13 @@ def _save_state():
     if _tracker:
         log.info("保存状态...", icon="save")
         save_team_tracker(_tracker)
+        checkpoint_team_tracker(_tracker)
         log.success("状态已保存到 team_tracker.json")
+    # CSV / 事件缓冲 / 指标文件 / 异步日志模式在退出前写完
+    flush_csv()
+    flush_events()
+    stop_metrics()
+    log.flush()
 
 
 def _signal_handler(signum, frame):
@@ -88,6 +110,7 @@ def _signal_handler(signum, frame):
     global _shutdown_requested
     if _shutdown_requested:
         log.warning("强制退出...")
+        log.flush()
         sys.exit(1)
 
     _shutdown_requested = True
@@ -99,13 +122,22 @@ def _signal_handler(signum, frame):
         print_summary(_current_results)
 
     log.info("提示: 下次运行将自动从未完成的账号继续")
+    log.flush()
     sys.exit(0)
 
 
-# 注册信号处理器
-signal.signal(signal.SIGINT, _signal_handler)
-signal.signal(signal.SIGTERM, _signal_handler)
-atexit.register(_save_state)
+_handlers_installed = False
+
+
+def _install_signal_handlers():
+    """注册 Ctrl+C / 退出保存 (只在真正运行流程时注册，导入模块不产生副作用)"""
+    global _handlers_installed
+    if _handlers_installed:
+        return
+    signal.signal(signal.SIGINT, _signal_handler)
+    signal.signal(signal.SIGTERM, _signal_handler)
+    atexit.register(_save_state)
+    _handlers_installed = True
 
 
 def process_single_team(team: dict) -> tuple[list, list]:
@@ -138,11 +170,12 @@ def process_single_team(team: dict) -> tuple[list, list]:
     ]
     member_accounts = [acc for acc in all_accounts if acc.get("role") != "owner"]
 
-    # 统计完成数量 (只统计普通成员)
-    completed_count = sum(
+    # 统计完成数量 (只统计普通成员；已归档的成员均为 completed，一并计入)
+    archived_members = archived_count(_tracker, team_name)
+    completed_count = archived_members + sum(
         1 for acc in member_accounts if _get_invitation_status(acc) == "completed"
     )
-    member_count = len(member_accounts)
+    member_count = archived_members + len(member_accounts)
 
     # 如果普通成员已完成目标数量，且没有未完成的 Owner，跳过
     owner_incomplete = len(owner_accounts)
@@ -231,7 +264,7 @@ def process_single_team(team: dict) -> tuple[list, list]:
             # ========== 阶段 1: 批量创建邮箱 ==========
             log.section(f"阶段 1: 批量创建 {need_count} 个邮箱")
 
-            with Timer("邮箱创建"):
+            with Timer("邮箱创建", stage="email_create", team=team_name):
                 accounts = batch_create_emails(need_count)
 
             if len(accounts) > 0:
@@ -240,7 +273,7 @@ def process_single_team(team: dict) -> tuple[list, list]:
 
                 emails = [acc["email"] for acc in accounts]
 
-                with Timer("批量邀请"):
+                with Timer("批量邀请", stage="invite", team=team_name):
                     invite_result = batch_invite_to_team(emails, team)
 
                 # 更新追踪记录 (带密码) - 立即保存
@@ -279,6 +312,7 @@ def process_single_team(team: dict) -> tuple[list, list]:
     # Owner 不在这里处理，统一放到所有 Team 处理完后
 
     # ========== Team 处理完成 ==========
+    checkpoint_team_tracker(_tracker)
     success_count = sum(1 for r in results if r["status"] == "success")
     if results:
         log.success(f"{team_name} 成员处理完成: {success_count}/{len(results)} 成功")
@@ -289,10 +323,7 @@ def process_single_team(team: dict) -> tuple[list, list]:
 
 def _get_team_by_name(team_name: str) -> dict:
     """根据名称获取 Team 配置"""
-    for team in get_teams():
-        if team["name"] == team_name:
-            return team
-    return {}
+    return get_team_by_name(team_name)
 
 
 def process_accounts(accounts: list, team_name: str) -> list:
@@ -426,7 +457,9 @@ def process_accounts(accounts: list, team_name: str) -> list:
         update_account_status(_tracker, team_name, email, "processing")
         save_team_tracker(_tracker)
 
-        with Timer(f"账号 {email}"):
+        with Timer(
+            f"账号 {email}", stage="account", team=team_name, email=email
+        ) as timer:
             if is_team_owner_otp:
                 # 旧格式 Team Owner: 使用 OTP 登录授权
                 log.info(
@@ -529,6 +562,7 @@ def process_accounts(accounts: list, team_name: str) -> list:
                             {"status": "stored"},
                         )
                         save_team_tracker(_tracker)
+                        record_provider_account("cpa", email)
 
                         log.success(f"CPA 账号处理完成: {email}")
                 elif AUTH_PROVIDER == "s2a":
@@ -568,15 +602,20 @@ def process_accounts(accounts: list, team_name: str) -> list:
                             team_config.get("expires_at", 0) if team_config else 0
                         )
 
-                        s2a_result = s2a_create_account_from_oauth(
-                            code=codex_data["code"],
-                            session_id=codex_data["session_id"],
-                            name=email,
-                            expires_at=expires_at,
-                        )
+                        with Timer(
+                            stage="provider_add.s2a", team=team_name, email=email
+                        ) as add_timer:
+                            s2a_result = s2a_create_account_from_oauth(
+                                code=codex_data["code"],
+                                session_id=codex_data["session_id"],
+                                name=email,
+                                expires_at=expires_at,
+                            )
+                            add_timer.outcome = "success" if s2a_result else "failed"
 
                         if s2a_result:
                             s2a_id = s2a_result.get("id", "")
+                            record_provider_account("s2a", email, s2a_id)
                             result["status"] = "success"
                             result["crs_id"] = f"S2A-{s2a_id}"
 
@@ -635,10 +674,15 @@ def process_accounts(accounts: list, team_name: str) -> list:
 
                         # 添加到 CRS
                         log.step("添加到 CRS...")
-                        crs_result = crs_add_account(email, codex_data)
+                        with Timer(
+                            stage="provider_add.crs", team=team_name, email=email
+                        ) as add_timer:
+                            crs_result = crs_add_account(email, codex_data)
+                            add_timer.outcome = "success" if crs_result else "failed"
 
                         if crs_result:
                             crs_id = crs_result.get("id", "")
+                            record_provider_account("crs", email, crs_id)
                             result["status"] = "success"
                             result["crs_id"] = crs_id
 
@@ -675,6 +719,8 @@ def process_accounts(accounts: list, team_name: str) -> list:
                 update_account_status(_tracker, team_name, email, "register_failed")
                 save_team_tracker(_tracker)
 
+            timer.outcome = result["status"]
+
         # 保存到 CSV
         save_to_csv(
             email=email,
@@ -687,15 +733,36 @@ def process_accounts(accounts: list, team_name: str) -> list:
         results.append(result)
         _current_results.append(result)
 
+        # 账号边界: 写入完整快照，CSV 落盘
+        checkpoint_team_tracker(_tracker)
+        flush_csv()
+
         # 账号之间的间隔
         if i < len(accounts) - 1 and not _shutdown_requested:
             wait_time = random.randint(3, 6)
             log.info(f"等待 {wait_time}s 后处理下一个账号...", icon="wait")
             time.sleep(wait_time)
 
+    if _tracker is not None:
+        checkpoint_team_tracker(_tracker)
+
     return results
 
 
+def _auto_compact_tracker():
+    """按 tracker_archive_days 将早已完成的账号移入冷归档"""
+    try:
+        report = compact_tracker(_tracker, TRACKER_ARCHIVE_DAYS)
+        if report["archived"]:
+            rewrite_team_tracker(_tracker)
+            log.info(
+                f"已归档 {report['archived']} 个超过 {TRACKER_ARCHIVE_DAYS} 天的已完成账号",
+                icon="save",
+            )
+    except Exception as e:
+        log.warning(f"自动归档失败: {e}")
+
+
 def run_all_teams():
     """主函数: 遍历所有 Team"""
     global _tracker, _current_results, _shutdown_requested
@@ -711,6 +778,8 @@ def run_all_teams():
 
     # 先显示整体状态
     _tracker = load_team_tracker()
+    if TRACKER_AUTO_COMPACT:
+        _auto_compact_tracker()
     all_incomplete = get_all_incomplete_accounts(_tracker)
 
     if all_incomplete:
@@ -719,8 +788,9 @@ def run_all_teams():
 
     _current_results = []
     all_pending_owners = []  # 收集所有待处理的 Owner
+    reset_profile()
 
-    with Timer("全部流程"):
+    with Timer("全部流程", stage="run"):
         # ========== 第一阶段: 处理所有 Team 的普通成员 ==========
         for i, team in enumerate(teams):
             if _shutdown_requested:
@@ -787,6 +857,10 @@ def run_all_teams():
     # 打印总结
     print_summary(_current_results)
 
+    # 阶段耗时统计
+    event_log = get_event_log()
+    report_profile(run_id=event_log.run_id if event_log else None)
+
     return _current_results
 
 
@@ -864,47 +938,6 @@ def test_email_only():
         log.info("记录已保存到 team_tracker.json", icon="save")
 
 
-def show_status():
-    """显示当前状态"""
-    log.header("当前状态")
-
-    tracker = load_team_tracker()
-
-    if not tracker.get("teams"):
-        log.info("没有任何记录")
-        return
-
-    total_accounts = 0
-    total_completed = 0
-    total_incomplete = 0
-
-    for team_name, accounts in tracker["teams"].items():
-        log.info(f"{team_name}:", icon="team")
-        status_count = {}
-        for acc in accounts:
-            total_accounts += 1
-            status = _get_invitation_status(acc, "unknown")
-            status_count[status] = status_count.get(status, 0) + 1
-
-            if status == "completed":
-                total_completed += 1
-                log.success(f"{acc['email']} ({status})")
-            elif status in ["invited", "registered", "authorized", "processing"]:
-                total_incomplete += 1
-                log.warning(f"{acc['email']} ({status})")
-            else:
-                total_incomplete += 1
-                log.error(f"{acc['email']} ({status})")
-
-        log.info(f"统计: {status_count}")
-
-    log.separator("-", 40)
-    log.info(f"总计: {total_accounts} 个账号")
-    log.success(f"完成: {total_completed}")
-    log.warning(f"未完成: {total_incomplete}")
-    log.info(f"最后更新: {tracker.get('last_updated', 'N/A')}", icon="time")
-
-
 def process_team_with_login(team: dict, team_index: int, total: int):
     """处理单个 Team（包括获取 token、授权和后续流程）
 
@@ -936,6 +969,7 @@ def process_team_with_login(team: dict, team_index: int, total: int):
         team["access_token"] = result["token"]
     if result.get("account_id"):
         team["account_id"] = result["account_id"]
+        update_team_index(team)
     if result.get("expires_at") is not None:
         team["expires_at"] = result["expires_at"]
         team["token_expires_at"] = result["expires_at"]
@@ -1001,6 +1035,10 @@ def process_team_with_login(team: dict, team_index: int, total: int):
 
 
 def main(command: str | None = None, team_index: int | None = None, headless: bool = False):
+    _install_signal_handlers()
+    # 按 [metrics] 配置导出运行指标 (未配置时不启动)
+    start_metrics()
+
     # ========== 动态设置浏览器模式 ==========
     if headless:
         import src.core.config as config
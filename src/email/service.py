@@ -5,10 +5,7 @@ import re
 import time
 import random
 import string
-import requests
 from typing import Callable, TypeVar, Optional, Any
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from src.core.config import (
     EMAIL_API_BASE,
@@ -18,9 +15,7 @@ from src.core.config import (
     REQUEST_TIMEOUT,
     VERIFICATION_CODE_INTERVAL,
     VERIFICATION_CODE_MAX_RETRIES,
-    PROXY_ENABLED,
     get_random_domain,
-    get_proxy_dict,
     EMAIL_PROVIDER,
     GPTMAIL_API_BASE,
     GPTMAIL_API_KEY,
@@ -32,33 +27,12 @@ from src.core.config import (
     DOMAINMAIL_DOMAINS,
     get_random_domainmail_domain,
 )
+from src.core.http import HttpClient
 from src.core.logger import log
 
 
-def create_session_with_retry():
-    """创建带重试机制的 HTTP Session"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "OPTIONS"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-
-    # 代理设置
-    if PROXY_ENABLED:
-        proxy_dict = get_proxy_dict()
-        if proxy_dict:
-            session.proxies = proxy_dict
-
-    return session
-
-
-# 全局 HTTP Session
-http_session = create_session_with_retry()
+# 全局 HTTP Session (按 origin 共享连接池)
+http_session = HttpClient()
 
 
 # ==================== 通用轮询重试工具 ====================
@@ -337,6 +337,7 @@ def create_parent_accounts_from_source(source: str) -> int:
     Returns:
         int: 退出码 (0=成功, 1=失败)
     """
+    from src.core.csv_appender import flush_csv
     from src.core.utils import Timer, save_to_csv
     from src.core.config import (
         add_domain_to_blacklist,
@@ -389,6 +390,7 @@ def create_parent_accounts_from_source(source: str) -> int:
             failed += 1
 
         save_to_csv(email=email, password=password, status=status)
+        flush_csv()
         results.append({"email": email, "status": status})
 
     success = total - failed
@@ -119,6 +119,7 @@ def _register_single_account(email: str, password: str) -> bool | str:
 
 
 def register_from_source(source: str) -> int:
+    from src.core.csv_appender import flush_csv
     from src.core.utils import Timer, save_to_csv
     from src.core.config import (
         add_domain_to_blacklist,
@@ -168,6 +169,7 @@ def register_from_source(source: str) -> int:
             failed += 1
 
         save_to_csv(email=email, password=password, status=status)
+        flush_csv()
         results.append({"email": email, "status": status})
 
     success = total - failed
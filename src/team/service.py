@@ -1,46 +1,21 @@
 # ==================== Team 服务模块 ====================
 # 处理 ChatGPT Team 邀请相关功能
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
-
 from src.core.config import (
     ACCOUNTS_PER_TEAM,
     REQUEST_TIMEOUT,
     USER_AGENT,
     BROWSER_HEADLESS,
-    PROXY_ENABLED,
     save_team_json,
     get_teams,
-    get_proxy_dict,
+    update_team_index,
 )
+from src.core.http import HttpClient
 from src.core.logger import log
 
 
-def create_session_with_retry():
-    """创建带重试机制的 HTTP Session"""
-    session = requests.Session()
-    retry_strategy = Retry(
-        total=5,
-        backoff_factor=1,
-        status_forcelist=[429, 500, 502, 503, 504],
-        allowed_methods=["HEAD", "GET", "POST", "OPTIONS"],
-    )
-    adapter = HTTPAdapter(max_retries=retry_strategy)
-    session.mount("https://", adapter)
-    session.mount("http://", adapter)
-
-    # 代理设置
-    if PROXY_ENABLED:
-        proxy_dict = get_proxy_dict()
-        if proxy_dict:
-            session.proxies = proxy_dict
-
-    return session
-
-
-http_session = create_session_with_retry()
+# 全局 HTTP Session (按 origin 共享连接池)
+http_session = HttpClient()
 
 
 def fetch_account_id(team: dict, silent: bool = False) -> str:
@@ -91,6 +66,7 @@ def fetch_account_id(team: dict, silent: bool = False) -> str:
                     plan_type = account_data.get("plan_type", "")
                     if "team" in plan_type.lower():
                         team["account_id"] = acc_id
+                        update_team_index(team)
                         if not silent:
                             log.success(f"获取到 Team account_id: {acc_id[:8]}...")
                         return acc_id
@@ -99,6 +75,7 @@ def fetch_account_id(team: dict, silent: bool = False) -> str:
                 for acc_id in accounts.keys():
                     if acc_id != "default":
                         team["account_id"] = acc_id
+                        update_team_index(team)
                         if not silent:
                             log.success(f"获取到 account_id: {acc_id[:8]}...")
                         return acc_id
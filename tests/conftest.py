@@ -0,0 +1,31 @@
+# ==================== 测试公共配置 ====================
+# 所有测试共用的隔离设置
+
+"""Tests conftest
+
+    - isolate_event_log: 事件流写入各测试的临时目录，不追加到仓库的 logs/events.jsonl
+    - isolate_tracker_store: 追踪记录默认存储指向各测试的临时目录，不写仓库根目录的 team_tracker.json
+"""
+
+import pytest
+
+import src.core.events as events
+import src.core.tracker_store as tracker_store
+
+
+@pytest.fixture(autouse=True)
+def isolate_event_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(events, "EVENTS_FILE", str(tmp_path / "events.jsonl"))
+    events.reset_event_log()
+    yield
+    events.reset_event_log()
+
+
+@pytest.fixture(autouse=True)
+def isolate_tracker_store(tmp_path):
+    # 需要其他后端的测试在自己的 fixture 中再次 reset_tracker_store 即可覆盖
+    tracker_store.reset_tracker_store(
+        tracker_store.JsonTrackerStore(tmp_path / "team_tracker.json")
+    )
+    yield
+    tracker_store.reset_tracker_store()
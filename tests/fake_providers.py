@@ -0,0 +1,344 @@
+# ==================== 服务商模拟服务器 ====================
+# 本地 CRS / CPA / S2A 管理接口替身，供客户端测试与基准测试使用
+
+"""Fake Providers - 服务商管理接口模拟服务器
+
+基于标准库 ThreadingHTTPServer (HTTP/1.1 keep-alive)，实现客户端用到的接口:
+
+    CRS: GET/POST /admin/openai-accounts
+    S2A: GET/POST /admin/accounts (page/page_size 分页)、GET /admin/groups
+    CPA: GET /v0/management/accounts (或 /v0/management/account-list)、
+         GET /v0/management/codex-auth-url、POST /v0/management/oauth-callback、
+         GET /v0/management/get-auth-status
+
+每个服务商的账号清单为 user000000@example.com 起的确定性邮箱，数量可配置；
+支持固定延迟、按比例随机返回错误 (error_rate) 以及指定接下来 N 个请求失败 (fail_next)，
+status=0 表示直接断开连接 (客户端收到 ConnectionError)。
+
+Classes:
+    FakeProviderServer: 模拟服务器
+
+Functions:
+    fake_email: 第 i 个模拟账号的邮箱
+    use_fake_providers: 将 CRS / CPA / S2A 客户端与 storage_manager 指向模拟服务器
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+from urllib.parse import parse_qs, urlsplit
+
+CRS_TOKEN = "fake-crs-token"
+CPA_PASSWORD = "fake-cpa-password"
+S2A_KEY = "fake-s2a-key"
+
+S2A_GROUPS = [{"id": 1, "name": "default"}, {"id": 2, "name": "codex"}]
+
+
+def fake_email(index: int) -> str:
+    return f"user{index:06d}@example.com"
+
+
+class _Inventory:
+    """单个服务商的账号清单 (整页响应预先序列化，新增账号时失效)"""
+
+    def __init__(self, accounts: list[dict]):
+        self.accounts = accounts
+        self._payload: bytes | None = None
+
+    def add(self, account: dict):
+        self.accounts.append(account)
+        self._payload = None
+
+    def payload(self, wrap) -> bytes:
+        if self._payload is None:
+            self._payload = json.dumps(wrap(self.accounts)).encode("utf-8")
+        return self._payload
+
+
+class FakeProviderServer:
+    """CRS / CPA / S2A 管理接口模拟服务器
+
+    Args:
+        accounts: 每个服务商预置的账号数 (也可分别指定 crs_accounts 等)
+        latency: 每个请求的固定延迟 (秒)
+        error_rate: 随机返回 503 的比例 (0~1)
+        cpa_endpoint: CPA 账号列表接口路径 (另一个返回 404)
+        seed: 错误注入的随机种子
+    """
+
+    def __init__(
+        self,
+        accounts: int = 0,
+        crs_accounts: int | None = None,
+        cpa_accounts: int | None = None,
+        s2a_accounts: int | None = None,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        cpa_endpoint: str = "/v0/management/accounts",
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.cpa_endpoint = cpa_endpoint
+        self.crs = _Inventory(
+            [
+                {"id": f"crs-{i}", "name": fake_email(i), "platform": "openai"}
+                for i in range(accounts if crs_accounts is None else crs_accounts)
+            ]
+        )
+        self.cpa = _Inventory(
+            [
+                {"id": f"cpa-{i}", "email": fake_email(i)}
+                for i in range(accounts if cpa_accounts is None else cpa_accounts)
+            ]
+        )
+        self.s2a = _Inventory(
+            [
+                {
+                    "id": i + 1,
+                    "name": fake_email(i),
+                    "platform": "openai",
+                    "credentials": {"email": fake_email(i)},
+                }
+                for i in range(accounts if s2a_accounts is None else s2a_accounts)
+            ]
+        )
+        self.requests: dict[str, int] = {}
+        self._failures: list[int] = []
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._data_lock = threading.Lock()
+        self._server: ThreadingHTTPServer | None = None
+        self._thread: threading.Thread | None = None
+
+    # ==================== 生命周期 ====================
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def start(self) -> "FakeProviderServer":
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "FakeProviderServer":
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # ==================== 错误注入 ====================
+
+    def fail_next(self, count: int = 1, status: int = 503):
+        """接下来 count 个请求返回 status (0 表示直接断开连接)"""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def _injected_failure(self) -> int | None:
+        with self._lock:
+            if self._failures:
+                return self._failures.pop(0)
+            if self.error_rate and self._random.random() < self.error_rate:
+                return 503
+        return None
+
+    def _count(self, path: str):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+
+    # ==================== 路由 ====================
+
+    def _authorized(self, provider: str, headers) -> bool:
+        if provider == "s2a":
+            return headers.get("x-api-key") == S2A_KEY
+        expected = CRS_TOKEN if provider == "crs" else CPA_PASSWORD
+        return headers.get("authorization") == f"Bearer {expected}"
+
+    def _route(self, method: str, path: str, query: dict, body: dict | None):
+        """返回 (provider, status, payload bytes)"""
+        if path.startswith("/admin/openai-accounts"):
+            if method == "GET":
+                return "crs", 200, self.crs.payload(lambda a: {"success": True, "data": a})
+            if path == "/admin/openai-accounts":
+                index = len(self.crs.accounts)
+                account = {
+                    "id": f"crs-{index}",
+                    "name": (body or {}).get("name", fake_email(index)),
+                    "platform": "openai",
+                }
+                self.crs.add(account)
+                return "crs", 200, _dumps({"success": True, "data": account})
+            return "crs", 200, _dumps(
+                {"success": True, "data": {"authUrl": "https://auth.example.com", "sessionId": "s-1"}}
+            )
+
+        if path == "/admin/groups":
+            return "s2a", 200, _dumps({"code": 0, "data": {"items": S2A_GROUPS}})
+
+        if path == "/admin/accounts":
+            if method == "POST":
+                index = len(self.s2a.accounts)
+                name = (body or {}).get("name", fake_email(index))
+                account = {"id": index + 1, "name": name, "platform": "openai", "credentials": {"email": name}}
+                self.s2a.add(account)
+                return "s2a", 200, _dumps({"code": 0, "data": account})
+            return "s2a", 200, self._s2a_page(query)
+
+        if path.startswith("/v0/management/"):
+            if path == self.cpa_endpoint:
+                return "cpa", 200, self.cpa.payload(lambda a: {"data": a})
+            if path == "/v0/management/codex-auth-url":
+                return "cpa", 200, _dumps(
+                    {"status": "ok", "url": "https://auth.example.com", "state": "state-1"}
+                )
+            if path == "/v0/management/oauth-callback":
+                return "cpa", 200, _dumps({"status": "ok"})
+            if path == "/v0/management/get-auth-status":
+                return "cpa", 200, _dumps({"status": "ok"})
+            return "cpa", 404, _dumps({"error": "not found"})
+
+        return None, 404, _dumps({"error": "not found"})
+
+    def _s2a_page(self, query: dict) -> bytes:
+        page = max(1, int(query.get("page", ["1"])[0]))
+        page_size = max(1, int(query.get("page_size", ["100"])[0]))
+        accounts = self.s2a.accounts
+        if query.get("platform"):
+            platform = query["platform"][0]
+            accounts = [a for a in accounts if a.get("platform") == platform]
+        start = (page - 1) * page_size
+        pages = max(1, -(-len(accounts) // page_size))
+        return _dumps(
+            {
+                "code": 0,
+                "data": {
+                    "items": accounts[start : start + page_size],
+                    "total": len(accounts),
+                    "page": page,
+                    "page_size": page_size,
+                    "pages": pages,
+                },
+            }
+        )
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # 响应头与响应体合并发送，避免 keep-alive 下 Nagle + 延迟 ACK 造成的 40ms 等待
+            wbufsize = -1
+            disable_nagle_algorithm = True
+
+            def _handle(self, method: str):
+                parts = urlsplit(self.path)
+                server._count(parts.path)
+
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length) if length else b""
+
+                if server.latency:
+                    time.sleep(server.latency)
+
+                failure = server._injected_failure()
+                if failure == 0:
+                    self.close_connection = True
+                    self.connection.close()
+                    return
+                if failure:
+                    self._send(failure, _dumps({"error": "injected"}))
+                    return
+
+                try:
+                    body = json.loads(raw) if raw else None
+                except ValueError:
+                    body = None
+                with server._data_lock:
+                    provider, status, payload = server._route(
+                        method, parts.path, parse_qs(parts.query), body
+                    )
+                if provider and not server._authorized(provider, self.headers):
+                    status, payload = 401, _dumps({"error": "unauthorized"})
+                self._send(status, payload)
+
+            def _send(self, status: int, payload: bytes):
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def _dumps(data) -> bytes:
+    return json.dumps(data).encode("utf-8")
+
+
+@contextmanager
+def use_fake_providers(server: FakeProviderServer, inventory_ttl: int | None = None):
+    """将 CRS / CPA / S2A 客户端与 storage_manager 指向模拟服务器
+
+    Args:
+        inventory_ttl: 同时覆盖 STORAGE_INVENTORY_TTL (None 表示不修改)
+    """
+    import src.auth.cpa.client as cpa_client
+    import src.auth.crs.client as crs_client
+    import src.auth.s2a.client as s2a_client
+    import src.core.storage_manager as storage_manager
+    from src.core import http
+
+    with ExitStack() as stack:
+        for module, values in (
+            (crs_client, {"CRS_API_BASE": server.url, "CRS_ADMIN_TOKEN": CRS_TOKEN}),
+            (cpa_client, {"CPA_API_BASE": server.url, "CPA_ADMIN_PASSWORD": CPA_PASSWORD}),
+            (s2a_client, {"S2A_API_BASE": server.url, "S2A_ADMIN_KEY": S2A_KEY}),
+            (
+                storage_manager,
+                {
+                    "CRS_API_BASE": server.url,
+                    "CRS_ADMIN_TOKEN": CRS_TOKEN,
+                    "CPA_API_BASE": server.url,
+                    "CPA_ADMIN_PASSWORD": CPA_PASSWORD,
+                    "S2A_API_BASE": server.url,
+                    "S2A_ADMIN_KEY": S2A_KEY,
+                },
+            ),
+        ):
+            stack.enter_context(patch.multiple(module, **values))
+        if inventory_ttl is not None:
+            stack.enter_context(
+                patch.object(storage_manager, "STORAGE_INVENTORY_TTL", inventory_ttl)
+            )
+        # 重试退避不等待，注入的错误不会拖慢测试
+        stack.enter_context(patch.object(http, "HTTP_BACKOFF_FACTOR", 0))
+        stack.callback(http.close_sessions)
+        stack.callback(storage_manager.invalidate_provider_inventory)
+        http.close_sessions()
+        storage_manager.invalidate_provider_inventory()
+        yield server
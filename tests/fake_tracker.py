@@ -0,0 +1,148 @@
+# ==================== 追踪记录生成器 ====================
+# 生成逼真的 team_tracker.json (N 个 Team × M 个账号)，供测试与基准测试使用
+
+"""Fake Tracker - 合成追踪记录
+
+生成的追踪记录混合了:
+
+    - 旧格式账号 (status 字段，没有 storage_status)，比例由 legacy_ratio 控制；
+      存在旧格式账号时不写 schema_version，加载时会触发迁移
+    - 新格式账号 (invitation_status + crs / cpa / s2a 入库状态)，
+      各服务商按 stored_ratio 标记为已入库 (带 account_id / last_check)
+    - 各种邀请状态 (invited / registered / authorized / completed，completed 约占一半)
+    - 每个 Team 第一个账号为 owner
+
+同样的参数与 seed 生成的数据完全相同，不同提交之间的基准测试结果可以直接比较。
+
+Functions:
+    tracker_email: 第 team 个 Team 第 index 个账号的邮箱
+    generate_tracker: 生成追踪记录 dict
+    write_tracker: 生成追踪记录并写入文件
+
+命令行:
+    python -m tests.fake_tracker team_tracker.json --teams 100 --accounts 1000 [--legacy-ratio 0.2]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from src.core.tracker_migration import SCHEMA_VERSION
+
+PROVIDERS = ("crs", "cpa", "s2a")
+# completed 约占一半，其余为处理中的各阶段
+STATUS_WEIGHTS = (("completed", 5), ("authorized", 2), ("registered", 2), ("invited", 1))
+BASE_TIME = datetime(2024, 1, 1)
+TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def tracker_email(team: int, index: int) -> str:
+    return f"t{team:04d}-u{index:06d}@example.com"
+
+
+def _status(rng: random.Random) -> str:
+    statuses, weights = zip(*STATUS_WEIGHTS)
+    return rng.choices(statuses, weights)[0]
+
+
+def _account(rng: random.Random, team: int, index: int, legacy: bool, stored_ratio: float) -> dict:
+    created = BASE_TIME + timedelta(minutes=team * 1440 + index)
+    updated = created + timedelta(seconds=rng.randint(0, 86400))
+    status = _status(rng)
+    account = {
+        "email": tracker_email(team, index),
+        "password": f"Pw{rng.getrandbits(48):012x}",
+    }
+    if legacy:
+        account["status"] = status
+        account["role"] = "owner" if index == 0 else "member"
+        account["created_at"] = created.strftime(TIME_FORMAT)
+        return account
+
+    account["invitation_status"] = status
+    account["role"] = "owner" if index == 0 else "member"
+    storage_status = {}
+    for provider in PROVIDERS:
+        if status == "completed" and rng.random() < stored_ratio:
+            storage_status[provider] = {
+                "status": "stored",
+                "account_id": f"{provider}-{team}-{index}",
+                "last_check": updated.strftime(TIME_FORMAT),
+            }
+        else:
+            storage_status[provider] = {"status": "not_stored"}
+    account["storage_status"] = storage_status
+    account["created_at"] = created.strftime(TIME_FORMAT)
+    account["updated_at"] = updated.strftime(TIME_FORMAT)
+    return account
+
+
+def generate_tracker(
+    teams: int = 10,
+    accounts: int = 100,
+    legacy_ratio: float = 0.2,
+    stored_ratio: float = 0.6,
+    seed: int = 0,
+) -> dict:
+    """生成追踪记录
+
+    Args:
+        teams: Team 数量
+        accounts: 每个 Team 的账号数
+        legacy_ratio: 旧格式账号比例 (0 表示全部为当前格式并写入 schema_version)
+        stored_ratio: completed 账号在每个服务商已入库的比例
+        seed: 随机种子
+    """
+    rng = random.Random(seed)
+    tracker = {
+        "teams": {
+            f"team-{team:04d}": [
+                _account(rng, team, index, rng.random() < legacy_ratio, stored_ratio)
+                for index in range(accounts)
+            ]
+            for team in range(teams)
+        },
+        "last_updated": (BASE_TIME + timedelta(days=teams + 1)).strftime(TIME_FORMAT),
+    }
+    if legacy_ratio <= 0:
+        tracker["schema_version"] = SCHEMA_VERSION
+    return tracker
+
+
+def write_tracker(path, **kwargs) -> dict:
+    """生成追踪记录并写入 path (参数同 generate_tracker)"""
+    tracker = generate_tracker(**kwargs)
+    Path(path).write_text(json.dumps(tracker, ensure_ascii=False, indent=2), encoding="utf-8")
+    return tracker
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="生成合成 team_tracker.json")
+    parser.add_argument("path", help="输出文件")
+    parser.add_argument("--teams", type=int, default=10, help="Team 数量")
+    parser.add_argument("--accounts", type=int, default=100, help="每个 Team 的账号数")
+    parser.add_argument("--legacy-ratio", type=float, default=0.2, help="旧格式账号比例")
+    parser.add_argument("--stored-ratio", type=float, default=0.6, help="completed 账号的入库比例")
+    parser.add_argument("--seed", type=int, default=0, help="随机种子")
+    args = parser.parse_args()
+
+    tracker = write_tracker(
+        args.path,
+        teams=args.teams,
+        accounts=args.accounts,
+        legacy_ratio=args.legacy_ratio,
+        stored_ratio=args.stored_ratio,
+        seed=args.seed,
+    )
+    total = sum(len(accounts) for accounts in tracker["teams"].values())
+    print(f"已生成 {args.path}: {len(tracker['teams'])} 个 Team，{total} 个账号")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
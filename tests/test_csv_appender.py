@@ -0,0 +1,141 @@
+# ==================== CSV Appender 测试 ====================
+# 测试 accounts.csv 追加写入与轮转
+
+"""Test CSV Appender
+
+测试用例:
+    - test_save_to_csv_reuses_handle_and_writes_header_once: 测试 save_to_csv 复用句柄且表头只写一次
+    - test_rotation_keeps_compressed_backups: 测试按大小轮转为编号递增的压缩归档
+    - test_rotation_keeps_every_row: 测试多次轮转 (含重新打开) 后所有写入的行都能从归档中找回
+    - test_compression_runs_off_the_writer_thread: 测试压缩在后台线程执行，遗留的未压缩归档在启动时补做
+"""
+
+import csv
+import gzip
+import threading
+from unittest.mock import patch
+
+import pytest
+
+import src.core.csv_appender as csv_appender
+from src.core.csv_appender import CSV_HEADER, CsvAppender, flush_csv, reset_csv_appender
+from src.core.utils import save_to_csv
+
+
+@pytest.fixture
+def csv_path(tmp_path):
+    path = tmp_path / "accounts.csv"
+    reset_csv_appender(CsvAppender(path))
+    yield path
+    reset_csv_appender()
+
+
+def _rows(path) -> list:
+    with open(path, newline="", encoding="utf-8") as f:
+        return list(csv.reader(f))
+
+
+def test_save_to_csv_reuses_handle_and_writes_header_once(csv_path):
+    save_to_csv("a@example.com", "pw", "alpha", "success", "crs-1")
+    flush_csv()
+    save_to_csv("b@example.com", "pw", "alpha", "failed")
+    flush_csv()
+
+    rows = _rows(csv_path)
+    assert rows[0] == CSV_HEADER
+    assert [row[0] for row in rows[1:]] == ["a@example.com", "b@example.com"]
+
+    # 重新打开已有文件时不重复写表头
+    reset_csv_appender(CsvAppender(csv_path))
+    save_to_csv("c@example.com", "pw")
+    flush_csv()
+    assert [row[0] for row in _rows(csv_path)].count("email") == 1
+
+
+def _archived_rows(directory) -> list:
+    """按编号顺序读出所有归档 (含 .gz) 中的数据行"""
+    archives = sorted(
+        (p for p in directory.iterdir() if p.name.startswith("accounts.csv.")),
+        key=lambda p: int(p.name.split(".")[2]),
+    )
+    rows = []
+    for archive in archives:
+        opener = gzip.open if archive.suffix == ".gz" else open
+        with opener(archive, "rt", encoding="utf-8", newline="") as f:
+            rotated = list(csv.reader(f))
+        assert rotated[0] == CSV_HEADER
+        rows.extend(rotated[1:])
+    return rows
+
+
+def test_rotation_keeps_compressed_backups(tmp_path):
+    path = tmp_path / "accounts.csv"
+    appender = CsvAppender(path, rotate_bytes=120, compress=True)
+    # 表头 + 2 行即超过 120 字节，每 2 行轮转一次
+    for i in range(11):
+        appender.append([f"user{i}@example.com", "pw", "alpha", "success", "", "ts"])
+    appender.close()
+
+    backups = sorted(p.name for p in tmp_path.iterdir() if p.name != "accounts.csv")
+    assert backups == [f"accounts.csv.{i}.gz" for i in range(1, 6)]
+    with gzip.open(tmp_path / "accounts.csv.5.gz", "rt", encoding="utf-8") as f:
+        rotated = list(csv.reader(f))
+    assert rotated[0] == CSV_HEADER
+    assert [row[0] for row in rotated[1:]] == ["user8@example.com", "user9@example.com"]
+    # 当前文件从新表头开始
+    assert _rows(path) == [
+        CSV_HEADER,
+        ["user10@example.com", "pw", "alpha", "success", "", "ts"],
+    ]
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_rotation_keeps_every_row(tmp_path, compress):
+    path = tmp_path / "accounts.csv"
+    emails = [f"user{i}@example.com" for i in range(25)]
+    appender = CsvAppender(path, rotate_bytes=120, compress=compress)
+    for email in emails[:15]:
+        appender.append([email, "pw", "alpha", "success", "", "ts"])
+    appender.close()
+    # 重新打开后继续递增编号，不覆盖已有归档
+    appender = CsvAppender(path, rotate_bytes=120, compress=compress)
+    for email in emails[15:]:
+        appender.append([email, "pw", "alpha", "success", "", "ts"])
+    appender.close()
+
+    rows = _archived_rows(tmp_path)
+    if path.exists():
+        rows.extend(_rows(path)[1:])
+    assert [row[0] for row in rows] == emails
+
+
+def test_compression_runs_off_the_writer_thread(tmp_path):
+    path = tmp_path / "accounts.csv"
+    writer_thread = threading.current_thread()
+    threads = []
+    compress = CsvAppender._compress
+
+    def record_thread(self, archive):
+        threads.append(threading.current_thread())
+        compress(self, archive)
+
+    with patch.object(csv_appender.CsvAppender, "_compress", record_thread):
+        appender = CsvAppender(path, rotate_bytes=120, compress=True)
+        for i in range(4):
+            appender.append([f"user{i}@example.com", "pw", "alpha", "success", "", "ts"])
+        appender.close()
+
+    assert threads and all(thread is not writer_thread for thread in threads)
+    # 每 2 行轮转一次，最后一次轮转后尚未写入新行
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "accounts.csv.1.gz",
+        "accounts.csv.2.gz",
+    ]
+
+    # 上次退出时未压缩完的归档在下次打开时补做
+    leftover = tmp_path / "accounts.csv.3"
+    leftover.write_text("email\nlate@example.com\n", encoding="utf-8")
+    CsvAppender(path, rotate_bytes=120, compress=True).close()
+    assert not leftover.exists()
+    with gzip.open(tmp_path / "accounts.csv.3.gz", "rt", encoding="utf-8") as f:
+        assert "late@example.com" in f.read()
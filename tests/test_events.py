@@ -0,0 +1,99 @@
+# ==================== Events 测试 ====================
+# 测试结构化事件流 (JSON Lines)
+
+"""Test Events
+
+测试用例:
+    - test_event_log_buffers_until_full: 测试事件缓冲满后才写入文件
+    - test_status_transitions_and_timer_emit_events: 测试状态变化与 Timer 产生事件
+    - test_default_event_log_isolated_in_tests: 测试默认事件写入器在测试中指向临时目录
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.core.config import BASE_DIR
+from src.core.events import EventLog, flush_events, get_event_log, hash_email, reset_event_log
+from src.core.storage_manager import update_storage_status
+from src.core.tracker import Tracker
+from src.core.tracker_store import JsonTrackerStore
+from src.core.utils import Timer, add_account_to_tracker, update_account_status
+
+
+def _read_events(path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+@pytest.fixture
+def event_log(tmp_path):
+    event_log = EventLog(tmp_path / "events.jsonl", buffer_size=100, run_id="run-1")
+    reset_event_log(event_log)
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    with patch("src.core.utils.get_tracker_store", return_value=store):
+        yield event_log
+    reset_event_log()
+
+
+def test_event_log_buffers_until_full(tmp_path):
+    path = tmp_path / "events.jsonl"
+    event_log = EventLog(path, buffer_size=3, run_id="run-1")
+
+    event_log.emit(
+        "account", "success", team="alpha", email="A@example.com", duration_ms=12.34
+    )
+    event_log.emit("account", "failed", team="alpha", email="b@example.com")
+    assert not path.exists()
+    assert event_log.pending == 2
+
+    event_log.emit("invite", "ok", team="alpha")
+    events = _read_events(path)
+    assert len(events) == 3
+    assert event_log.pending == 0
+    assert events[0] == {
+        "ts": events[0]["ts"],
+        "run_id": "run-1",
+        "team": "alpha",
+        "email_hash": hash_email("a@example.com"),
+        "stage": "account",
+        "outcome": "success",
+        "duration_ms": 12.3,
+    }
+    assert "example.com" not in path.read_text(encoding="utf-8")
+
+
+def test_status_transitions_and_timer_emit_events(event_log):
+    tracker = Tracker({"teams": {}})
+    add_account_to_tracker(tracker, "alpha", "a@example.com")
+    update_account_status(tracker, "alpha", "a@example.com", "registered")
+    # 状态未变化不记录事件
+    update_account_status(tracker, "alpha", "a@example.com", "registered")
+    update_storage_status(tracker, "alpha", "a@example.com", "crs", {"status": "stored"})
+
+    with pytest.raises(RuntimeError):
+        with Timer(stage="account", team="alpha", email="a@example.com"):
+            raise RuntimeError("boom")
+    with Timer(stage="invite", team="alpha") as timer:
+        timer.outcome = "partial"
+
+    flush_events()
+    events = _read_events(event_log.path)
+    assert [(e["stage"], e["outcome"]) for e in events] == [
+        ("invitation", "invited"),
+        ("invitation", "registered"),
+        ("storage", "stored"),
+        ("account", "error"),
+        ("invite", "partial"),
+    ]
+    assert events[1]["previous"] == "invited"
+    assert events[2]["provider"] == "crs"
+    assert events[3]["duration_ms"] is not None
+    assert {e["run_id"] for e in events} == {"run-1"}
+
+
+def test_default_event_log_isolated_in_tests(tmp_path):
+    event_log = get_event_log()
+    assert event_log.path == str(tmp_path / "events.jsonl")
+    assert not event_log.path.startswith(str(BASE_DIR / "logs"))
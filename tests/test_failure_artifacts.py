@@ -0,0 +1,116 @@
+# ==================== 失败现场存储测试 ====================
+# 测试日志段去重存储、日志尾部截取与保留策略
+
+"""Test Failure Artifacts
+
+测试用例:
+    - test_segments_stored_once_across_failures: 测试轮转日志段按内容只存一份，失败目录只含清单与日志尾部
+    - test_retention_prunes_oldest_and_unreferenced_blobs: 测试按数量 / 大小清理最早记录及无引用的日志段
+"""
+
+import json
+
+import pytest
+
+import src.core.failure_artifacts as artifacts
+from src.core.failure_artifacts import (
+    create_failure_dir,
+    list_failures,
+    prune_failures,
+    record_failure,
+)
+
+
+@pytest.fixture
+def log_dir(tmp_path, monkeypatch):
+    log_dir = tmp_path / "logs"
+    log_dir.mkdir()
+    monkeypatch.setattr(artifacts, "LOG_DIR", log_dir)
+    monkeypatch.setattr(artifacts, "LOG_FILE", log_dir / "app.log")
+    monkeypatch.setattr(artifacts, "FAILURE_MAX_COUNT", 0)
+    monkeypatch.setattr(artifacts, "FAILURE_MAX_BYTES", 0)
+    artifacts._hash_cache.clear()
+    return log_dir
+
+
+def _blobs(root):
+    return sorted(path.name for path in (root / "blobs").rglob("*") if path.is_file())
+
+
+def _rotate(log_dir, content: str):
+    for index in (2, 1):
+        source = log_dir / f"app.log.{index}"
+        if source.exists():
+            source.rename(log_dir / f"app.log.{index + 1}")
+    (log_dir / "app.log").rename(log_dir / "app.log.1")
+    (log_dir / "app.log").write_text(content, encoding="utf-8")
+
+
+def test_segments_stored_once_across_failures(log_dir):
+    root = log_dir / "falid"
+    (log_dir / "app.log").write_text("old line\n" * 100, encoding="utf-8")
+    _rotate(log_dir, "".join(f"line {i}\n" for i in range(50)))
+
+    first = create_failure_dir(root)
+    (first / "screenshot_x.png").write_bytes(b"png")
+    manifest = record_failure(first, reason="x", files=[first / "screenshot_x.png"], tail_bytes=40)
+    second = create_failure_dir(root)
+    record_failure(second, reason="y", tail_bytes=40)
+
+    assert first != second
+    assert sorted(path.name for path in first.iterdir()) == [
+        "app.log.tail",
+        "manifest.json",
+        "screenshot_x.png",
+    ]
+    tail = (first / "app.log.tail").read_text(encoding="utf-8")
+    assert tail.endswith("line 49\n")
+    assert tail.startswith("line ") and len(tail) <= 40
+    assert manifest["files"] == ["screenshot_x.png"]
+    assert [segment["name"] for segment in manifest["segments"]] == ["app.log.1"]
+
+    # 两次失败共用同一份日志段
+    assert len(_blobs(root)) == 1
+    blob = root / manifest["segments"][0]["blob"]
+    assert blob.read_text(encoding="utf-8") == "old line\n" * 100
+
+    # 轮转后只新增新的日志段，改名的旧段复用原有存储
+    _rotate(log_dir, "fresh\n")
+    third = record_failure(create_failure_dir(root), tail_bytes=40)
+    assert [segment["name"] for segment in third["segments"]] == ["app.log.1", "app.log.2"]
+    assert third["segments"][1]["sha256"] == manifest["segments"][0]["sha256"]
+    assert len(_blobs(root)) == 2
+
+    index = json.loads((root / "index.json").read_text(encoding="utf-8"))
+    assert [entry["id"] for entry in index["failures"]] == [first.name, second.name, third["id"]]
+
+
+def test_retention_prunes_oldest_and_unreferenced_blobs(log_dir, monkeypatch):
+    root = log_dir / "falid"
+    # 旧版失败目录 (完整复制的日志) 也纳入保留策略
+    legacy = root / "20240101_000000"
+    legacy.mkdir(parents=True)
+    (legacy / "app.log").write_bytes(b"x" * 5000)
+
+    (log_dir / "app.log").write_text("a\n" * 10, encoding="utf-8")
+    _rotate(log_dir, "b\n" * 10)
+    first = record_failure(create_failure_dir(root), tail_bytes=10)
+    _rotate(log_dir, "c\n" * 10)
+    (log_dir / "app.log.2").unlink()
+    second = record_failure(create_failure_dir(root), tail_bytes=10)
+
+    assert [entry["id"] for entry in list_failures(root)] == [legacy.name, first["id"], second["id"]]
+    assert len(_blobs(root)) == 2
+
+    # 超出大小限制: 删除旧版目录即可满足
+    assert prune_failures(max_count=0, max_bytes=1000, root=root) == [legacy.name]
+    assert not legacy.exists()
+
+    # 超出数量限制: 删除最早的记录及只被它引用的日志段
+    monkeypatch.setattr(artifacts, "FAILURE_MAX_COUNT", 2)
+    third = record_failure(create_failure_dir(root), tail_bytes=10)
+    assert [entry["id"] for entry in list_failures(root)] == [second["id"], third["id"]]
+    assert not (root / first["id"]).exists()
+    assert _blobs(root) == sorted(
+        {segment["sha256"] for segment in second["segments"] + third["segments"]}
+    )
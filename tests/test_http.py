@@ -0,0 +1,92 @@
+# ==================== HTTP 会话测试 ====================
+# 测试共享 Session 注册表与请求统计
+
+"""Test HTTP
+
+测试用例:
+    - test_sessions_shared_per_origin: 测试同一 origin 共享 Session
+    - test_request_stats_count_retries: 测试请求耗时与重试计数
+    - test_retry_methods_per_origin: 测试 PUT / DELETE 默认不重试，可按服务地址开启
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from src.core import http
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    http.close_sessions()
+    http.reset_http_stats()
+    yield
+    http.close_sessions()
+    http.reset_http_stats()
+
+
+def test_sessions_shared_per_origin():
+    a = http.get_session("https://crs.example.com/admin/openai-accounts")
+    b = http.get_session("https://CRS.example.com:443/admin/other")
+    c = http.get_session("http://crs.example.com/admin/openai-accounts")
+
+    assert a is b
+    assert a is not c
+
+
+def test_request_stats_count_retries():
+    calls = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            calls.append(self.path)
+            status = 503 if len(calls) == 1 else 200
+            self.send_response(status)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        url = f"http://127.0.0.1:{server.server_port}/ping"
+        response = http.HttpClient().get(url, timeout=5)
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert response.status_code == 200
+    assert len(calls) == 2
+
+    stats = http.get_http_stats()[http.origin_of(url)]
+    assert stats["requests"] == 1
+    assert stats["retries"] == 1
+    assert stats["errors"] == 0
+    assert stats["max_time"] >= stats["avg_time"] > 0
+
+
+def _allowed(url: str) -> set:
+    return set(http.get_session(url).get_adapter(url).max_retries.allowed_methods)
+
+
+def test_retry_methods_per_origin():
+    with (
+        patch.dict(http._retry_methods, clear=True),
+        patch.object(
+            http,
+            "HTTP_RETRY_METHODS_BY_HOST",
+            {"https://crs.example.com": ["GET", "PUT"]},
+        ),
+    ):
+        http.set_retry_methods("https://s2a.example.com/api", ["get", "put", "delete"])
+
+        team = _allowed("https://chatgpt.com/backend-api/accounts")
+        assert "GET" in team and "PUT" not in team and "DELETE" not in team
+        assert _allowed("https://s2a.example.com/admin/accounts") == {"GET", "PUT", "DELETE"}
+        assert _allowed("https://crs.example.com/admin") == {"GET", "PUT"}
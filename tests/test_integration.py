@@ -61,6 +61,7 @@ def test_full_flow_crs_provider():
         patch("src.core.workflow.check_account_stored", return_value={"exists": False}),
         patch("src.core.workflow.crs_add_account", return_value={"id": "crs-1"}),
         patch("src.core.workflow.save_team_tracker"),
+        patch("src.core.workflow.checkpoint_team_tracker"),
         patch("src.core.workflow.save_to_csv"),
         patch("src.core.workflow.time.sleep"),
         patch("src.core.workflow.random.randint", return_value=0),
@@ -108,6 +109,7 @@ def test_full_flow_cpa_provider():
         ),
         patch("src.core.workflow.check_account_stored", return_value={"exists": False}),
         patch("src.core.workflow.save_team_tracker"),
+        patch("src.core.workflow.checkpoint_team_tracker"),
         patch("src.core.workflow.save_to_csv"),
         patch("src.core.workflow.time.sleep"),
         patch("src.core.workflow.random.randint", return_value=0),
@@ -157,6 +159,7 @@ def test_full_flow_s2a_provider():
             return_value={"id": "s2a-1"},
         ),
         patch("src.core.workflow.save_team_tracker"),
+        patch("src.core.workflow.checkpoint_team_tracker"),
         patch("src.core.workflow.save_to_csv"),
         patch("src.core.workflow.time.sleep"),
         patch("src.core.workflow.random.randint", return_value=0),
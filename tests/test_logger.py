@@ -0,0 +1,152 @@
+# ==================== Logger 测试 ====================
+# 测试异步 (QueueHandler) 日志模式与分段轮转
+
+"""Test Logger
+
+测试用例:
+    - test_async_logger_flush_writes_all_records: 测试异步模式 flush 后日志全部写入文件
+    - test_queue_handler_drop_policy_counts_dropped: 测试 drop 策略在队列满时丢弃并计数
+    - test_async_logger_keeps_traceback: 测试异步模式下异常堆栈写入日志文件
+    - test_logger_registers_atexit_once: 测试重复初始化日志器只注册一次退出处理
+    - test_segmented_handler_compresses_and_keeps_backups: 测试轮转段后台压缩并只保留 backup_count 段
+    - test_segmented_handler_time_rollover_and_budget: 测试按时间轮转与目录总大小预算
+"""
+
+import gzip
+import logging
+import queue
+import time
+from unittest.mock import patch
+
+import src.core.logger as logger_module
+from src.core.logger import (
+    Logger,
+    _BoundedQueueHandler,
+    _parse_rotate_interval,
+    _SegmentedFileHandler,
+)
+
+
+def test_async_logger_flush_writes_all_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger_module, "LOG_FILE", tmp_path / "app.log")
+
+    test_log = Logger(name="test-async", use_color=False, async_mode=True, queue_size=8)
+    try:
+        for i in range(50):
+            test_log.info(f"message {i}")
+        test_log.flush()
+
+        lines = (tmp_path / "app.log").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 50
+        assert lines[-1].endswith("message 49")
+
+        # flush 之后仍继续异步写入
+        test_log.warning("after flush")
+        test_log.flush()
+        assert "after flush" in (tmp_path / "app.log").read_text(encoding="utf-8")
+        assert test_log.dropped == 0
+    finally:
+        test_log._stop_listener()
+
+
+def test_queue_handler_drop_policy_counts_dropped():
+    handler = _BoundedQueueHandler(queue.Queue(maxsize=1), policy="drop")
+    for i in range(3):
+        handler.handle(
+            logging.LogRecord("test", logging.INFO, __file__, 0, "msg %s", (i,), None)
+        )
+
+    assert handler.dropped == 2
+    assert handler.queue.get_nowait().getMessage() == "msg 0"
+
+
+def test_async_logger_keeps_traceback(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger_module, "LOG_FILE", tmp_path / "app.log")
+
+    test_log = Logger(name="test-async-exc", use_color=False, async_mode=True)
+    try:
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            test_log.exception("处理失败")
+        test_log.flush()
+    finally:
+        test_log._stop_listener()
+
+    content = (tmp_path / "app.log").read_text(encoding="utf-8")
+    assert "处理失败\nTraceback (most recent call last):" in content
+    assert "ValueError: boom" in content
+
+
+def test_logger_registers_atexit_once(tmp_path, monkeypatch):
+    monkeypatch.setattr(logger_module, "LOG_DIR", tmp_path)
+    monkeypatch.setattr(logger_module, "LOG_FILE", tmp_path / "app.log")
+    monkeypatch.setenv("LOG_COMPRESS", "1")
+
+    with patch.object(logger_module.atexit, "register") as register:
+        test_log = Logger(name="test-atexit", use_color=False, async_mode=True)
+        try:
+            for _ in range(3):
+                test_log._setup_logger()
+        finally:
+            test_log._stop_listener()
+
+    assert isinstance(test_log._handlers[-1], _SegmentedFileHandler)
+    register.assert_called_once_with(test_log._at_exit)
+
+
+def _record(message: str) -> logging.LogRecord:
+    return logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_segmented_handler_compresses_and_keeps_backups(tmp_path):
+    handler = _SegmentedFileHandler(
+        tmp_path / "app.log", max_bytes=200, backup_count=3, compress=True
+    )
+    try:
+        for i in range(60):
+            handler.emit(_record(f"message {i:03d} " + "x" * 20))
+        assert handler.wait_maintenance(timeout=10)
+
+        segments = handler.segments()
+        assert len(segments) == 3
+        assert all(path.name.endswith(".gz") for path in segments)
+        assert not list(tmp_path.glob("*.tmp"))
+
+        # 保留的是最新的段，与当前文件首尾相接
+        newest = gzip.open(segments[-1], "rt", encoding="utf-8").read().splitlines()
+        current = (tmp_path / "app.log").read_text(encoding="utf-8").splitlines()
+        assert int(newest[-1].split()[1]) + 1 == int(current[0].split()[1])
+        assert current[-1].startswith("message 059")
+    finally:
+        handler.close()
+
+
+def test_segmented_handler_time_rollover_and_budget(tmp_path):
+    assert _parse_rotate_interval("6h") == 6 * 3600
+    assert _parse_rotate_interval("midnight") == "midnight"
+    assert _parse_rotate_interval("soon") is None
+
+    (tmp_path / "events.jsonl").write_text("e" * 300, encoding="utf-8")
+    handler = _SegmentedFileHandler(
+        tmp_path / "app.log", when=3600, budget_bytes=700, budget_dir=tmp_path
+    )
+    try:
+        for round_index in range(4):
+            handler.emit(_record(f"round {round_index} " + "y" * 240))
+            # 到达轮转时间点
+            handler.next_rollover = time.time() - 1
+        handler.emit(_record("last"))
+        assert handler.wait_maintenance(timeout=10)
+
+        # 预算内只剩最新的轮转段
+        segments = handler.segments()
+        assert len(segments) == 1
+        assert "round 3" in segments[0].read_text(encoding="utf-8")
+        total = sum(path.stat().st_size for path in tmp_path.iterdir())
+        assert total <= 700
+        assert handler.next_rollover > time.time()
+    finally:
+        handler.close()
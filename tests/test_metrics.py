@@ -0,0 +1,85 @@
+# ==================== 运行指标测试 ====================
+# 测试 Prometheus 指标的生成、textfile 写入与 HTTP 端口
+
+"""Test Metrics
+
+测试用例:
+    - test_tracker_metrics_from_save: 测试保存追踪记录后导出账号状态与保存耗时 (不重新读取追踪记录)
+    - test_provider_and_http_metrics_served: 测试入库查询耗时与 HTTP 重试次数通过端口导出
+"""
+
+import urllib.request
+from unittest.mock import patch
+
+import pytest
+
+import src.core.tracker_store as tracker_store
+from src.core import http
+from src.core.metrics import render_metrics, reset_metrics, serve_metrics, write_textfile
+from src.core.storage_manager import check_account_stored, update_storage_status
+from src.core.tracker_store import JsonTrackerStore
+from src.core.utils import add_account_to_tracker, load_team_tracker, save_team_tracker
+from tests.fake_providers import FakeProviderServer, fake_email, use_fake_providers
+
+
+@pytest.fixture
+def json_store(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    tracker_store.reset_tracker_store(store)
+    reset_metrics()
+    yield store
+    tracker_store.reset_tracker_store()
+    reset_metrics()
+
+
+def test_tracker_metrics_from_save(json_store, tmp_path):
+    tracker = load_team_tracker()
+    add_account_to_tracker(tracker, "alpha", "a@example.com", "completed")
+    add_account_to_tracker(tracker, "alpha", "b@example.com")
+    add_account_to_tracker(tracker, 'beta "x"', "c@example.com")
+    update_storage_status(tracker, "alpha", "a@example.com", "crs", {"exists": True})
+    save_team_tracker(tracker)
+
+    with patch("src.core.status.load_team_tracker") as load:
+        text = render_metrics()
+    load.assert_not_called()
+
+    lines = text.splitlines()
+    assert 'oai_accounts{team="alpha",status="completed"} 1' in lines
+    assert 'oai_accounts{team="alpha",status="invited"} 1' in lines
+    assert 'oai_accounts{team="beta \\"x\\"",status="invited"} 1' in lines
+    assert 'oai_storage_accounts{team="alpha",provider="crs",status="stored"} 1' in lines
+    assert 'oai_storage_accounts{team="alpha",provider="cpa",status="not_stored"} 2' in lines
+    assert 'oai_stage_duration_seconds_count{stage="tracker_save"} 1' in lines
+    assert 'oai_stage_duration_seconds_bucket{stage="tracker_save",le="+Inf"} 1' in lines
+    assert any(line.startswith("oai_tracker_last_updated_timestamp_seconds ") for line in lines)
+
+    path = write_textfile(tmp_path / "textfile" / "oai.prom")
+    content = open(path, encoding="utf-8").read()
+    assert 'oai_accounts{team="alpha",status="completed"} 1' in content
+    assert [p.name for p in (tmp_path / "textfile").iterdir()] == ["oai.prom"]
+
+
+def test_provider_and_http_metrics_served(json_store):
+    http.reset_http_stats()
+    with FakeProviderServer(accounts=3) as server, use_fake_providers(server, inventory_ttl=0):
+        origin = http.origin_of(server.url)
+        server.fail_next(1, 503)
+        assert check_account_stored(fake_email(1), "crs")["exists"]
+
+        metrics_server = serve_metrics(0)
+        try:
+            port = metrics_server.server_address[1]
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics", timeout=5) as response:
+                assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+                text = response.read().decode("utf-8")
+        finally:
+            metrics_server.shutdown()
+            metrics_server.server_close()
+
+    lines = text.splitlines()
+    assert f'oai_http_retries_total{{origin="{origin}"}} 1' in lines
+    assert f'oai_http_requests_total{{origin="{origin}"}} 1' in lines
+    assert 'oai_provider_query_duration_seconds_count{provider="crs"} 1' in lines
+    assert 'oai_stage_duration_seconds_count{stage="storage_check"} 1' in lines
+    http.reset_http_stats()
@@ -0,0 +1,124 @@
+# ==================== 流式迁移测试 ====================
+# 测试 scripts/migrate_tracker.py --stream
+
+"""Test Migrate Tracker Stream
+
+测试用例:
+    - test_stream_matches_in_memory_migration: 测试流式迁移与整文件迁移结果一致
+    - test_stream_resumes_from_checkpoint: 测试中断后从检查点继续
+"""
+
+import importlib.util
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location(
+        "migrate_tracker_stream_script", ROOT / "scripts" / "migrate_tracker.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _legacy_tracker() -> dict:
+    teams = {}
+    for t in range(6):
+        teams[f"团队-{t}"] = [
+            {"email": f"user{t}-{i}@example.com", "status": "completed", "note": "注册 ✓"}
+            for i in range(t + 1)
+        ]
+    teams["empty"] = []
+    teams["broken"] = None
+    return {"last_updated": "2024-01-01 00:00:00", "teams": teams, "counter": 12345}
+
+
+@pytest.fixture
+def script():
+    return _load_script()
+
+
+def _write(path: Path, data: dict):
+    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def test_stream_matches_in_memory_migration(tmp_path, script):
+    in_memory = tmp_path / "memory.json"
+    streamed = tmp_path / "stream.json"
+    _write(in_memory, _legacy_tracker())
+    _write(streamed, _legacy_tracker())
+
+    backup = ["--backup-dir", str(tmp_path / "backup")]
+    assert script.main(["--file", str(in_memory), *backup]) == 0
+    assert (
+        script.main(["--file", str(streamed), "--stream", "--chunk-size", "64", *backup])
+        == 0
+    )
+
+    expected = json.loads(in_memory.read_text(encoding="utf-8"))
+    assert json.loads(streamed.read_text(encoding="utf-8")) == expected
+    assert not (tmp_path / "stream.json.migrating").exists()
+    assert not (tmp_path / "stream.json.migrating.progress").exists()
+
+    # 已是最新格式时不再改写
+    before = streamed.read_bytes()
+    assert script.main(["--file", str(streamed), "--stream", *backup]) == 0
+    assert streamed.read_bytes() == before
+
+
+def test_stream_resumes_from_checkpoint(tmp_path, script):
+    tracker_path = tmp_path / "tracker.json"
+    _write(tracker_path, _legacy_tracker())
+    args = [
+        "--file",
+        str(tracker_path),
+        "--stream",
+        "--checkpoint-every",
+        "1",
+        "--chunk-size",
+        "50",
+        "--backup-dir",
+        str(tmp_path / "backup"),
+    ]
+
+    migrate_team = script._migrate_team
+    calls = []
+
+    def failing_migrate_team(team_name, accounts):
+        calls.append(team_name)
+        if len(calls) == 4:
+            raise KeyboardInterrupt
+        return migrate_team(team_name, accounts)
+
+    with patch.object(script, "_migrate_team", side_effect=failing_migrate_team):
+        with pytest.raises(KeyboardInterrupt):
+            script.main(args)
+
+    progress = json.loads(
+        (tmp_path / "tracker.json.migrating.progress").read_text(encoding="utf-8")
+    )
+    assert progress["totals"]["teams"] == 3
+    assert progress["meta"] == {"last_updated": "2024-01-01 00:00:00"}
+
+    resumed = []
+    with patch.object(
+        script,
+        "_migrate_team",
+        side_effect=lambda name, accounts: resumed.append(name)
+        or migrate_team(name, accounts),
+    ):
+        assert script.main(args) == 0
+
+    assert resumed[0] == "团队-3"
+    expected_path = tmp_path / "expected.json"
+    _write(expected_path, _legacy_tracker())
+    assert script.main(["--file", str(expected_path), "--backup-dir", str(tmp_path)]) == 0
+    assert json.loads(tracker_path.read_text(encoding="utf-8")) == json.loads(
+        expected_path.read_text(encoding="utf-8")
+    )
@@ -0,0 +1,123 @@
+# ==================== 迁移记录存储测试 ====================
+# 测试追加日志、快照压缩与索引查询
+
+"""Test Migration Store
+
+测试用例:
+    - test_upserts_append_to_log_and_replay: 测试写入只追加日志，重新加载时按日志重放并可压缩为快照
+    - test_filters_paging_and_bulk_execute: 测试按状态 / 能力筛选、分页与批量创建一次性追加
+    - test_filtered_listing_keeps_creation_order: 测试状态变化后筛选结果仍按创建顺序
+    - test_cli_list_is_unbounded_by_default: 测试 migrate --list 默认列出全部记录，offset 超出时给出提示
+"""
+
+import json
+from unittest.mock import patch
+
+from src.cli.main import main
+from src.core.migration import execute_migrations
+from src.core.migration_store import MigrationStore
+from src.core.models import MigrationRequest
+
+
+def _log_lines(store: MigrationStore) -> list[dict]:
+    if not store.log_path.exists():
+        return []
+    return [json.loads(line) for line in store.log_path.read_text(encoding="utf-8").splitlines()]
+
+
+def test_upserts_append_to_log_and_replay(tmp_path):
+    path = tmp_path / "migration_records.json"
+    store = MigrationStore(path)
+    store.create_record("r1", "old/a", "new/a", capability_id="cap-1")
+    store.create_record("r2", "old/b", "new/b")
+    store.verify("r1", "alice", "ok")
+
+    assert not path.exists()
+    assert [entry["record"]["id"] for entry in _log_lines(store)] == ["r1", "r2", "r1"]
+
+    # 末行写入中断
+    with open(store.log_path, "a", encoding="utf-8") as f:
+        f.write('{"op": "upsert", "record": {"id"')
+
+    reloaded = MigrationStore(path)
+    assert reloaded.get_record("r1").status == "verified"
+    assert reloaded.get_record("r1").verified_by == "alice"
+    assert [record.id for record in reloaded.list_records(status="pending")] == ["r2"]
+
+    reloaded.compact()
+    assert not reloaded.log_path.exists()
+    snapshot = json.loads(path.read_text(encoding="utf-8"))
+    assert [item["id"] for item in snapshot["records"]] == ["r1", "r2"]
+
+    # 超过阈值时自动压缩
+    small = MigrationStore(path, compact_threshold=2)
+    small.create_record("r3", "old/c", "new/c")
+    assert small.log_path.exists()
+    small.create_record("r4", "old/d", "new/d")
+    assert not small.log_path.exists()
+    assert [record.id for record in MigrationStore(path).list_records()] == ["r1", "r2", "r3", "r4"]
+
+
+def test_filters_paging_and_bulk_execute(tmp_path):
+    store = MigrationStore(tmp_path / "migration_records.json")
+    for index in range(6):
+        store.create_record(
+            f"r{index}", f"old/{index}", f"new/{index}", capability_id=f"cap-{index % 2}"
+        )
+    store.verify("r2", "bob")
+    store.verify("r3", "bob")
+
+    assert [r.id for r in store.list_records(status="pending")] == ["r0", "r1", "r4", "r5"]
+    assert [r.id for r in store.list_records(capability_id="cap-0")] == ["r0", "r2", "r4"]
+    assert [r.id for r in store.list_records(status="verified", capability_id="cap-1")] == ["r3"]
+    assert [r.id for r in store.list_records(offset=2, limit=3)] == ["r2", "r3", "r4"]
+    assert store.count_records(status="pending") == 4
+    assert store.count_records(status="failed") == 0
+
+    before = len(_log_lines(store))
+    requests = [MigrationRequest(f"legacy/{i}", f"target/{i}") for i in range(50)]
+    records = execute_migrations(requests, store=store)
+
+    lines = _log_lines(store)
+    assert len(records) == 50
+    assert len(lines) == before + 50
+    assert len({entry["ts"] for entry in lines[before:]}) == 1
+    assert store.count_records(status="migrated") == 50
+
+
+def test_filtered_listing_keeps_creation_order(tmp_path):
+    path = tmp_path / "migration_records.json"
+    store = MigrationStore(path)
+    for index in range(4):
+        store.create_record(f"r{index}", f"old/{index}", f"new/{index}")
+    store.verify("r3", "bob")
+    store.verify("r1", "bob")
+    store.verify("r0", "bob")
+
+    assert [r.id for r in store.list_records(status="verified")] == ["r0", "r1", "r3"]
+    assert [r.id for r in store.list_records(status="verified", offset=1, limit=1)] == ["r1"]
+    # 重新加载 (重放日志) 后顺序相同
+    reloaded = MigrationStore(path)
+    assert [r.id for r in reloaded.list_records(status="verified")] == ["r0", "r1", "r3"]
+
+
+def test_cli_list_is_unbounded_by_default(tmp_path):
+    store = MigrationStore(tmp_path / "migration_records.json")
+    with store.batch():
+        for index in range(60):
+            store.create_record(f"r{index:03d}", f"old/{index}", f"new/{index}")
+
+    with (
+        patch("src.core.migration_store.BASE_DIR", tmp_path),
+        patch("src.cli.commands.migrate.log") as log,
+    ):
+        assert main(["migrate", "--list"]) == 0
+        messages = [call.args[0] for call in log.info.call_args_list]
+        assert len(messages) == 61
+        assert messages[-1] == "显示 1-60 / 共 60 条"
+
+        log.reset_mock()
+        assert main(["migrate", "--list", "--offset", "100"]) == 0
+        assert [call.args[0] for call in log.info.call_args_list] == [
+            "--offset 100 超出记录总数 (60 条)"
+        ]
@@ -0,0 +1,77 @@
+# ==================== Profiler 测试 ====================
+# 测试 Timer span 与阶段耗时统计
+
+"""Test Profiler
+
+测试用例:
+    - test_nested_timers_record_parent_spans: 测试嵌套 Timer 记录父 span 与父阶段
+    - test_profile_percentiles_and_report: 测试 p50 / p95 / max 统计与 JSON 输出
+"""
+
+import json
+from unittest.mock import patch
+
+import pytest
+
+from src.core.profiler import (
+    end_span,
+    format_profile,
+    get_profile,
+    reset_profile,
+    start_span,
+    write_profile,
+)
+from src.core.utils import Timer
+
+
+@pytest.fixture(autouse=True)
+def clean_profile():
+    reset_profile()
+    yield
+    reset_profile()
+
+
+def test_nested_timers_record_parent_spans():
+    with patch("src.core.utils.emit_event") as emit:
+        with Timer(stage="account", email="a@example.com") as outer:
+            with Timer(stage="tracker_save", event=False) as inner:
+                pass
+            with Timer(stage="provider_add.crs") as add:
+                pass
+
+    assert outer.parent_id is None
+    assert inner.parent_id == outer.span_id
+    assert add.parent_id == outer.span_id
+    # event=False 的 span 不产生事件
+    assert [call.args[0] for call in emit.call_args_list] == [
+        "provider_add.crs",
+        "account",
+    ]
+    assert emit.call_args_list[0].kwargs["parent_id"] == outer.span_id
+
+    profile = get_profile()
+    assert profile["account"]["parent"] is None
+    assert profile["tracker_save"]["parent"] == "account"
+    assert [line.split()[0] for line in format_profile(profile)[1:]] == [
+        "account",
+        "tracker_save",
+        "provider_add.crs",
+    ]
+
+
+def test_profile_percentiles_and_report(tmp_path):
+    for seconds in range(1, 21):
+        span_id, _ = start_span("storage_check")
+        end_span(span_id, "storage_check", seconds / 10)
+
+    stats = get_profile()["storage_check"]
+    assert stats["count"] == 20
+    assert stats["p50_ms"] == 1000.0
+    assert stats["p95_ms"] == 1900.0
+    assert stats["max_ms"] == 2000.0
+    assert stats["total_ms"] == 21000.0
+
+    path = write_profile(str(tmp_path / "profile.json"), run_id="run-1")
+    saved = json.loads(open(path, encoding="utf-8").read())
+    assert saved["run_id"] == "run-1"
+    assert saved["stages"]["storage_check"] == stats
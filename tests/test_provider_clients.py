@@ -0,0 +1,90 @@
+# ==================== 服务商客户端测试 ====================
+# 使用本地模拟服务器测试 CRS / CPA / S2A 客户端的真实请求与响应处理
+
+"""Test Provider Clients
+
+测试用例:
+    - test_clients_against_fake_server: 测试三个服务商的账号查询、分页与接口回退
+    - test_error_injection_and_reconcile: 测试断连 / 5xx 重试与批量核对
+"""
+
+import pytest
+
+from src.auth.cpa.client import cpa_query_account
+from src.auth.crs.client import crs_add_account, crs_query_account
+from src.auth.s2a.client import s2a_get_groups, s2a_iter_accounts, s2a_query_account
+from src.core import http
+from src.core.storage_manager import check_account_stored, reconcile_storage
+from tests.fake_providers import FakeProviderServer, fake_email, use_fake_providers
+
+
+@pytest.fixture(autouse=True)
+def clean_http_stats():
+    http.reset_http_stats()
+    yield
+    http.reset_http_stats()
+
+
+def test_clients_against_fake_server():
+    server = FakeProviderServer(accounts=250, cpa_endpoint="/v0/management/account-list")
+    with server, use_fake_providers(server, inventory_ttl=300):
+        found = crs_query_account(fake_email(249).upper())
+        assert found["exists"] is True
+        assert found["account_id"] == "crs-249"
+        assert crs_query_account("nobody@example.com")["exists"] is False
+
+        # 第一个 CPA 列表接口 404 时回退到第二个
+        assert cpa_query_account(fake_email(3))["account_id"] == "cpa-3"
+        assert server.requests["/v0/management/accounts"] == 1
+
+        assert len(list(s2a_iter_accounts(page_size=100))) == 250
+        assert server.requests["/admin/accounts"] == 3
+        assert s2a_query_account(fake_email(120))["account_id"] == 121
+        assert [group["id"] for group in s2a_get_groups()] == [1, 2]
+
+        # 新入库的账号可被查询到
+        assert crs_add_account("new@example.com", {"access_token": "a"})
+        assert crs_query_account("new@example.com")["exists"] is True
+
+        # TTL 内多次查询只拉取一次清单
+        before = server.requests["/admin/accounts"]
+        for index in (0, 10, 200):
+            assert check_account_stored(fake_email(index), "s2a")["exists"] is True
+        assert check_account_stored("nobody@example.com", "s2a")["exists"] is False
+        assert server.requests["/admin/accounts"] - before == 3
+
+
+def test_error_injection_and_reconcile():
+    server = FakeProviderServer(crs_accounts=5, cpa_accounts=0, s2a_accounts=0)
+    with server, use_fake_providers(server, inventory_ttl=0):
+        # 断连 / 503: 共享 Session 的重试策略透明重试，并计入统计
+        server.fail_next(1, status=0)
+        server.fail_next(2, status=503)
+        assert crs_query_account(fake_email(1))["exists"] is True
+        stats = http.get_http_stats()[http.origin_of(server.url)]
+        assert stats["retries"] == 3
+        assert stats["requests"] == 1
+
+        # 只有一层重试: Session 重试耗尽后直接失败，不再由客户端叠加重试
+        http.reset_http_stats()
+        server.fail_next(http.HTTP_MAX_RETRIES + 1, status=0)
+        assert crs_query_account(fake_email(2))["exists"] is False
+        stats = http.get_http_stats()[http.origin_of(server.url)]
+        assert stats["retries"] == http.HTTP_MAX_RETRIES + 1
+        assert stats["requests"] == 1
+        assert crs_query_account(fake_email(2))["exists"] is True
+
+        tracker = {
+            "teams": {
+                "team-a": [
+                    {"email": fake_email(0), "storage_status": {"crs": {"status": "not_stored"}}},
+                    {"email": "missing@example.com", "storage_status": {}},
+                ]
+            }
+        }
+        report = reconcile_storage(tracker, ["crs"])["crs"]
+
+    assert [entry["email"] for entry in report["stored"]] == [fake_email(0)]
+    assert [entry["email"] for entry in report["missing"]] == ["missing@example.com"]
+    assert report["orphaned"] == [fake_email(i) for i in range(1, 5)]
+    assert tracker["teams"]["team-a"][0]["storage_status"]["crs"]["account_id"] == "crs-0"
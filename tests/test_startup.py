@@ -0,0 +1,97 @@
+# ==================== CLI 启动测试 ====================
+# 测试只读子命令的导入开销 (-X importtime)
+
+"""Test Startup
+
+只读子命令 (status / validate / metrics) 不应加载浏览器栈、HTTP 客户端或 workflow，
+并且 status 冷启动的导入耗时需控制在预算内。
+预算可通过环境变量 STATUS_STARTUP_BUDGET_MS 调整 (默认 1500ms)。
+
+测试用例:
+    - test_read_only_commands_skip_heavy_imports: 测试只读子命令不导入重量级模块
+    - test_status_cold_start_budget: 测试 status 冷启动导入耗时预算
+"""
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+
+HEAVY_MODULES = (
+    "DrissionPage",
+    "requests",
+    "urllib3",
+    "rich",
+    "src.core.workflow",
+    "src.automation",
+)
+STARTUP_BUDGET_MS = int(os.environ.get("STATUS_STARTUP_BUDGET_MS", "1500"))
+# 子进程在仓库目录运行真实命令，status 会写入状态统计缓存
+GENERATED_FILES = ("team_tracker.json", "team_tracker.json.lock", "team_tracker.stats.json")
+
+
+@pytest.fixture(autouse=True)
+def remove_generated_files():
+    existing = {name for name in GENERATED_FILES if (ROOT / name).exists()}
+    yield
+    for name in GENERATED_FILES:
+        if name not in existing:
+            (ROOT / name).unlink(missing_ok=True)
+
+
+def _importtime(*args: str) -> list:
+    """以 -X importtime 运行 main.py
+
+    Returns:
+        list: [(模块名, 累计导入耗时 us, 是否顶层导入)]
+    """
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", str(ROOT / "main.py"), *args],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    assert proc.returncode in (0, 1), proc.stderr[-2000:]
+
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue
+        name = parts[2].rstrip()
+        # 每层嵌套缩进 2 个空格，顶层导入为 " " + 2 个空格
+        indent = len(name) - len(name.lstrip())
+        modules.append((name.strip(), int(parts[1]), indent <= 3))
+    return modules
+
+
+@pytest.mark.parametrize("command", ["status", "validate", "metrics"])
+def test_read_only_commands_skip_heavy_imports(command):
+    names = [name for name, _, _ in _importtime(command)]
+
+    assert "src.cli.main" in names
+    loaded = sorted(
+        name
+        for name in names
+        if any(name == heavy or name.startswith(f"{heavy}.") for heavy in HEAVY_MODULES)
+    )
+    assert loaded == []
+
+
+def test_status_cold_start_budget():
+    modules = _importtime("status")
+
+    # 从第一个项目模块开始计算，解释器自身 (site 等) 的启动导入不计入预算
+    first = next(i for i, (name, _, _) in enumerate(modules) if name.startswith("src"))
+    startup_ms = sum(
+        cumulative for _, cumulative, top_level in modules[first:] if top_level
+    ) / 1000
+
+    assert startup_ms <= STARTUP_BUDGET_MS, f"status 冷启动导入耗时 {startup_ms:.0f}ms"
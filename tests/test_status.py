@@ -0,0 +1,135 @@
+# ==================== Status 测试 ====================
+# 测试 status 命令的统计缓存
+
+"""Test Status
+
+测试用例:
+    - test_status_reads_cached_stats: 测试 status 直接读取统计缓存，不加载追踪记录
+    - test_status_rebuilds_stale_stats: 测试追踪记录被外部修改后重新统计
+    - test_sqlite_stats_cache_hits_across_processes: 测试 SQLite 后端的统计缓存在其他进程中命中，写入后失效
+    - test_write_behind_save_defers_stats: 测试 write_behind 模式下逐账号保存不重写统计缓存，checkpoint 时写入
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import src.core.tracker_store as tracker_store
+from src.core.status import load_status_stats
+from src.core.tracker_store import JsonTrackerStore, SqliteTrackerStore
+from src.core.utils import (
+    add_account_to_tracker,
+    checkpoint_team_tracker,
+    load_team_tracker,
+    save_team_tracker,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def json_store(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    tracker_store.reset_tracker_store(store)
+    yield store
+    tracker_store.reset_tracker_store()
+
+
+def test_status_reads_cached_stats(json_store):
+    tracker = load_team_tracker()
+    add_account_to_tracker(tracker, "alpha", "a@example.com", "completed")
+    add_account_to_tracker(tracker, "alpha", "b@example.com")
+    save_team_tracker(tracker)
+
+    with patch("src.core.status.load_team_tracker") as load:
+        stats = load_status_stats()
+
+    load.assert_not_called()
+    assert stats["teams"]["alpha"]["invitation"] == {"completed": 1, "invited": 1}
+    assert stats["last_updated"] == tracker["last_updated"]
+
+
+def test_status_rebuilds_stale_stats(json_store):
+    tracker = load_team_tracker()
+    add_account_to_tracker(tracker, "alpha", "a@example.com")
+    save_team_tracker(tracker)
+
+    # 绕过 save_team_tracker 直接修改追踪记录文件
+    data = json.loads(open(json_store.path, encoding="utf-8").read())
+    data["teams"]["alpha"][0]["invitation_status"] = "completed"
+    data["teams"]["beta"] = [{"email": "c@example.com", "invitation_status": "invited"}]
+    with open(json_store.path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+
+    stats = load_status_stats()
+
+    assert stats["teams"]["alpha"]["invitation"] == {"completed": 1}
+    assert stats["teams"]["beta"]["total"] == 1
+    # 重新统计后缓存已刷新
+    with patch("src.core.status.load_team_tracker") as load:
+        assert load_status_stats()["teams"] == stats["teams"]
+    load.assert_not_called()
+
+
+def _cache_hit_in_subprocess(db_path) -> bool:
+    code = (
+        "import sys\n"
+        "from src.core.tracker_store import SqliteTrackerStore, read_tracker_stats\n"
+        "store = SqliteTrackerStore(sys.argv[1])\n"
+        "print(read_tracker_stats(store) is not None)\n"
+        "store.close()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code, str(db_path)],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return result.stdout.strip().splitlines()[-1] == "True"
+
+
+def test_sqlite_stats_cache_hits_across_processes(tmp_path):
+    db_path = tmp_path / "tracker.db"
+    tracker_store.reset_tracker_store(SqliteTrackerStore(db_path))
+    try:
+        tracker = load_team_tracker()
+        add_account_to_tracker(tracker, "alpha", "a@example.com")
+        save_team_tracker(tracker)
+    finally:
+        # 关闭最后一个连接会合并并删除 -wal 文件，其他进程打开时再重新创建
+        tracker_store.reset_tracker_store()
+
+    assert _cache_hit_in_subprocess(db_path)
+    assert _cache_hit_in_subprocess(db_path)
+
+    # 其他连接写入账号行后缓存失效
+    store = SqliteTrackerStore(db_path)
+    store.record_account("alpha", {"email": "b@example.com", "invitation_status": "invited"})
+    store.close()
+    assert not _cache_hit_in_subprocess(db_path)
+
+
+def test_write_behind_save_defers_stats(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json", write_behind=True)
+    tracker_store.reset_tracker_store(store)
+    tracker = load_team_tracker()
+
+    with patch("src.core.utils.write_tracker_stats") as write_stats:
+        for i in range(3):
+            add_account_to_tracker(tracker, "alpha", f"user{i}@example.com", "completed")
+            save_team_tracker(tracker)
+    write_stats.assert_not_called()
+
+    # 统计缓存缺失 / 过期时 status 仍然重新统计得到正确结果
+    assert load_status_stats()["teams"]["alpha"]["invitation"] == {"completed": 3}
+
+    checkpoint_team_tracker(tracker)
+    with patch("src.core.status.load_team_tracker") as load:
+        stats = load_status_stats()
+    load.assert_not_called()
+    assert stats["teams"]["alpha"]["invitation"] == {"completed": 3}
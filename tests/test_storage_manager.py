@@ -8,18 +8,37 @@
     - test_get_enabled_providers: 测试获取启用的服务商
     - test_check_account_stored: 测试入库状态查询
     - test_update_storage_status: 测试状态更新
+    - test_check_account_stored_uses_inventory_cache: 测试账号清单在 TTL 内只拉取一次
+    - test_record_provider_account_patches_cache: 测试新入库账号写入清单缓存
+    - test_inventory_fetch_failure_falls_back: 测试清单拉取失败时回退逐个查询
+    - test_inventory_fetch_failure_backs_off: 测试清单拉取失败后在退避时间内不再重复拉取
+    - test_reconcile_storage: 测试批量核对入库状态与差异报告
+    - test_reconcile_dry_run_leaves_store_untouched: 测试 dry-run 不修改 tracker / SQLite / write-behind 日志，实际核对单事务提交
+    - test_s2a_iter_accounts_pages: 测试 S2A 账号列表分页遍历
+    - test_s2a_iter_accounts_without_pages: 测试响应缺少 pages 时按 total 截止、服务端忽略 page 时停止翻页
 """
 
 from unittest.mock import Mock, patch
 
+import pytest
+import requests
+
+import src.core.storage_manager as storage_manager
+import src.core.tracker_store as tracker_store
 from src.core.storage_manager import (
     _s2a_query_account,
     check_account_stored,
     get_enabled_providers,
     init_storage_status,
+    invalidate_provider_inventory,
+    reconcile_storage,
+    record_provider_account,
     update_storage_status,
 )
+from src.core.tracker_store import JsonTrackerStore, SqliteTrackerStore
+from src.core.utils import load_team_tracker
 from src.auth.crs.client import crs_query_account
+from src.auth.s2a.client import s2a_iter_accounts
 from src.auth.cpa.client import cpa_query_account
 
 
@@ -32,9 +51,25 @@ def test_init_storage_status():
     assert status["s2a"]["status"] == "not_stored"
 
 
-def test_get_enabled_providers():
-    import src.core.storage_manager as storage_manager
+def _crs_records(accounts: list):
+    for account in accounts:
+        yield {"email": account["name"].lower(), "id": account["id"], "raw": account}
 
+
+@pytest.fixture
+def crs_enabled():
+    invalidate_provider_inventory()
+    with (
+        patch.object(storage_manager, "CRS_API_BASE", "https://crs.example.com"),
+        patch.object(storage_manager, "CRS_ADMIN_TOKEN", "token"),
+        patch.object(storage_manager, "STORAGE_INVENTORY_TTL", 300),
+        patch.object(storage_manager, "STORAGE_INVENTORY_RETRY_AFTER", 60),
+    ):
+        yield
+    invalidate_provider_inventory()
+
+
+def test_get_enabled_providers():
     with (
         patch.object(storage_manager, "CRS_API_BASE", "https://crs.example.com"),
         patch.object(storage_manager, "CRS_ADMIN_TOKEN", "token"),
@@ -237,3 +272,235 @@ def test_cpa_query_account_api_failure():
         result = cpa_query_account("user@example.com")
 
     assert result == {"exists": False, "account_id": None, "account_data": None}
+
+
+def test_check_account_stored_uses_inventory_cache(crs_enabled):
+    accounts = [{"id": "acc-1", "name": "User@example.com"}]
+    with patch(
+        "src.core.storage_manager.crs_iter_accounts",
+        side_effect=lambda: _crs_records(accounts),
+    ) as fetch:
+        first = check_account_stored("user@example.com", "crs")
+        second = check_account_stored("other@example.com", "crs")
+
+    assert fetch.call_count == 1
+    assert first["exists"] is True
+    assert first["account_id"] == "acc-1"
+    assert second["exists"] is False
+
+
+def test_record_provider_account_patches_cache(crs_enabled):
+    with patch(
+        "src.core.storage_manager.crs_iter_accounts", side_effect=lambda: iter([])
+    ) as fetch:
+        assert check_account_stored("new@example.com", "crs")["exists"] is False
+        record_provider_account("crs", "New@example.com", "acc-9")
+        result = check_account_stored("new@example.com", "crs")
+
+    assert fetch.call_count == 1
+    assert result["exists"] is True
+    assert result["account_id"] == "acc-9"
+
+
+def test_inventory_fetch_failure_falls_back(crs_enabled):
+    with (
+        patch(
+            "src.core.storage_manager.crs_iter_accounts",
+            side_effect=requests.ConnectionError("down"),
+        ),
+        patch(
+            "src.core.storage_manager.crs_query_account",
+            return_value={"exists": True, "account_id": "acc-1"},
+        ) as query,
+    ):
+        result = check_account_stored("user@example.com", "crs")
+
+    query.assert_called_once_with("user@example.com")
+    assert result["exists"] is True
+
+
+def test_inventory_fetch_failure_backs_off(crs_enabled):
+    with (
+        patch(
+            "src.core.storage_manager.crs_iter_accounts",
+            side_effect=requests.ConnectionError("down"),
+        ) as fetch,
+        patch(
+            "src.core.storage_manager.crs_query_account",
+            return_value={"exists": False, "account_id": None},
+        ) as query,
+        patch("src.core.storage_manager.time.monotonic", return_value=1000.0) as clock,
+    ):
+        for i in range(5):
+            check_account_stored(f"user{i}@example.com", "crs")
+        assert fetch.call_count == 1
+        assert query.call_count == 5
+
+        # 退避结束后重新尝试拉取清单
+        clock.return_value = 1061.0
+        check_account_stored("late@example.com", "crs")
+        assert fetch.call_count == 2
+
+
+def test_reconcile_storage(crs_enabled):
+    tracker = {
+        "teams": {
+            "alpha": [
+                {"email": "stored@example.com"},
+                {
+                    "email": "gone@example.com",
+                    "storage_status": {"crs": {"status": "stored", "account_id": "x"}},
+                },
+                {
+                    "email": "same@example.com",
+                    "storage_status": {"crs": {"status": "stored", "account_id": "acc-2"}},
+                },
+            ]
+        }
+    }
+    accounts = [
+        {"id": "acc-1", "name": "stored@example.com"},
+        {"id": "acc-2", "name": "same@example.com"},
+        {"id": "acc-3", "name": "orphan@example.com"},
+    ]
+
+    with patch(
+        "src.core.storage_manager.crs_iter_accounts",
+        side_effect=lambda: _crs_records(accounts),
+    ) as fetch:
+        report = reconcile_storage(tracker, ["crs"])
+
+    assert fetch.call_count == 1
+    result = report["crs"]
+    assert [e["email"] for e in result["stored"]] == [
+        "stored@example.com",
+        "same@example.com",
+    ]
+    assert [e["email"] for e in result["missing"]] == ["gone@example.com"]
+    assert result["orphaned"] == ["orphan@example.com"]
+    assert [(c["email"], c["new"]) for c in result["changed"]] == [
+        ("stored@example.com", "stored"),
+        ("gone@example.com", "not_stored"),
+    ]
+
+    accounts_after = tracker["teams"]["alpha"]
+    assert accounts_after[0]["storage_status"]["crs"]["account_id"] == "acc-1"
+    assert accounts_after[1]["storage_status"]["crs"]["status"] == "not_stored"
+
+
+@pytest.mark.parametrize("backend", ["sqlite", "write_behind"])
+def test_reconcile_dry_run_leaves_store_untouched(crs_enabled, tmp_path, backend):
+    if backend == "sqlite":
+        store = SqliteTrackerStore(tmp_path / "tracker.db")
+    else:
+        store = JsonTrackerStore(tmp_path / "tracker.json", write_behind=True)
+    store.import_tracker(
+        {
+            "teams": {
+                "alpha": [
+                    {"email": "a@example.com", "storage_status": {"crs": {"status": "not_stored"}}},
+                    {"email": "b@example.com", "storage_status": {"crs": {"status": "not_stored"}}},
+                ]
+            }
+        }
+    )
+    tracker_store.reset_tracker_store(store)
+    accounts = [
+        {"id": "acc-1", "name": "a@example.com"},
+        {"id": "acc-2", "name": "b@example.com"},
+    ]
+    try:
+        tracker = load_team_tracker()
+        with patch(
+            "src.core.storage_manager.crs_iter_accounts",
+            side_effect=lambda: _crs_records(accounts),
+        ):
+            report = reconcile_storage(tracker, ["crs"], apply=False)
+            assert len(report["crs"]["changed"]) == 2
+            assert tracker["teams"]["alpha"][0]["storage_status"]["crs"]["status"] == "not_stored"
+            assert store.load()["teams"]["alpha"][0]["storage_status"]["crs"]["status"] == "not_stored"
+            if backend == "write_behind":
+                assert not (tmp_path / "tracker.json.journal").exists()
+
+            with patch.object(store, "batch", wraps=store.batch) as batch:
+                reconcile_storage(tracker, ["crs"])
+            batch.assert_called_once_with()
+    finally:
+        tracker_store.reset_tracker_store()
+
+    reopened = (
+        SqliteTrackerStore(tmp_path / "tracker.db")
+        if backend == "sqlite"
+        else JsonTrackerStore(tmp_path / "tracker.json", write_behind=True)
+    )
+    stored = reopened.load()["teams"]["alpha"]
+    reopened.close()
+    assert [acc["storage_status"]["crs"]["status"] for acc in stored] == ["stored", "stored"]
+
+
+def test_s2a_iter_accounts_pages():
+    def _page(items, page):
+        response = Mock()
+        response.status_code = 200
+        response.json.return_value = {
+            "code": 0,
+            "data": {"items": items, "total": 3, "page": page, "page_size": 2, "pages": 2},
+        }
+        return response
+
+    responses = [
+        _page(
+            [
+                {"id": 1, "name": "a@example.com", "credentials": {}},
+                {"id": 2, "name": "b", "credentials": {"email": "B@example.com"}},
+            ],
+            1,
+        ),
+        _page([{"id": 3, "name": "c@example.com"}], 2),
+    ]
+
+    with (
+        patch(
+            "src.auth.s2a.client.http_session.get", side_effect=responses
+        ) as get,
+        patch("src.auth.s2a.client.S2A_API_BASE", "https://s2a.example.com"),
+    ):
+        records = list(s2a_iter_accounts(page_size=2))
+
+    assert [(r["email"], r["id"]) for r in records] == [
+        ("a@example.com", 1),
+        ("b@example.com", 2),
+        ("c@example.com", 3),
+    ]
+    assert [c.kwargs["params"]["page"] for c in get.call_args_list] == [1, 2]
+
+
+def test_s2a_iter_accounts_without_pages():
+    items = [{"id": i, "name": f"user{i}@example.com"} for i in range(1, 5)]
+
+    def _serve(ignore_page, with_total):
+        def get(url, params=None, **kwargs):
+            page = 1 if ignore_page else params["page"]
+            size = params["page_size"]
+            data = {"items": items[(page - 1) * size : page * size]}
+            if with_total:
+                data["total"] = len(items)
+            response = Mock()
+            response.status_code = 200
+            response.json.return_value = {"code": 0, "data": data}
+            return response
+
+        return get
+
+    with patch("src.auth.s2a.client.S2A_API_BASE", "https://s2a.example.com"):
+        # 只有 total: 取满 total 条后不再请求空页
+        with patch("src.auth.s2a.client.http_session.get", side_effect=_serve(False, True)) as get:
+            records = list(s2a_iter_accounts(page_size=2))
+        assert [r["id"] for r in records] == [1, 2, 3, 4]
+        assert get.call_count == 2
+
+        # 服务端忽略 page 且没有 pages / total: 第二页与第一页相同即停止
+        with patch("src.auth.s2a.client.http_session.get", side_effect=_serve(True, False)) as get:
+            records = list(s2a_iter_accounts(page_size=2))
+        assert [r["id"] for r in records] == [1, 2]
+        assert get.call_count == 2
@@ -0,0 +1,141 @@
+# ==================== Team 配置存储测试 ====================
+# 测试 team.json 的增量合并写入与 Team 查找索引
+
+"""Test Team Store
+
+测试用例:
+    - test_save_merges_into_current_file: 测试只合并变化字段，不覆盖其他进程对别的 Team 的更新
+    - test_save_skips_when_unchanged: 测试无变化时不写文件
+    - test_team_lookup_indexes: 测试按名称 / 邮箱 / account_id 查找 Team 及运行中修改后的索引更新
+    - test_team_lookup_miss_does_not_reindex: 测试未命中不重建索引，Team 列表变化后才重建
+"""
+
+import json
+import os
+
+import src.core.config as config
+from src.core.config import (
+    _parse_team_config,
+    get_team_by_account_id,
+    get_team_by_email,
+    get_team_by_name,
+    get_team_by_org,
+    update_team_index,
+)
+from src.core.team_store import pending_changes, save_teams
+
+
+def _load(team_file):
+    raw = json.loads(team_file.read_text(encoding="utf-8"))
+    return [_parse_team_config(entry, index) for index, entry in enumerate(raw)]
+
+
+def test_save_merges_into_current_file(tmp_path):
+    team_file = tmp_path / "team.json"
+    team_file.write_text(
+        json.dumps(
+            [
+                {"account": "a@example.com", "token": "a-old", "password": "x"},
+                {"account": "b@example.com", "access_token": "b-old"},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    first = _load(team_file)
+    second = _load(team_file)
+
+    # 另一个进程先更新了 Team b
+    second[1]["access_token"] = "b-new"
+    assert save_teams(second, team_file) is True
+
+    first[0]["access_token"] = "a-new"
+    first[0]["account_id"] = "acc-a"
+    first[0]["authorized"] = True
+    assert save_teams(first, team_file) is True
+
+    saved = json.loads(team_file.read_text(encoding="utf-8"))
+    assert saved[0] == {
+        "account": "a@example.com",
+        "token": "a-new",
+        "password": "x",
+        "access_token": "a-new",
+        "account_id": "acc-a",
+        "authorized": True,
+    }
+    assert saved[1]["access_token"] == "b-new"
+    assert pending_changes(first[0]) == {}
+
+
+def test_save_skips_when_unchanged(tmp_path):
+    team_file = tmp_path / "team.json"
+    team_file.write_text(
+        json.dumps([{"account": "a@example.com", "access_token": "same"}]), encoding="utf-8"
+    )
+    teams = _load(team_file)
+    assert save_teams(teams, team_file) is False
+
+    # 磁盘上已是相同的值 (其他进程写入过)，不再重写
+    teams[0]["account_id"] = "acc"
+    data = json.loads(team_file.read_text(encoding="utf-8"))
+    data[0]["account_id"] = "acc"
+    team_file.write_text(json.dumps(data), encoding="utf-8")
+    os.utime(team_file, ns=(1_000_000_000, 1_000_000_000))
+
+    assert save_teams(teams, team_file) is True
+    assert os.stat(team_file).st_mtime_ns == 1_000_000_000
+    assert not [name for name in os.listdir(tmp_path) if name.startswith(".team.json.")]
+
+
+def test_team_lookup_indexes(tmp_path, monkeypatch):
+    team_file = tmp_path / "team.json"
+    team_file.write_text(
+        json.dumps(
+            [
+                {"account": "Alpha@example.com", "access_token": "a"},
+                {"account": "beta@example.com", "account_id": "acc-b"},
+                {"user": {"email": "gamma@example.com"}, "account": {"id": "acc-g", "organizationId": "org-g"}},
+            ]
+        ),
+        encoding="utf-8",
+    )
+    monkeypatch.setattr(config, "TEAM_JSON_FILE", team_file)
+    monkeypatch.setattr(config, "_raw_teams", None)
+    monkeypatch.setattr(config, "_teams_loaded", False)
+    monkeypatch.setattr(config, "TEAMS", [])
+
+    teams = config.get_teams()
+    assert get_team_by_name("beta") is teams[1]
+    assert get_team_by_email("alpha@EXAMPLE.com") is teams[0]
+    assert get_team_by_org("org-g") is teams[2]
+    assert get_team_by_account_id("acc-g") is teams[2]
+    assert get_team_by_name("missing") == {}
+
+    # 运行中获取到 account_id / 修改已有值后，查找结果随之更新
+    teams[0]["account_id"] = "acc-a"
+    update_team_index(teams[0])
+    assert get_team_by_account_id("acc-a") is teams[0]
+    teams[1]["account_id"] = "acc-b2"
+    update_team_index(teams[1])
+    assert get_team_by_account_id("acc-b") == {}
+    assert get_team_by_account_id("acc-b2") is teams[1]
+
+
+def test_team_lookup_miss_does_not_reindex(tmp_path, monkeypatch):
+    team_file = tmp_path / "team.json"
+    team_file.write_text(json.dumps([{"account": "alpha@example.com"}]), encoding="utf-8")
+    monkeypatch.setattr(config, "TEAM_JSON_FILE", team_file)
+    monkeypatch.setattr(config, "_raw_teams", None)
+    monkeypatch.setattr(config, "_teams_loaded", False)
+    monkeypatch.setattr(config, "TEAMS", [])
+    teams = config.get_teams()
+
+    calls = []
+    original = config.reindex_teams
+    monkeypatch.setattr(config, "reindex_teams", lambda: (calls.append(1), original())[1])
+    for _ in range(100):
+        assert get_team_by_name("missing") == {}
+    assert calls == []
+
+    teams.append(_parse_team_config({"account": "beta@example.com"}, 1))
+    assert get_team_by_email("beta@example.com") is teams[1]
+    assert calls == [1]
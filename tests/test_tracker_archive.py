@@ -0,0 +1,160 @@
+# ==================== Tracker 归档测试 ====================
+# 测试已完成账号的冷归档与查找
+
+"""Test Tracker Archive
+
+测试用例:
+    - test_compact_moves_old_completed_members: 测试只归档超期的已完成成员账号
+    - test_archive_appends_and_lookup_by_email: 测试归档追加写入与按 email 查找
+    - test_recompact_after_interrupted_save_skips_duplicates: 测试归档后未保存追踪记录时重新归档不重复写入
+    - test_compacted_full_team_still_skipped: 测试成员被归档后满员 Team 仍走跳过分支，不再查询席位
+"""
+
+import json
+from datetime import datetime
+from unittest.mock import patch
+
+import pytest
+
+import src.core.tracker_store as tracker_store
+import src.core.workflow as workflow
+from src.core.tracker_archive import (
+    archived_count,
+    compact_tracker,
+    find_archived_accounts,
+    iter_archive,
+)
+from src.core.tracker_store import JsonTrackerStore
+from src.core.utils import (
+    get_all_incomplete_accounts,
+    load_team_tracker,
+    rewrite_team_tracker,
+)
+
+NOW = datetime(2024, 6, 1)
+
+
+def _account(email: str, status: str, updated_at: str, role: str = "member") -> dict:
+    return {
+        "email": email,
+        "invitation_status": status,
+        "role": role,
+        "storage_status": {},
+        "updated_at": updated_at,
+    }
+
+
+@pytest.fixture
+def json_store(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    tracker_store.reset_tracker_store(store)
+    store.import_tracker(
+        {
+            "schema_version": 1,
+            "teams": {
+                "alpha": [
+                    _account("old@example.com", "completed", "2024-03-15 10:00:00"),
+                    _account(
+                        "owner@example.com", "completed", "2024-01-01 10:00:00", "owner"
+                    ),
+                    _account("recent@example.com", "completed", "2024-05-30 10:00:00"),
+                    _account("stuck@example.com", "registered", "2024-01-01 10:00:00"),
+                ],
+                "beta": [
+                    _account("older@example.com", "completed", "2024-02-01 10:00:00")
+                ],
+            },
+        }
+    )
+    yield store
+    tracker_store.reset_tracker_store()
+
+
+def test_compact_moves_old_completed_members(json_store, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    tracker = load_team_tracker()
+
+    dry_run = compact_tracker(tracker, 30, archive_dir, now=NOW, dry_run=True)
+    assert dry_run["archived"] == 2
+    assert list(iter_archive(archive_dir)) == []
+
+    report = compact_tracker(tracker, 30, archive_dir, now=NOW)
+    rewrite_team_tracker(tracker)
+
+    assert report["teams"] == {"alpha": 1, "beta": 1}
+    assert report["partitions"] == {
+        "tracker-2024-03.jsonl.gz": 1,
+        "tracker-2024-02.jsonl.gz": 1,
+    }
+    saved = json.loads(open(json_store.path, encoding="utf-8").read())
+    assert [acc["email"] for acc in saved["teams"]["alpha"]] == [
+        "owner@example.com",
+        "recent@example.com",
+        "stuck@example.com",
+    ]
+    assert saved["teams"]["beta"] == []
+    # 索引已随之更新
+    assert list(get_all_incomplete_accounts(tracker)) == ["alpha"]
+    assert tracker.find_account("alpha", "old@example.com") is None
+
+
+def test_archive_appends_and_lookup_by_email(json_store, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    tracker = load_team_tracker()
+    compact_tracker(tracker, 30, archive_dir, now=NOW)
+
+    # 同一分区再次归档: 追加新的 gzip member
+    tracker["teams"]["gamma"] = [
+        _account("Old@example.com", "completed", "2024-03-20 10:00:00")
+    ]
+    compact_tracker(tracker, 30, archive_dir, now=NOW)
+
+    records = find_archived_accounts("OLD@example.com", archive_dir)
+    assert [record["team"] for record in records] == ["alpha", "gamma"]
+    assert records[0]["account"]["updated_at"] == "2024-03-15 10:00:00"
+    assert find_archived_accounts("missing@example.com", archive_dir) == []
+    assert len(list(iter_archive(archive_dir))) == 3
+
+
+def test_recompact_after_interrupted_save_skips_duplicates(json_store, tmp_path):
+    archive_dir = str(tmp_path / "archive")
+    compact_tracker(load_team_tracker(), 30, archive_dir, now=NOW)
+
+    # 归档已写入但追踪记录未保存: 重新加载后再次归档
+    tracker = load_team_tracker()
+    assert archived_count(tracker, "alpha") == 0
+    report = compact_tracker(tracker, 30, archive_dir, now=NOW)
+    rewrite_team_tracker(tracker)
+
+    assert report["archived"] == 2
+    assert report["partitions"] == {}
+    assert len(list(iter_archive(archive_dir))) == 2
+    assert len(find_archived_accounts("old@example.com", archive_dir)) == 1
+    saved = load_team_tracker()
+    assert saved["archived_counts"] == {"alpha": 1, "beta": 1}
+
+
+def test_compacted_full_team_still_skipped(json_store, tmp_path):
+    tracker = load_team_tracker()
+    tracker["teams"]["full"] = [
+        _account(f"m{i}@example.com", "completed", "2024-01-01 10:00:00") for i in range(2)
+    ]
+    compact_tracker(tracker, 30, str(tmp_path / "archive"), now=NOW)
+    rewrite_team_tracker(tracker)
+    assert load_team_tracker()["teams"]["full"] == []
+
+    workflow._tracker = load_team_tracker()
+    try:
+        with (
+            patch.object(workflow, "ACCOUNTS_PER_TEAM", 2),
+            patch.object(workflow, "print_team_summary"),
+            patch.object(workflow, "check_available_seats") as seats,
+            patch.object(workflow, "get_team_members") as members,
+        ):
+            results, owners = workflow.process_single_team({"name": "full"})
+    finally:
+        workflow._tracker = None
+
+    assert (results, owners) == ([], [])
+    seats.assert_not_called()
+    members.assert_not_called()
@@ -0,0 +1,156 @@
+# ==================== Tracker 索引测试 ====================
+# 测试 Tracker 的 email / 状态索引
+
+"""Test Tracker Index
+
+测试用例:
+    - test_helpers_keep_index_in_sync: 测试辅助函数维护 email / 状态索引
+    - test_index_rebuilds_after_direct_list_change: 测试直接修改列表后索引自动重建
+    - test_plain_dict_tracker_still_supported: 测试普通 dict 追踪记录仍可使用
+    - test_aggregates_maintained_incrementally: 测试状态统计随变更增量维护
+    - test_duplicate_emails_counted_per_entry: 测试同一 Team 内重复 email 按条目计数 (与逐条扫描一致)
+"""
+
+from unittest.mock import patch
+
+import pytest
+
+from src.core.storage_manager import update_storage_status
+from src.core.tracker import Tracker, compute_aggregates
+from src.core.tracker_store import JsonTrackerStore
+from src.core.utils import (
+    add_account_to_tracker,
+    add_account_with_password,
+    find_account,
+    get_all_incomplete_accounts,
+    get_incomplete_accounts,
+    remove_account_from_tracker,
+    update_account_status,
+)
+
+
+@pytest.fixture(autouse=True)
+def json_store(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    with patch("src.core.utils.get_tracker_store", return_value=store):
+        yield store
+
+
+def _emails(accounts: list) -> list:
+    return [acc["email"] for acc in accounts]
+
+
+def test_helpers_keep_index_in_sync():
+    tracker = Tracker({"teams": {}})
+    for name in ("a", "b", "c"):
+        add_account_to_tracker(tracker, "alpha", f"{name}@example.com")
+    add_account_to_tracker(tracker, "beta", "d@example.com", "completed")
+
+    update_account_status(tracker, "alpha", "b@example.com", "completed")
+    assert _emails(get_incomplete_accounts(tracker, "alpha")) == [
+        "a@example.com",
+        "c@example.com",
+    ]
+    assert list(get_all_incomplete_accounts(tracker)) == ["alpha"]
+
+    assert remove_account_from_tracker(tracker, "alpha", "a@example.com") is True
+    assert remove_account_from_tracker(tracker, "alpha", "a@example.com") is False
+    assert find_account(tracker, "alpha", "a@example.com") is None
+    assert find_account(tracker, "alpha", "c@example.com") is tracker["teams"]["alpha"][1]
+
+    # 已存在的账号只更新状态，不重复添加
+    add_account_to_tracker(tracker, "alpha", "c@example.com", "completed")
+    assert len(tracker["teams"]["alpha"]) == 2
+    assert get_all_incomplete_accounts(tracker) == {}
+
+
+def test_index_rebuilds_after_direct_list_change():
+    tracker = Tracker(
+        {"teams": {"alpha": [{"email": "a@example.com", "invitation_status": "invited"}]}}
+    )
+    assert find_account(tracker, "alpha", "a@example.com") is not None
+
+    tracker["teams"]["alpha"].append(
+        {"email": "b@example.com", "invitation_status": "registered"}
+    )
+    assert find_account(tracker, "alpha", "b@example.com") is not None
+
+    tracker["teams"]["alpha"] = [
+        {"email": "c@example.com", "invitation_status": "completed"}
+    ]
+    assert find_account(tracker, "alpha", "a@example.com") is None
+    assert get_incomplete_accounts(tracker, "alpha") == []
+
+
+def test_plain_dict_tracker_still_supported():
+    tracker = {"teams": {}}
+    add_account_to_tracker(tracker, "alpha", "a@example.com")
+    add_account_to_tracker(tracker, "alpha", "b@example.com")
+    update_account_status(tracker, "alpha", "a@example.com", "completed")
+
+    assert _emails(get_incomplete_accounts(tracker, "alpha")) == ["b@example.com"]
+    assert remove_account_from_tracker(tracker, "alpha", "b@example.com") is True
+    assert get_all_incomplete_accounts(tracker) == {}
+
+
+def test_aggregates_maintained_incrementally():
+    tracker = Tracker({"teams": {}})
+    add_account_to_tracker(tracker, "alpha", "a@example.com")
+    add_account_to_tracker(tracker, "alpha", "b@example.com")
+    add_account_with_password(tracker, "beta", "c@example.com", "pw")
+    assert tracker.aggregates()["alpha"]["invitation"] == {"invited": 2}
+
+    update_account_status(tracker, "alpha", "a@example.com", "completed")
+    update_storage_status(
+        tracker, "alpha", "a@example.com", "crs", {"status": "stored", "account_id": "1"}
+    )
+    remove_account_from_tracker(tracker, "beta", "c@example.com")
+
+    aggregates = tracker.aggregates()
+    assert aggregates["alpha"] == {
+        "total": 2,
+        "invitation": {"invited": 1, "completed": 1},
+        "storage": {
+            "crs": {"not_stored": 1, "stored": 1},
+            "cpa": {"not_stored": 2},
+            "s2a": {"not_stored": 2},
+        },
+    }
+    assert aggregates["beta"]["total"] == 0
+    # 增量结果与重新统计一致
+    assert aggregates == compute_aggregates(dict(tracker))
+
+
+def test_duplicate_emails_counted_per_entry():
+    data = {
+        "teams": {
+            "alpha": [
+                {"email": "a@example.com", "invitation_status": "invited"},
+                {"email": "b@example.com", "invitation_status": "completed"},
+                {"email": "a@example.com", "invitation_status": "registered"},
+            ]
+        }
+    }
+    tracker = Tracker(data)
+    assert tracker.aggregates()["alpha"]["total"] == 3
+    assert tracker.aggregates()["alpha"]["invitation"] == {
+        "invited": 1,
+        "completed": 1,
+        "registered": 1,
+    }
+    assert [acc["invitation_status"] for acc in get_incomplete_accounts(tracker, "alpha")] == [
+        "invited",
+        "registered",
+    ]
+
+    # 查找 / 更新命中第一条记录，第二条保持原状态
+    update_account_status(tracker, "alpha", "a@example.com", "completed")
+    assert tracker.aggregates()["alpha"]["invitation"] == {"completed": 2, "registered": 1}
+    assert tracker.aggregates() == compute_aggregates(
+        {"teams": {"alpha": [dict(acc) for acc in tracker["teams"]["alpha"]]}}
+    )
+
+    # 删除移除同一 email 的全部记录
+    assert remove_account_from_tracker(tracker, "alpha", "a@example.com") is True
+    assert _emails(tracker["teams"]["alpha"]) == ["b@example.com"]
+    assert tracker.aggregates()["alpha"]["total"] == 1
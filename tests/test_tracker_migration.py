@@ -0,0 +1,148 @@
+# ==================== Tracker 迁移测试 ====================
+# 测试 team_tracker schema_version 迁移
+
+"""Test Tracker Migration
+
+测试用例:
+    - test_load_and_script_produce_identical_output: 测试加载迁移与迁移脚本结果一致
+    - test_load_skips_migration_once_stamped: 测试写入 schema_version 后不再逐条迁移
+    - test_helpers_write_current_schema: 测试辅助函数直接写入当前格式
+    - test_generated_tracker_loads: 测试合成追踪记录 (混合新旧格式) 可确定性生成并迁移
+"""
+
+import importlib.util
+import json
+import sys
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+import src.core.tracker_store as tracker_store
+from src.core.tracker_migration import SCHEMA_VERSION, migrate_tracker, validate_tracker
+from src.core.tracker_store import JsonTrackerStore
+from src.core.utils import (
+    add_account_to_tracker,
+    add_account_with_password,
+    get_all_incomplete_accounts,
+    load_team_tracker,
+    save_team_tracker,
+    update_account_status,
+)
+from tests.fake_tracker import generate_tracker, write_tracker
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _legacy_tracker() -> dict:
+    return {
+        "teams": {
+            "alpha": [
+                {"email": "a@example.com", "status": "completed", "password": "pw"},
+                {
+                    "email": "b@example.com",
+                    "status": "invited",
+                    "invitation_status": "registered",
+                },
+                {
+                    "email": "c@example.com",
+                    "invitation_status": "authorized",
+                    "storage_status": {"crs": {"status": "stored", "account_id": "1"}},
+                },
+                "broken-record",
+            ],
+            "beta": [{"email": "d@example.com"}],
+            "gamma": None,
+        },
+        "last_updated": "2024-01-01 00:00:00",
+    }
+
+
+def _load_script():
+    spec = importlib.util.spec_from_file_location(
+        "migrate_tracker_script", ROOT / "scripts" / "migrate_tracker.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write(path: Path, data: dict):
+    path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+
+def _read(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+@pytest.fixture
+def json_store(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    tracker_store.reset_tracker_store(store)
+    yield store
+    tracker_store.reset_tracker_store()
+
+
+def test_load_and_script_produce_identical_output(tmp_path, json_store):
+    loaded_path = Path(json_store.path)
+    script_path = tmp_path / "script.json"
+    _write(loaded_path, _legacy_tracker())
+    _write(script_path, _legacy_tracker())
+
+    tracker = load_team_tracker()
+
+    script = _load_script()
+    with patch.object(script, "TEAM_TRACKER_FILE", str(script_path)), patch.object(
+        sys, "argv", ["migrate_tracker.py", "--backup-dir", str(tmp_path / "backup")]
+    ):
+        assert script.main() == 0
+
+    migrated = _read(script_path)
+    assert dict(tracker) == migrated
+    assert _read(loaded_path) == migrated
+    assert migrated["schema_version"] == SCHEMA_VERSION
+    assert validate_tracker(migrated) == []
+    assert migrated["teams"]["alpha"][1]["invitation_status"] == "registered"
+    assert migrated["teams"]["alpha"][2]["storage_status"]["crs"]["account_id"] == "1"
+
+
+def test_load_skips_migration_once_stamped(json_store):
+    _write(Path(json_store.path), _legacy_tracker())
+
+    with patch("src.core.utils.migrate_tracker", wraps=migrate_tracker) as migrate:
+        load_team_tracker()
+        load_team_tracker()
+
+    assert migrate.call_count == 1
+    assert _read(Path(json_store.path))["schema_version"] == SCHEMA_VERSION
+
+
+def test_helpers_write_current_schema(json_store):
+    tracker = load_team_tracker()
+    assert tracker["schema_version"] == SCHEMA_VERSION
+
+    add_account_with_password(tracker, "alpha", "a@example.com", "pw")
+    add_account_with_password(tracker, "alpha", "a@example.com", "pw2", "registered")
+    add_account_to_tracker(tracker, "alpha", "b@example.com")
+    update_account_status(tracker, "alpha", "b@example.com", "completed")
+    save_team_tracker(tracker)
+
+    saved = _read(Path(json_store.path))
+    assert validate_tracker(saved) == []
+    assert saved["teams"]["alpha"][0]["invitation_status"] == "registered"
+
+
+def test_generated_tracker_loads(json_store):
+    assert generate_tracker(3, 20, seed=1) == generate_tracker(3, 20, seed=1)
+    assert validate_tracker(generate_tracker(3, 20, legacy_ratio=0)) == []
+
+    generated = write_tracker(json_store.path, teams=3, accounts=20)
+    accounts = [a for team in generated["teams"].values() for a in team]
+    assert any("status" in a for a in accounts)
+    assert any("storage_status" in a for a in accounts)
+
+    tracker = load_team_tracker()
+    assert validate_tracker(dict(tracker)) == []
+    assert sum(len(team) for team in tracker["teams"].values()) == 60
+    incomplete = get_all_incomplete_accounts(tracker)
+    assert 0 < sum(len(team) for team in incomplete.values()) < 60
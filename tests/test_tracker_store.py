@@ -0,0 +1,157 @@
+# ==================== Tracker Store 测试 ====================
+# 测试追踪记录存储后端 (JSON / SQLite)
+
+"""Test Tracker Store
+
+测试用例:
+    - test_json_store_roundtrip: 测试 JSON 后端读写
+    - test_json_write_behind_replays_journal: 测试 write-behind 日志重放与快照
+    - test_sqlite_store_imports_json_on_first_load: 测试 SQLite 首次加载导入 JSON
+    - test_sqlite_store_row_upsert_and_remove: 测试 SQLite 单行 upsert / 删除
+    - test_sqlite_save_drops_removed_top_level_keys: 测试 SQLite 保存时删除已移除的顶层字段
+    - test_tracker_helpers_use_sqlite_rows: 测试 tracker 辅助函数写入 SQLite 行
+    - test_default_store_isolated_in_tests: 测试默认存储在测试中写入临时目录
+"""
+
+import json
+
+import pytest
+
+import src.core.tracker_store as tracker_store
+from src.core.tracker_store import JsonTrackerStore, SqliteTrackerStore
+from src.core.utils import (
+    add_account_with_password,
+    load_team_tracker,
+    remove_account_from_tracker,
+    save_team_tracker,
+    update_account_status,
+)
+
+
+def _sample_tracker() -> dict:
+    return {
+        "teams": {
+            "alpha": [
+                {"email": "a@example.com", "invitation_status": "completed"},
+                {"email": "b@example.com", "invitation_status": "invited"},
+            ],
+            "beta": [],
+        },
+        "last_updated": "2024-01-01 00:00:00",
+    }
+
+
+@pytest.fixture
+def sqlite_store(tmp_path):
+    store = SqliteTrackerStore(
+        tmp_path / "tracker.db", json_path=tmp_path / "tracker.json"
+    )
+    tracker_store.reset_tracker_store(store)
+    yield store
+    tracker_store.reset_tracker_store()
+
+
+def test_json_store_roundtrip(tmp_path):
+    store = JsonTrackerStore(tmp_path / "tracker.json")
+    assert store.load() is None
+
+    store.save(_sample_tracker())
+
+    assert store.load() == _sample_tracker()
+
+
+def test_json_write_behind_replays_journal(tmp_path):
+    path = tmp_path / "tracker.json"
+    store = JsonTrackerStore(path, write_behind=True)
+    store.import_tracker(_sample_tracker())
+
+    tracker = store.load()
+    account = {"email": "b@example.com", "invitation_status": "completed"}
+    tracker["teams"]["alpha"][1] = account
+    store.record_account("alpha", account)
+    store.remove_account("alpha", "a@example.com")
+    store.save(tracker)
+
+    # save 不重写快照，变更只存在于日志中
+    assert json.loads(path.read_text(encoding="utf-8")) == _sample_tracker()
+
+    # 模拟崩溃: 新实例从快照 + 日志恢复
+    recovered = JsonTrackerStore(path, write_behind=True).load()
+    assert recovered["teams"]["alpha"] == [account]
+
+    store.checkpoint(recovered)
+    store.close()
+    assert not (tmp_path / "tracker.json.journal").exists()
+    assert json.loads(path.read_text(encoding="utf-8"))["teams"]["alpha"] == [account]
+
+
+def test_sqlite_store_imports_json_on_first_load(tmp_path, sqlite_store):
+    (tmp_path / "tracker.json").write_text(
+        json.dumps(_sample_tracker()), encoding="utf-8"
+    )
+
+    assert sqlite_store.load() == _sample_tracker()
+
+    # 导入后即使 JSON 被删除也能从数据库读取
+    (tmp_path / "tracker.json").unlink()
+    assert sqlite_store.load() == _sample_tracker()
+
+
+def test_sqlite_store_row_upsert_and_remove(sqlite_store):
+    sqlite_store.import_tracker(_sample_tracker())
+
+    sqlite_store.record_account(
+        "alpha", {"email": "b@example.com", "invitation_status": "completed"}
+    )
+    sqlite_store.record_account(
+        "beta", {"email": "c@example.com", "invitation_status": "invited"}
+    )
+    sqlite_store.remove_account("alpha", "a@example.com")
+
+    loaded = sqlite_store.load()
+    assert loaded["teams"]["alpha"] == [
+        {"email": "b@example.com", "invitation_status": "completed"}
+    ]
+    assert loaded["teams"]["beta"] == [
+        {"email": "c@example.com", "invitation_status": "invited"}
+    ]
+
+
+def test_sqlite_save_drops_removed_top_level_keys(sqlite_store):
+    tracker = _sample_tracker()
+    tracker["archived_counts"] = {"alpha": 2}
+    sqlite_store.save(tracker)
+    assert sqlite_store.load()["archived_counts"] == {"alpha": 2}
+
+    del tracker["archived_counts"]
+    sqlite_store.save(tracker)
+    loaded = sqlite_store.load()
+    assert "archived_counts" not in loaded
+    assert loaded["last_updated"] == tracker["last_updated"]
+    assert loaded["teams"]["beta"] == []
+
+
+def test_tracker_helpers_use_sqlite_rows(tmp_path, sqlite_store):
+    tracker = load_team_tracker()
+    add_account_with_password(tracker, "alpha", "a@example.com", "pw")
+    add_account_with_password(tracker, "alpha", "b@example.com", "pw")
+    update_account_status(tracker, "alpha", "a@example.com", "completed")
+    assert remove_account_from_tracker(tracker, "alpha", "b@example.com") is True
+    save_team_tracker(tracker)
+
+    reloaded = load_team_tracker()
+    accounts = reloaded["teams"]["alpha"]
+    assert [acc["email"] for acc in accounts] == ["a@example.com"]
+    assert accounts[0]["invitation_status"] == "completed"
+    assert reloaded["last_updated"] == tracker["last_updated"]
+    assert not (tmp_path / "tracker.json").exists()
+
+
+def test_default_store_isolated_in_tests(tmp_path):
+    tracker = load_team_tracker()
+    add_account_with_password(tracker, "alpha", "a@example.com", "pw")
+    save_team_tracker(tracker)
+
+    store = tracker_store.get_tracker_store()
+    assert store.path == str(tmp_path / "team_tracker.json")
+    assert json.loads((tmp_path / "team_tracker.json").read_text(encoding="utf-8"))["teams"]["alpha"][0]["email"] == "a@example.com"